@@ -12,7 +12,12 @@ A 3ds Max (2022+) engine for Toolkit based pymxs
 """
 
 import os
+import sys
 import math
+import concurrent.futures
+import contextlib
+import functools
+import time
 import sgtk
 
 import pymxs
@@ -70,15 +75,46 @@ class MaxEngine(sgtk.platform.Engine):
         Engine Constructor
         """
 
+        # Origin of the startup timeline, see _start_startup_profiler.
+        self._init_time = time.time()
+        self._startup_profiler = None
+
         # Add instance variables before calling our base class
         # __init__() because the initialization may need those
         # variables.
         self._parent_to_max = True
-        self._dock_widgets = []
+        # Panel id -> dock widget of the panels opened by the engine.
+        self._dock_widgets = {}
+        # Wrapper of the 3ds Max main window, dropped when the window is destroyed.
+        self._main_window = None
+        # Panels to build ahead of time and the one being built.
+        self._panels_to_prewarm = []
+        self._prewarming_panel_id = None
+        self._stylesheets = None
+        self._startup_commands = None
+        self._main_thread_scheduler = None
+        self._pymxs_facade = None
+        self._async_loop = None
+        self._notifications = None
+        self._menus_loaded_subscription = None
 
         self._max_version = None
         self._max_version_year = None
 
+        # Lookup tables over the registered commands, built on demand.
+        self._command_index = None
+
+        # Buffered output to the listener, set up once Qt is available.
+        self._log_sink = None
+        # Structured log records written to disk, when enabled.
+        self._binary_log = None
+        # Timings of the pymxs calls, when enabled.
+        self._pymxs_tracer = None
+        # Cached state of the current scene.
+        self._scene_state = None
+        # Counters of the nodes in the current scene.
+        self._scene_nodes = None
+
         # proceed about your business
         sgtk.platform.Engine.__init__(self, *args, **kwargs)
 
@@ -92,6 +128,155 @@ class MaxEngine(sgtk.platform.Engine):
         """
         return True
 
+    @property
+    def command_index(self):
+        """
+        :class:`tk_3dsmax.CommandIndex` over the commands currently registered
+        with the engine.
+
+        The index is built on first access and dropped every time a command
+        is registered.
+        """
+        if self._command_index is None:
+            self._command_index = self.tk_3dsmax.CommandIndex(self.commands, self.apps)
+        return self._command_index
+
+    @property
+    def scene_state(self):
+        """
+        :class:`tk_3dsmax.SceneState` caching the path, project folder and frame
+        range of the current scene.
+        """
+        return self._scene_state
+
+    @property
+    def scene_nodes(self):
+        """
+        :class:`tk_3dsmax.SceneNodeCounters` counting the nodes of the current
+        scene.
+        """
+        return self._scene_nodes
+
+    @property
+    def notifications(self):
+        """
+        :class:`tk_3dsmax.NotificationDispatcher` through which the engine and
+        the apps subscribe to 3ds Max notifications.
+        """
+        return self._notifications
+
+    @property
+    def main_thread_scheduler(self):
+        """
+        :class:`tk_3dsmax.MainThreadScheduler` running tasks in the main thread
+        in time slices, or None when 3ds Max runs without a UI.
+        """
+        return self._main_thread_scheduler
+
+    @property
+    def pymxs_facade(self):
+        """
+        :class:`tk_3dsmax.PymxsFacade` through which background threads can
+        use pymxs.
+        """
+        return self._pymxs_facade
+
+    @property
+    def async_loop(self):
+        """
+        :class:`tk_3dsmax.AsyncLoop` hosting the engine's asyncio event loop,
+        created on first access.
+
+        Must first be accessed from the main thread.
+        """
+        if self._async_loop is None:
+            self._async_loop = self.tk_3dsmax.AsyncLoop(
+                self.logger, self.get_setting("async_poll_interval", 10)
+            )
+        return self._async_loop
+
+    def run_async(self, coroutine):
+        """
+        Runs a coroutine on the engine's asyncio event loop, in the main thread.
+
+        The loop is stepped from the 3ds Max event loop, so 3ds Max keeps
+        repainting while the coroutine awaits, e.g., file system calls run with
+        ``engine.async_loop.run_in_executor``. Without a UI, the coroutine runs
+        to completion right away.
+
+        :param coroutine: Coroutine object to run.
+        :returns: :class:`concurrent.futures.Future` holding the result of the
+            coroutine.
+        """
+        if self.has_ui:
+            return self.async_loop.run(coroutine)
+
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(self.async_loop.loop.run_until_complete(coroutine))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def schedule_in_main_thread(self, func, *args, **kwargs):
+        """
+        Runs a function in the main thread without blocking the caller.
+
+        Unlike :meth:`async_execute_in_main_thread`, the function can be
+        given a priority and a key, which coalesces the pending functions
+        submitted with the same key. The ``priority`` and ``key`` keyword
+        arguments are not passed on to the function, see
+        :meth:`tk_3dsmax.MainThreadScheduler.submit`.
+
+        :param func: Function to run.
+        :param args: Positional arguments for the function.
+        :param kwargs: Named arguments for the function.
+        :returns: :class:`concurrent.futures.Future` holding the result of the
+            function.
+        """
+        if self._main_thread_scheduler is not None:
+            return self._main_thread_scheduler.submit(func, *args, **kwargs)
+
+        # Without a UI, run the function right away in the main thread.
+        kwargs.pop("priority", None)
+        kwargs.pop("key", None)
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(self.execute_in_main_thread(func, *args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def async_execute_in_main_thread(self, func, *args, **kwargs):
+        """
+        Runs a function in the main thread without blocking the caller.
+
+        The function is queued in the engine's scheduler, so it shares the time
+        slices of the other main thread tasks. Falls back to the default
+        implementation without a UI or once the scheduler is closed.
+
+        See :meth:`sgtk.platform.Engine.async_execute_in_main_thread` for details.
+        """
+        scheduler = self._main_thread_scheduler
+        if scheduler is not None:
+            try:
+                # All the named arguments are for the function.
+                scheduler.submit(functools.partial(func, *args, **kwargs))
+                return
+            except RuntimeError:
+                # The scheduler was closed while the engine shuts down.
+                pass
+        super().async_execute_in_main_thread(func, *args, **kwargs)
+
+    def register_command(self, name, callback, properties=None):
+        """
+        Registers a new command with the engine and invalidates the command index.
+
+        See :meth:`sgtk.platform.Engine.register_command` for details.
+        """
+        super().register_command(name, callback, properties)
+        self._command_index = None
+
     ##########################################################################################
     # init
 
@@ -101,6 +286,7 @@ class MaxEngine(sgtk.platform.Engine):
         """
         from sgtk.platform.qt import QtCore, QtGui
 
+        pre_app_init_start = time.time()
         self.log_debug("%s: Initializing..." % self)
 
         url_doc_supported_versions = "https://help.autodesk.com/view/SGDEV/ENU/?guid=SGD_si_integrations_engine_supported_versions_html"
@@ -231,7 +417,6 @@ Please report any issues to:
                     ),
                 )
 
-        self._safe_dialog = []
         # Keep the dialog to prevent the garbage collector from delete it
         self._dialog = None
 
@@ -251,8 +436,7 @@ Please report any issues to:
                     pymxs.runtime.enableAccelerators = True
                 # Remove from tracked dialogs
                 if event.type() == QtCore.QEvent.Close:
-                    if obj in engine._safe_dialog:
-                        engine._safe_dialog.remove(obj)
+                    engine._safe_dialogs.remove(obj)
 
                 return False
 
@@ -273,24 +457,74 @@ Please report any issues to:
         else:
             parent_widget = self._get_dialog_parent()
 
-        curr_stylesheet = parent_widget.styleSheet()
+        # The property spares reading the whole stylesheet of the parent widget
+        # back when the engine is restarted.
+        if not parent_widget.property("sgtk_style_extension"):
+            curr_stylesheet = parent_widget.styleSheet()
 
-        if "toolkit 3dsmax style extension" not in curr_stylesheet:
-            # If we're in pre-2017 Max then we need to handle our own styling. Otherwise
-            # we just inherit from Max.
-            if self.max_version_year < 2017:
-                self._initialize_dark_look_and_feel()
+            if "toolkit 3dsmax style extension" not in curr_stylesheet:
+                # If we're in pre-2017 Max then we need to handle our own styling.
+                # Otherwise we just inherit from Max.
+                if self.max_version_year < 2017:
+                    self._initialize_dark_look_and_feel()
 
-            curr_stylesheet += "\n\n /* toolkit 3dsmax style extension */ \n\n"
-            curr_stylesheet += (
-                "\n\n QDialog#TankDialog > QWidget { background-color: #343434; }\n\n"
-            )
-            parent_widget.setStyleSheet(curr_stylesheet)
+                curr_stylesheet += "\n\n /* toolkit 3dsmax style extension */ \n\n"
+                curr_stylesheet += "\n\n QDialog#TankDialog > QWidget { background-color: #343434; }\n\n"
+                parent_widget.setStyleSheet(curr_stylesheet)
+            parent_widget.setProperty("sgtk_style_extension", True)
 
         # This needs to be present for apps as it will be used in
         # show_dialog when perforce asks for login info very early on.
         self.tk_3dsmax = self.import_module("tk_3dsmax")
 
+        # Time the startup phases as early as possible, when enabled.
+        self._start_startup_profiler(pre_app_init_start)
+
+        # Processed bundle stylesheets, shared by all the dialogs and panels.
+        self._stylesheets = self.tk_3dsmax.StylesheetCache(
+            self._resolve_sg_stylesheet_tokens, self.logger
+        )
+
+        # Dialogs hidden while 3ds Max shows its own, see safe_dialog_exec.
+        self._safe_dialogs = self.tk_3dsmax.DialogRegistry(self.logger)
+
+        # The tracer is installed as early as possible so it sees all the calls
+        # made by the engine. Only the engine and its modules are traced, the
+        # other scripts running in 3ds Max keep using pymxs.runtime directly.
+        if self.get_setting("trace_pymxs", False) or os.environ.get(
+            "SGTK_3DSMAX_TRACE_PYMXS"
+        ):
+            self._pymxs_tracer = self.tk_3dsmax.PymxsTracer()
+            self._pymxs_tracer.install([sys.modules[self.__module__]])
+            self.log_debug("Tracing the calls made through pymxs.runtime.")
+
+        if self.get_setting("binary_log", False):
+            self._open_binary_log()
+
+        self._notifications = self.tk_3dsmax.NotificationDispatcher(self.logger)
+
+        self._scene_state = self.tk_3dsmax.SceneState(self.logger, self._notifications)
+        self._scene_state.install()
+
+        self._scene_nodes = self.tk_3dsmax.SceneNodeCounters()
+        self._scene_nodes.install()
+
+        # Main thread work queued by the engine and the apps runs in time slices.
+        if self.has_ui:
+            self._main_thread_scheduler = self.tk_3dsmax.MainThreadScheduler(
+                self.logger,
+                self.get_setting("main_thread_tick_budget", 10) / 1000.0,
+            )
+        self._pymxs_facade = self.tk_3dsmax.PymxsFacade(self._main_thread_scheduler)
+
+        # Log messages are printed to the listener in batches from now on.
+        if self.has_ui:
+            self._log_sink = self.tk_3dsmax.ListenerLogSink(
+                self.get_setting("log_flush_interval", 250),
+                self.get_setting("log_buffer_size", 1000),
+                self._print_output,
+            )
+
         # The "qss_watcher" setting causes us to monitor the engine's
         # style.qss file and re-apply it on the fly when it changes
         # on disk. This is very useful for development work,
@@ -306,6 +540,11 @@ Please report any issues to:
 
             self._qss_watcher.fileChanged.connect(self.reload_qss)
 
+        if self._startup_profiler is not None:
+            self._startup_profiler.end("pre_app_init")
+            # The core loads and initializes the apps next.
+            self._startup_profiler.begin("apps")
+
     def _add_shotgun_menu(self):
         """
         Add Shotgun menu to the main menu bar.
@@ -314,6 +553,18 @@ Please report any issues to:
         self._menu_generator.create_menu()
         self.tk_3dsmax.MaxScript.enable_menu()
 
+    def _refresh_shotgun_menu(self):
+        """
+        Update the Shotgun menu to match the current commands and context.
+        """
+        start_time = time.time()
+        changed_sections = self._menu_generator.update_menu()
+        self.tk_3dsmax.MaxScript.enable_menu()
+        self.log_debug(
+            "Updated the PTR menu in %.3f seconds, changed sections: %s."
+            % (time.time() - start_time, ", ".join(changed_sections) or "none")
+        )
+
     def _remove_shotgun_menu(self):
         """
         Remove Shotgun menu from the main menu bar.
@@ -321,12 +572,15 @@ Please report any issues to:
         self.log_debug("Removing the PTR menu from the main menu bar.")
         self._menu_generator.destroy_menu()
 
-    def _on_menus_loaded(self):
+    def _on_menus_loaded(self, event):
         """
         Called when receiving postLoadingMenus from 3dsMax < 2025
 
-        :param code: Notification code received
+        :param event: :class:`tk_3dsmax.NotificationEvent` received
         """
+        # The menu was reloaded from the menu file, so it is no longer the one
+        # the menu registry holds the handle of.
+        self._menu_generator.forget_menus()
         self._add_shotgun_menu()
 
     def post_app_init(self):
@@ -341,48 +595,60 @@ Please report any issues to:
         """
         Called from the main thread when all apps have initialized
         """
+        if self._startup_profiler is not None:
+            self._startup_profiler.end("apps")
+            self._startup_profiler.uninstall_app_hooks()
+            self._startup_profiler.begin("post_app_init")
+
         # set up menu handler
         if self.max_version_year >= 2025:
             self._menu_generator = self.tk_3dsmax.MenuGenerator_callbacks(self)
-            self._add_shotgun_menu()
+            with self._profile_phase("menu"):
+                self._add_shotgun_menu()
 
             # This causes the menu manager to reload the current configuration,
             # causing the menu file chain to be loaded and the callback to occur.
-            iCuiMenuMgr = pymxs.runtime.MaxOps.GetICuiMenuMgr()
-            iCuiMenuMgr.LoadConfiguration(iCuiMenuMgr.GetCurrentConfiguration())
+            # With persistent dynamic menus, this only happens once per session.
+            if self._menu_generator.needs_configuration_reload():
+                with self._profile_phase("cui_reload"):
+                    self._menu_generator.reload_configuration()
+            else:
+                self.log_debug("Skipping the CUI menu configuration reload.")
         else:
             self._menu_generator = self.tk_3dsmax.MenuGenerator_menuMan(self)
-            self._add_shotgun_menu()
+            with self._profile_phase("menu"):
+                self._add_shotgun_menu()
 
             # Register a callback for the postLoadingMenus event.
-            python_code = "\n".join(
-                [
-                    "import sgtk",
-                    "engine = sgtk.platform.current_engine()",
-                    "engine._on_menus_loaded()",
-                ]
-            )
-            # Unfortunately we can't pass in a Python function as a callback,
-            # so we're passing in piece of MaxScript instead.
-            pymxs.runtime.callbacks.addScript(
-                pymxs.runtime.Name("postLoadingMenus"),
-                'python.execute "{0}"'.format(python_code),
-                id=pymxs.runtime.Name("sg_tk_on_menus_loaded"),
+            self._menus_loaded_subscription = self._notifications.subscribe(
+                "postLoadingMenus", self._on_menus_loaded
             )
 
-        # Run a series of app instance commands at startup.
+        # Restore or prepare the panels before running the startup commands,
+        # which may show panels themselves.
+        with self._profile_phase("panels"):
+            self._initialize_panels()
+
+        # Queue the series of app instance commands to run at startup.
         self._run_app_instance_commands()
 
         # if a file was specified, load it now
         file_to_open = os.environ.get("SGTK_FILE_TO_OPEN")
         if file_to_open:
             try:
-                pymxs.runtime.loadMaxFile(file_to_open)
+                with self._profile_phase("file_open"):
+                    pymxs.runtime.loadMaxFile(file_to_open)
             except Exception:
                 self.logger.exception(
                     "Couldn't not open the requested file: {}".format(file_to_open)
                 )
 
+        if self._startup_profiler is not None:
+            self._startup_profiler.end("post_app_init")
+
+        # The startup commands run once 3ds Max is idle, after the file is open.
+        self._startup_commands.start(on_finished=self._finish_startup_profiler)
+
     def post_context_change(self, old_context, new_context):
         """
         Handles necessary processing after a context change has been completed
@@ -391,35 +657,36 @@ Please report any issues to:
         :param old_context: The previous context.
         :param new_context: The current, new context.
         """
-        # Replacing the menu will cause the old one to be removed
-        # and the new one put into its place.
-        self._add_shotgun_menu()
+        # Apps may have been reloaded by the context change.
+        self._command_index = None
+
+        # Only the menu entries that changed are replaced.
+        self._refresh_shotgun_menu()
 
     def _run_app_instance_commands(self):
         """
-        Runs the series of app instance commands listed in the 'run_at_startup' setting
+        Queues the series of app instance commands listed in the 'run_at_startup' setting
         of the environment configuration yaml file.
-        """
 
-        # Build a dictionary mapping app instance names to dictionaries of commands they registered with the engine.
-        app_instance_commands = {}
-        for command_name, value in self.commands.items():
-            app_instance = value["properties"].get("app")
-            if app_instance:
-                # Add entry 'command name: command function' to the command dictionary of this app instance.
-                command_dict = app_instance_commands.setdefault(
-                    app_instance.instance_name, {}
-                )
-                command_dict[command_name] = value["callback"]
+        The commands are run by the startup command scheduler, by decreasing
+        priority, one per event loop iteration.
+        """
+        command_index = self.command_index
+        self._startup_commands = self.tk_3dsmax.StartupCommandScheduler(
+            self.logger,
+            deferred=self.has_ui,
+            scheduler=self._main_thread_scheduler,
+        )
 
         # Run the series of app instance commands listed in the 'run_at_startup' setting.
         for app_setting_dict in self.get_setting("run_at_startup", []):
             app_instance_name = app_setting_dict["app_instance"]
             # Menu name of the command to run or '' to run all commands of the given app instance.
             setting_command_name = app_setting_dict["name"]
+            priority = app_setting_dict.get("priority") or 0
 
             # Retrieve the command dictionary of the given app instance.
-            command_dict = app_instance_commands.get(app_instance_name)
+            command_dict = command_index.get_app_instance_commands(app_instance_name)
 
             if command_dict is None:
                 self.log_warning(
@@ -429,21 +696,30 @@ Please report any issues to:
             else:
                 if not setting_command_name:
                     # Run all commands of the given app instance.
-                    for command_name, command_function in command_dict.items():
+                    for command_name, command in command_dict.items():
                         self.log_debug(
-                            "%s startup running app '%s' command '%s'."
+                            "%s startup queuing app '%s' command '%s'."
                             % (self.name, app_instance_name, command_name)
                         )
-                        command_function()
+                        self._queue_startup_command(
+                            "'%s' of app '%s'" % (command_name, app_instance_name),
+                            command["callback"],
+                            priority,
+                        )
                 else:
                     # Run the command whose name is listed in the 'run_at_startup' setting.
-                    command_function = command_dict.get(setting_command_name)
-                    if command_function:
+                    command = command_dict.get(setting_command_name)
+                    if command:
                         self.log_debug(
-                            "%s startup running app '%s' command '%s'."
+                            "%s startup queuing app '%s' command '%s'."
                             % (self.name, app_instance_name, setting_command_name)
                         )
-                        command_function()
+                        self._queue_startup_command(
+                            "'%s' of app '%s'"
+                            % (setting_command_name, app_instance_name),
+                            command["callback"],
+                            priority,
+                        )
                     else:
                         known_commands = ", ".join(
                             "'%s'" % name for name in command_dict
@@ -459,23 +735,154 @@ Please report any issues to:
                             )
                         )
 
+    def _queue_startup_command(self, label, callback, priority):
+        """
+        Queues a command to run at startup.
+
+        :param str label: Name of the command in the log.
+        :param callback: Callable running the command.
+        :param int priority: Commands with a higher priority run first.
+        """
+        if self._startup_profiler is not None:
+            callback = self._startup_profiler.wrap(
+                "run_at_startup %s" % label, callback
+            )
+        self._startup_commands.add(label, callback, priority)
+
+    def _start_startup_profiler(self, pre_app_init_start):
+        """
+        Starts timing the startup phases if the ``startup_profiler`` setting or
+        the ``SGTK_3DSMAX_PROFILE_STARTUP`` environment variable is set.
+
+        Setting the environment variable to ``cprofile`` also profiles the
+        phases, like the ``startup_profiler_cprofile`` setting.
+
+        :param float pre_app_init_start: Time pre_app_init was called.
+        """
+        profile_env = os.environ.get("SGTK_3DSMAX_PROFILE_STARTUP", "")
+        if not (self.get_setting("startup_profiler", False) or profile_env):
+            return
+
+        self._startup_profiler = self.tk_3dsmax.StartupProfiler(
+            self._init_time,
+            self.logger,
+            cprofile=self.get_setting("startup_profiler_cprofile", False)
+            or profile_env.lower() == "cprofile",
+        )
+        self._startup_profiler.record(
+            "engine_init", self._init_time, pre_app_init_start
+        )
+        self._startup_profiler.begin("pre_app_init", pre_app_init_start)
+        self._startup_profiler.install_app_hooks()
+
+    def _profile_phase(self, name):
+        """
+        Times a startup phase when the startup profiler is enabled.
+
+        :param str name: Name of the phase.
+        :returns: Context manager timing the phase.
+        """
+        if self._startup_profiler is None:
+            return contextlib.nullcontext()
+        return self._startup_profiler.phase(name)
+
+    def _finish_startup_profiler(self):
+        """
+        Writes the startup timeline next to the log files.
+        """
+        if self._startup_profiler is None:
+            return
+        self._startup_profiler.finish(
+            os.path.join(
+                sgtk.LogManager().log_folder, "%s.startup.json" % self.instance_name
+            )
+        )
+
     def destroy_engine(self):
         """
         Called when the engine is shutting down
         """
         self.log_debug("%s: Destroying..." % self)
-        if self.max_version_year < 2025:
-            pymxs.runtime.callbacks.removeScripts(
-                pymxs.runtime.Name("postLoadingMenus"),
-                id=pymxs.runtime.Name("sg_tk_on_menus_loaded"),
-            )
+        # The engine may be destroyed before the startup commands ran.
+        self._finish_startup_profiler()
+        if self._menus_loaded_subscription is not None:
+            self._menus_loaded_subscription.unsubscribe()
+            self._menus_loaded_subscription = None
         self._remove_shotgun_menu()
+        # Restarting the engine doesn't go through close_windows, and the next
+        # engine would dock its panels next to these ones.
+        self._remove_dock_widgets()
+
+        if self._startup_commands is not None:
+            self._startup_commands.cancel()
+
+        if self._scene_state is not None:
+            self._scene_state.uninstall()
+
+        if self._scene_nodes is not None:
+            self._scene_nodes.uninstall()
+
+        if self._notifications is not None:
+            self._notifications.close()
+
+        if self._pymxs_tracer is not None:
+            self.log_debug(self._pymxs_tracer.format_report())
+            self._pymxs_tracer.uninstall()
+            self._pymxs_tracer = None
+
+        if self._async_loop is not None:
+            self._async_loop.close()
+            self._async_loop = None
+
+        if self._pymxs_facade is not None:
+            self._pymxs_facade.cancel_pending()
+
+        if self._main_thread_scheduler is not None:
+            self.log_debug(self._main_thread_scheduler.format_stats())
+            self._main_thread_scheduler.close()
+            self._main_thread_scheduler = None
+
+        if self._log_sink is not None:
+            log_sink = self._log_sink
+            self.log_debug(
+                "Printed %d log messages to the listener, dropped %d."
+                % (log_sink.flushed_count, log_sink.dropped_count)
+            )
+            self._log_sink = None
+            log_sink.close()
+
+        if self._binary_log is not None:
+            binary_log = self._binary_log
+            self._binary_log = None
+            binary_log.close()
+
+    def dump_pymxs_trace(self, limit=20):
+        """
+        Log the aggregated timings of the calls made through ``pymxs.runtime``.
+
+        Tracing is enabled with the ``trace_pymxs`` setting or the
+        ``SGTK_3DSMAX_TRACE_PYMXS`` environment variable.
+
+        :param int limit: Maximum number of operations and call sites reported.
+        :returns: The report, or None if tracing is disabled.
+        """
+        if self._pymxs_tracer is None:
+            self.logger.warning(
+                "pymxs tracing is disabled, enable the trace_pymxs setting or set "
+                "SGTK_3DSMAX_TRACE_PYMXS."
+            )
+            return None
+
+        report = self._pymxs_tracer.format_report(limit)
+        self.logger.info(report)
+        return report
 
     def update_shotgun_menu(self):
         """
         Rebuild the shotgun menu displayed in the main menu bar
         """
-        self._remove_shotgun_menu()
+        if not self._menu_generator.can_update_in_place():
+            self._remove_shotgun_menu()
         self._add_shotgun_menu()
 
     ##########################################################################################
@@ -490,8 +897,33 @@ Please report any issues to:
         """
         Emits a log message.
         """
+        if self._binary_log is not None:
+            self._binary_log.write(record)
+
         msg_str = handler.format(record)
-        self.async_execute_in_main_thread(self._print_output, msg_str)
+        if self._log_sink is not None:
+            self._log_sink.write(msg_str)
+        else:
+            self.async_execute_in_main_thread(self._print_output, msg_str)
+
+    def _open_binary_log(self):
+        """
+        Start writing the log records to the binary log files, next to the
+        regular log files.
+        """
+        path = os.path.join(
+            sgtk.LogManager().log_folder, "%s.sgtklog" % self.instance_name
+        )
+        try:
+            self._binary_log = self.tk_3dsmax.BinaryLog(
+                path,
+                self.get_setting("binary_log_max_size", 4) * 1024 * 1024,
+                self.get_setting("binary_log_backup_count", 3),
+            )
+        except (IOError, OSError) as e:
+            self.logger.warning("Unable to open the binary log %s: %s" % (path, e))
+            return
+        self.log_debug("Writing the binary log to %s" % self._binary_log.path)
 
     def _print_output(self, msg):
         """
@@ -520,13 +952,24 @@ Please report any issues to:
             # https://help.autodesk.com/view/3DSMAX/2020/ENU/?guid=__developer_creating_python_uis_html
             from sgtk.platform.qt import QtGui, shiboken
 
+            if self._main_window is not None and shiboken.isValid(self._main_window):
+                return self._main_window
+
             widget = QtGui.QWidget.find(pymxs.runtime.windows.getMAXHWND())
-            return shiboken.wrapInstance(
+            self._main_window = shiboken.wrapInstance(
                 shiboken.getCppPointer(widget)[0], QtGui.QMainWindow
             )
+            self._main_window.destroyed.connect(self._on_main_window_destroyed)
+            return self._main_window
         else:
             return super()._get_dialog_parent()
 
+    def _on_main_window_destroyed(self, *args):
+        """
+        Drops the cached main window wrapper when 3ds Max destroys its window.
+        """
+        self._main_window = None
+
     def show_panel(self, panel_id, title, bundle, widget_class, *args, **kwargs):
         """
         Docks an app widget in a 3dsmax panel.
@@ -540,7 +983,7 @@ Please report any issues to:
 
         :returns: the created widget_class instance
         """
-        from sgtk.platform.qt import QtCore, QtGui
+        from sgtk.platform.qt import QtCore, shiboken
 
         self.log_debug("Begin showing panel %s" % panel_id)
 
@@ -558,42 +1001,34 @@ Please report any issues to:
 
         main_window = self._get_dialog_parent()
         # Check if the dock widget wrapper already exists.
-        dock_widget = main_window.findChild(QtGui.QDockWidget, dock_widget_id)
+        dock_widget = self._dock_widgets.get(panel_id)
+        if dock_widget is not None and not shiboken.isValid(dock_widget):
+            del self._dock_widgets[panel_id]
+            dock_widget = None
+
+        # Placeholder docks restored from the layout, and docks whose panel was
+        # closed, are already in place.
+        restore_dock = True
 
-        if dock_widget is None:
+        if dock_widget is None or dock_widget.widget() is None:
             # The dock widget wrapper cannot be found in the main window's
             # children list so that means it has not been created yet, so create it.
             widget_instance = widget_class(*args, **kwargs)
-            widget_instance.setParent(self._get_dialog_parent())
+            widget_instance.setParent(main_window)
             widget_instance.setObjectName(panel_id)
 
-            class DockWidget(QtGui.QDockWidget):
-                """
-                Widget used for docking app panels that ensures the widget is closed when the dock is closed
-                """
-
-                closed = QtCore.Signal(QtCore.QObject)
-
-                def closeEvent(self, event):
-                    widget = self.widget()
-                    if widget:
-                        widget.close()
-                    self.setParent(None)
-                    self.closed.emit(self)
-
-            dock_widget = DockWidget(title, parent=main_window)
-            dock_widget.setObjectName(dock_widget_id)
+            if dock_widget is None:
+                dock_widget = self._create_dock_widget(panel_id, title, main_window)
+                self.log_debug("Created new dock widget %s" % dock_widget_id)
+            else:
+                dock_widget.setWindowTitle(title)
+                restore_dock = False
+                self.log_debug("Reusing empty dock widget %s" % dock_widget_id)
             dock_widget.setWidget(widget_instance)
-            # Add a callback to remove the dock_widget from the list of open panels and delete it
-            dock_widget.closed.connect(self._remove_dock_widget)
-            self.log_debug("Created new dock widget %s" % dock_widget_id)
 
             # Disable 3dsMax accelerators, in order for QTextEdit and QLineEdit
             # widgets to work properly.
             widget_instance.setProperty("NoMaxAccelerators", True)
-
-            # Remember the dock widget, so we can delete it later.
-            self._dock_widgets.append(dock_widget)
         else:
             # The dock widget wrapper already exists, so just get the
             # shotgun panel from it.
@@ -603,7 +1038,11 @@ Please report any issues to:
         # apply external stylesheet
         self._apply_external_stylesheet(bundle, widget_instance)
 
-        if not main_window.restoreDockWidget(dock_widget):
+        if panel_id == self._prewarming_panel_id:
+            # The panel is built ahead of time, it will be docked when shown.
+            return widget_instance
+
+        if restore_dock and not main_window.restoreDockWidget(dock_widget):
             # The dock widget cannot be restored from the main window's state,
             # so dock it to the right dock area and make it float by default.
             main_window.addDockWidget(QtCore.Qt.RightDockWidgetArea, dock_widget)
@@ -612,12 +1051,168 @@ Please report any issues to:
         dock_widget.show()
         return widget_instance
 
+    def _create_dock_widget(self, panel_id, title, main_window):
+        """
+        Creates the dock widget wrapping a panel and registers it.
+
+        :param panel_id: Unique identifier for the panel.
+        :param title: The title of the panel
+        :param main_window: The 3dsmax main window.
+        :returns: The dock widget, without any widget set.
+        """
+        from sgtk.platform.qt import QtCore, QtGui
+
+        class DockWidget(QtGui.QDockWidget):
+            """
+            Widget used for docking app panels that ensures the widget is closed when the dock is closed
+            """
+
+            closed = QtCore.Signal(QtCore.QObject)
+
+            def closeEvent(self, event):
+                widget = self.widget()
+                if widget:
+                    widget.close()
+                self.closed.emit(self)
+
+        dock_widget = DockWidget(title, parent=main_window)
+        dock_widget.setObjectName("sgtk_dock_widget_" + panel_id)
+        # Add a callback to release the panel when the dock_widget is closed
+        dock_widget.closed.connect(self._release_dock_widget_panel)
+
+        # Remember the dock widget, so we can delete it later.
+        self._dock_widgets[panel_id] = dock_widget
+        return dock_widget
+
+    def _initialize_panels(self):
+        """
+        Restores the panels of the saved layout as placeholders and schedules
+        the panels to build ahead of time, as configured by the ``lazy_panels``
+        and ``prewarm_panels`` settings.
+        """
+        from sgtk.platform.qt import QtCore
+
+        if not self.has_ui or self.max_version_year <= 2017:
+            return
+
+        if self.get_setting("lazy_panels", False):
+            for panel_id in self.panels:
+                self._create_panel_placeholder(panel_id)
+
+        for panel_id in self.get_setting("prewarm_panels", []):
+            if panel_id in self.panels:
+                self._panels_to_prewarm.append(panel_id)
+            else:
+                self.log_warning(
+                    "%s configuration setting 'prewarm_panels' requests panel '%s' "
+                    "that is not registered." % (self.name, panel_id)
+                )
+
+        if self._panels_to_prewarm:
+            QtCore.QTimer.singleShot(0, self._prewarm_next_panel)
+
+    def _create_panel_placeholder(self, panel_id):
+        """
+        Creates an empty dock widget for a panel if the saved layout of the
+        main window has a place for it.
+
+        The panel itself is only built when the dock widget becomes visible.
+
+        :param panel_id: Unique identifier for the panel.
+        """
+        from sgtk.platform.qt import QtCore
+
+        if panel_id in self._dock_widgets:
+            return
+
+        main_window = self._get_dialog_parent()
+        dock_widget = self._create_dock_widget(panel_id, panel_id, main_window)
+        if not main_window.restoreDockWidget(dock_widget):
+            # The panel is not part of the saved layout.
+            del self._dock_widgets[panel_id]
+            dock_widget.setParent(None)
+            dock_widget.deleteLater()
+            return
+
+        def on_visibility_changed(visible):
+            if visible:
+                # Build the panel once the dock widget is done changing state.
+                QtCore.QTimer.singleShot(0, lambda: self._materialize_panel(panel_id))
+
+        dock_widget.visibilityChanged.connect(on_visibility_changed)
+        self.log_debug("Restored placeholder for panel %s" % panel_id)
+
+        if dock_widget.isVisible():
+            on_visibility_changed(True)
+
+    def _materialize_panel(self, panel_id):
+        """
+        Builds the panel of a placeholder dock widget.
+
+        :param panel_id: Unique identifier for the panel.
+        """
+        dock_widget = self._dock_widgets.get(panel_id)
+        if dock_widget is None or dock_widget.widget() is not None:
+            return
+        self._run_panel_callback(panel_id)
+
+    def _prewarm_next_panel(self):
+        """
+        Builds the next panel listed in the ``prewarm_panels`` setting, hidden,
+        and schedules the following one so that the UI stays responsive.
+        """
+        from sgtk.platform.qt import QtCore
+
+        if not self._panels_to_prewarm:
+            return
+
+        panel_id = self._panels_to_prewarm.pop(0)
+        dock_widget = self._dock_widgets.get(panel_id)
+        if dock_widget is None or dock_widget.widget() is None:
+            self.log_debug("Prewarming panel %s" % panel_id)
+            self._prewarming_panel_id = panel_id
+            try:
+                self._run_panel_callback(panel_id)
+            finally:
+                self._prewarming_panel_id = None
+
+        if self._panels_to_prewarm:
+            QtCore.QTimer.singleShot(0, self._prewarm_next_panel)
+
+    def _run_panel_callback(self, panel_id):
+        """
+        Runs the callback an app registered for a panel, which shows the panel.
+
+        :param panel_id: Unique identifier for the panel.
+        """
+        panel = self.panels.get(panel_id)
+        if panel is None:
+            return
+        try:
+            panel["callback"]()
+        except Exception:
+            self.logger.exception("Failed to build panel %s" % panel_id)
+
+    def _release_dock_widget_panel(self, dock_widget):
+        """
+        Deletes the panel of a dock widget that was closed.
+
+        The dock widget stays in the main window, hidden, and in the registry,
+        so showing the panel again docks it at the same place.
+        """
+        widget = dock_widget.widget()
+        if widget is not None:
+            widget.setParent(None)
+            widget.deleteLater()
+
     def _remove_dock_widget(self, dock_widget):
         """
         Removes a docked widget (panel) opened by the engine
         """
         self._get_dialog_parent().removeDockWidget(dock_widget)
-        self._dock_widgets.remove(dock_widget)
+        panel_id = dock_widget.objectName()[len("sgtk_dock_widget_") :]
+        if self._dock_widgets.get(panel_id) is dock_widget:
+            del self._dock_widgets[panel_id]
         dock_widget.deleteLater()
 
     def close_windows(self):
@@ -641,9 +1236,24 @@ Please report any issues to:
                     "Cannot close dialog %s: %s" % (dialog_window_title, exception)
                 )
 
-        # Close all dock widgets previously added.
-        for dock_widget in self._dock_widgets[:]:
+        self._remove_dock_widgets()
+
+    def _remove_dock_widgets(self):
+        """
+        Closes all the dock widgets opened by the engine and removes them from
+        the main window, since the next engine instance creates its own.
+        """
+        if not self._dock_widgets:
+            return
+
+        from sgtk.platform.qt import shiboken
+
+        for panel_id, dock_widget in list(self._dock_widgets.items()):
+            if not shiboken.isValid(dock_widget):
+                del self._dock_widgets[panel_id]
+                continue
             dock_widget.close()
+            self._remove_dock_widget(dock_widget)
 
     def _create_dialog(self, title, bundle, widget, parent):
         """
@@ -657,24 +1267,63 @@ Please report any issues to:
         self._dialog.installEventFilter(self.dialogEvents)
 
         # Add to tracked dialogs (will be removed in eventFilter)
-        self._safe_dialog.append(self._dialog)
+        self._safe_dialogs.add(self._dialog)
 
         # Apply the engine-level stylesheet.
         self._apply_external_styleshet(self, self._dialog)
 
         return self._dialog
 
-    def reload_qss(self):
+    def reload_qss(self, path=None):
         """
         Causes the style.qss file that comes with the tk-rv engine to
         be re-applied to all dialogs that the engine has previously
         launched.
+
+        :param path: Path of the qss file that changed. All the cached
+            stylesheets are read again if None.
         """
         self.log_warning("Reloading engine QSS...")
+        if self._stylesheets is not None:
+            self._stylesheets.invalidate(path)
+        # Editors often replace the file when saving it, which stops it from
+        # being watched.
+        qss_watcher = getattr(self, "_qss_watcher", None)
+        if path and qss_watcher and path not in qss_watcher.files():
+            if os.path.exists(path):
+                qss_watcher.addPath(path)
         for dialog in self.created_qt_dialogs:
             self._apply_external_styleshet(self, dialog)
             dialog.update()
 
+    def _apply_external_styleshet(self, bundle, widget):
+        """
+        Applies the qss file of a bundle to a widget and all its children.
+
+        The processed stylesheet is cached, so the file is only read again
+        after it changed on disk.
+
+        :param bundle: The bundle whose style.qss file is applied.
+        :param widget: The widget to style.
+        """
+        if self._stylesheets is None:
+            super()._apply_external_styleshet(bundle, widget)
+            return
+
+        qss_file = os.path.join(
+            bundle.disk_location, sgtk.platform.constants.BUNDLE_STYLESHEET_FILE
+        )
+        try:
+            qss_data = self._stylesheets.get(qss_file)
+            if qss_data is not None:
+                widget.setStyleSheet(qss_data)
+        except Exception as e:
+            # catch-all and issue a warning and continue.
+            self.log_warning("Could not apply stylesheet '%s': %s" % (qss_file, e))
+
+    # Both spellings are used by the base class.
+    _apply_external_stylesheet = _apply_external_styleshet
+
     def show_modal(self, title, bundle, widget_class, *args, **kwargs):
         from sgtk.platform.qt import QtGui
 
@@ -725,39 +1374,22 @@ Please report any issues to:
 
         # Merge operation can cause max dialogs to pop up, and closing the window results in a crash.
         # So keep alive and hide all of our qt windows while this type of operations are occuring.
-        from sgtk.platform.qt import QtGui
+        with self.safe_dialog_batch():
+            func()
 
-        toggled = []
-        for sd in self._safe_dialog:
-            try:
-                self.log_debug("Processing dialog to hide: %r" % sd)
-                dialog = sd
-            except RuntimeError as e:
-                # this should hide all visible sgtk dialogs
-                # but in 3dsmax 2024/Python 3.10 they seem to be deleted by the garbage collector
-                # so falling back to the last _dialog created on _create_dialog method
-                self.log_warning(e)
-                dialog = self._dialog
-            finally:
-                needs_toggling = dialog.isVisible()
-                if needs_toggling:
-                    self.log_debug("Toggling dialog off: %r" % dialog)
-                    toggled.append(dialog)
-                    dialog.hide()
-                    dialog.lower()
-                    QtGui.QApplication.processEvents()
-                else:
-                    self.log_debug("Dialog is already hidden: %r" % dialog)
+    def safe_dialog_batch(self):
+        """
+        Context manager keeping the Toolkit dialogs hidden for a batch of
+        operations that may show 3ds Max windows, see :meth:`safe_dialog_exec`.
 
-        try:
-            func()
-        finally:
-            for dialog in toggled:
-                # Restore the window after the operation is completed
-                self.log_debug("Toggling dialog on: %r" % dialog)
-                dialog.show()
-                dialog.activateWindow()  # for Windows
-                dialog.raise_()  # for MacOS
+        Blocks can be nested, the dialogs are only hidden when entering the
+        outermost block and shown again when leaving it::
+
+            with engine.safe_dialog_batch():
+                for path in paths:
+                    engine.safe_dialog_exec(lambda: merge(path))
+        """
+        return self._safe_dialogs.hidden()
 
     @property
     def max_version_year(self):
@@ -127,11 +127,14 @@ class MaxActions(HookBaseClass):
 
         :param list actions: Action dictionaries.
         """
-        for single_action in actions:
-            name = single_action["name"]
-            sg_publish_data = single_action["sg_publish_data"]
-            params = single_action["params"]
-            self.execute_action(name, params, sg_publish_data)
+        # Keep the dialogs hidden for the whole selection instead of toggling
+        # them for each action.
+        with self.parent.engine.safe_dialog_batch():
+            for single_action in actions:
+                name = single_action["name"]
+                sg_publish_data = single_action["sg_publish_data"]
+                params = single_action["params"]
+                self.execute_action(name, params, sg_publish_data)
 
     def execute_action(self, name, params, sg_publish_data):
         """
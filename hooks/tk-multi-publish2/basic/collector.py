@@ -9,11 +9,10 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import pymxs
 import sgtk
 from sgtk.platform.qt import QtGui
 
-import pymxs
-
 HookBaseClass = sgtk.get_hook_baseclass()
 
 
@@ -118,7 +117,7 @@ class MaxSessionCollector(HookBaseClass):
 
         publisher = self.parent
 
-        path = _session_path()
+        path = self.parent.engine.scene_state.get_session_path()
 
         # determine the display name for the item
         if path:
@@ -253,30 +252,21 @@ class MaxSessionCollector(HookBaseClass):
         geo_item.set_icon_from_path(icon_path)
 
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    if pymxs.runtime.maxFilePath and pymxs.runtime.maxFileName:
-        return os.path.join(pymxs.runtime.maxFilePath, pymxs.runtime.maxFileName)
-    else:
-        return None
-
-
 def _is_empty_scene():
-    return len(pymxs.runtime.rootNode.Children) == 0
+    # The engine keeps count of the scene nodes, so this doesn't list them.
+    return sgtk.platform.current_engine().scene_nodes.is_empty()
 
 
 def _get_project_folder_dir():
-    return pymxs.runtime.pathConfig.getCurrentProjectFolder()
+    return sgtk.platform.current_engine().scene_state.get_project_folder()
 
 
 def _set_project_folder_dir(path):
-    pymxs.runtime.pathConfig.setCurrentProjectFolder(path)
+    sgtk.platform.current_engine().scene_state.set_project_folder(path)
 
 
 def _get_preview_dir():
+    # Cheap to read, and it follows the project folder, so it isn't cached.
     return pymxs.runtime.pathConfig.GetDir(pymxs.runtime.Name("preview"))
 
 
@@ -170,7 +170,7 @@ class MaxSessionPublishPlugin(HookBaseClass):
         if settings.get("Publish Template").value:
             item.context_change_allowed = False
 
-        path = _session_path()
+        path = self.parent.engine.scene_state.get_session_path()
 
         if not path:
             # the session has not been saved before (no path determined).
@@ -198,7 +198,7 @@ class MaxSessionPublishPlugin(HookBaseClass):
         """
 
         publisher = self.parent
-        path = _session_path()
+        path = self.parent.engine.scene_state.get_session_path()
 
         # ---- ensure the session has been saved
 
@@ -298,7 +298,9 @@ class MaxSessionPublishPlugin(HookBaseClass):
 
         # get the path in a normalized state. no trailing separator, separators
         # are appropriate for current os, no double separators, etc.
-        path = sgtk.util.ShotgunPath.normalize(_session_path())
+        path = sgtk.util.ShotgunPath.normalize(
+            self.parent.engine.scene_state.get_session_path()
+        )
 
         # ensure the session is saved
         _save_session(path)
@@ -327,17 +329,6 @@ class MaxSessionPublishPlugin(HookBaseClass):
         self._save_to_next_version(item.properties["path"], item, _save_session)
 
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    if pymxs.runtime.maxFilePath and pymxs.runtime.maxFileName:
-        return os.path.join(pymxs.runtime.maxFilePath, pymxs.runtime.maxFileName)
-    else:
-        return None
-
-
 def _save_session(path):
     """
     Save the current session to the supplied path.
@@ -156,7 +156,7 @@ class MaxSessionGeometryPublishPlugin(HookBaseClass):
         :returns: True if item is valid, False otherwise.
         """
 
-        path = _session_path()
+        path = self.parent.engine.scene_state.get_session_path()
 
         # ---- ensure the session has been saved
 
@@ -243,19 +243,9 @@ class MaxSessionGeometryPublishPlugin(HookBaseClass):
         super().publish(settings, item)
 
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    if pymxs.runtime.maxFilePath and pymxs.runtime.maxFileName:
-        return os.path.join(pymxs.runtime.maxFilePath, pymxs.runtime.maxFileName)
-    else:
-        return None
-
-
 def _is_empty_scene():
-    return len(pymxs.runtime.rootNode.Children) == 0
+    # The engine keeps count of the scene nodes, so this doesn't list them.
+    return sgtk.platform.current_engine().scene_nodes.is_empty()
 
 
 def _get_save_as_action():
@@ -120,7 +120,7 @@ class MaxStartVersionControlPlugin(HookBaseClass):
         """
 
         publisher = self.parent
-        path = _session_path()
+        path = self.parent.engine.scene_state.get_session_path()
 
         if path:
             version_number = self._get_version_number(path, item)
@@ -163,7 +163,7 @@ class MaxStartVersionControlPlugin(HookBaseClass):
         """
 
         publisher = self.parent
-        path = _session_path()
+        path = self.parent.engine.scene_state.get_session_path()
 
         if not path:
             # the session still requires saving. provide a save button.
@@ -204,7 +204,9 @@ class MaxStartVersionControlPlugin(HookBaseClass):
 
         # get the path in a normalized state. no trailing separator, separators
         # are appropriate for current os, no double separators, etc.
-        path = sgtk.util.ShotgunPath.normalize(_session_path())
+        path = sgtk.util.ShotgunPath.normalize(
+            self.parent.engine.scene_state.get_session_path()
+        )
 
         # ensure the session is saved in its current state
         _save_session(path)
@@ -267,17 +269,6 @@ class MaxStartVersionControlPlugin(HookBaseClass):
         return version_number
 
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    if pymxs.runtime.maxFilePath and pymxs.runtime.maxFileName:
-        return os.path.join(pymxs.runtime.maxFilePath, pymxs.runtime.maxFileName)
-    else:
-        return None
-
-
 def _save_session(path):
     """
     Save the current session to the supplied path.
@@ -8,8 +8,6 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import pymxs
-
 import sgtk
 
 HookBaseClass = sgtk.get_hook_baseclass()
@@ -28,9 +26,8 @@ class FrameOperation(HookBaseClass):
         :returns: Returns the frame range in the form (in_frame, out_frame)
         :rtype: tuple[int, int]
         """
-        current_in = int(pymxs.runtime.animationRange.start.frame)
-        current_out = int(pymxs.runtime.animationRange.end.frame)
-        return (current_in, current_out)
+        # The engine keeps the range current through 3ds Max notifications.
+        return self.parent.engine.scene_state.get_frame_range()
 
     def set_frame_range(self, in_frame=None, out_frame=None, **kwargs):
         """
@@ -43,4 +40,4 @@ class FrameOperation(HookBaseClass):
             (e.g. the current shot, current asset etc)
 
         """
-        pymxs.runtime.animationRange = pymxs.runtime.interval(in_frame, out_frame)
+        self.parent.engine.scene_state.set_frame_range(in_frame, out_frame)
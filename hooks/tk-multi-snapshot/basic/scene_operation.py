@@ -8,8 +8,6 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import os
-
 import pymxs
 
 import tank
@@ -41,7 +39,7 @@ class SceneOperation(Hook):
         """
         if operation == "current_path":
             # return the current scene path
-            file_path = _session_path()
+            file_path = self.parent.engine.scene_state.get_session_path()
             if not file_path:
                 return ""
             return file_path
@@ -53,20 +51,11 @@ class SceneOperation(Hook):
             _save_file()
 
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    if pymxs.runtime.maxFilePath and pymxs.runtime.maxFileName:
-        return os.path.join(pymxs.runtime.maxFilePath, pymxs.runtime.maxFileName)
-    else:
-        return None
-
-
 def _open_file(file_path):
     pymxs.runtime.loadMaxFile(file_path)
 
 
 def _save_file(file_path=None):
-    pymxs.runtime.saveMaxFile(_session_path())
+    pymxs.runtime.saveMaxFile(
+        tank.platform.current_engine().scene_state.get_session_path()
+    )
@@ -8,8 +8,6 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import os
-
 import pymxs
 
 import sgtk
@@ -67,7 +65,7 @@ class SceneOperation(HookClass):
         """
         if operation == "current_path":
             # return the current scene path or an empty string.
-            return _session_path() or ""
+            return self.parent.engine.scene_state.get_session_path() or ""
         elif operation == "open":
             # open the specified scene
             _open_file(file_path)
@@ -85,17 +83,6 @@ class SceneOperation(HookClass):
             return True
 
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    if pymxs.runtime.maxFilePath and pymxs.runtime.maxFileName:
-        return os.path.join(pymxs.runtime.maxFilePath, pymxs.runtime.maxFileName)
-    else:
-        return None
-
-
 def _open_file(file_path):
     pymxs.runtime.loadMaxFile(file_path)
 
@@ -10,7 +10,9 @@
 from pymxs import runtime as rt
 import os
 import sys
+import threading
 import hashlib
+import functools
 
 from . import constants
 from . import __name__ as PLUGIN_PACKAGE_NAME
@@ -112,7 +114,14 @@ def progress_callback(invoker, progress_value, message):
     # Make sure this is invoked in the main thread, as pymxs can't be
     # used from background threads.
     # Display temporary message in prompt line for maximum 2 secs.
-    invoker.invoke(rt.displayTempPrompt, "Flow Production Tracking: %s" % message, 2000)
+    # Only the latest message is displayed when they come faster than the main
+    # thread can display them.
+    invoker.invoke_keyed(
+        "progress",
+        rt.displayTempPrompt,
+        "Flow Production Tracking: %s" % message,
+        2000,
+    )
 
 
 def handle_bootstrap_completed(engine):
@@ -196,6 +205,13 @@ class AsyncInvoker(QtCore.QObject):
     Invoker class - implements a mechanism to execute a function with arbitrary
     args in the main thread asynchronously.
 
+    Calls invoked with a key replace the pending call with the same key, so a
+    burst of progress updates only emits one signal and runs the last update.
+
+    Once the engine is started, the calls are queued in the engine's
+    ``main_thread_scheduler`` instead, so they share its queue and time slices
+    with the other main thread tasks.
+
     This was copied from tk-core and should probably be refactored into
     a component that users could invoke.
     """
@@ -208,6 +224,9 @@ class AsyncInvoker(QtCore.QObject):
         """
         QtCore.QObject.__init__(self)
         self.__signal.connect(self.__execute_in_main_thread)
+        self.__lock = threading.Lock()
+        # key -> latest pending call
+        self.__pending = {}
 
     def invoke(self, fn, *args, **kwargs):
         """
@@ -218,9 +237,58 @@ class AsyncInvoker(QtCore.QObject):
         :param **kwargs:    Named arguments for the function
         :returns:           The result returned by the function
         """
+        if self.__submit(functools.partial(fn, *args, **kwargs)):
+            return
 
         self.__signal.emit(lambda: fn(*args, **kwargs))
 
+    def invoke_keyed(self, key, fn, *args, **kwargs):
+        """
+        Invoke the specified function in the main thread, replacing the call
+        with the same key that didn't run yet.
+
+        :param key:         Key identifying the calls to coalesce
+        :param fn:          The function to execute in the main thread
+        :param *args:       Args for the function
+        :param **kwargs:    Named arguments for the function
+        """
+        if self.__submit(
+            functools.partial(fn, *args, **kwargs), key=(PLUGIN_PACKAGE_NAME, key)
+        ):
+            return
+
+        with self.__lock:
+            emit = key not in self.__pending
+            self.__pending[key] = lambda: fn(*args, **kwargs)
+
+        if emit:
+            self.__signal.emit(lambda: self.__execute_pending(key))
+
+    def __submit(self, fn, key=None):
+        """
+        Queue a call in the engine's main thread scheduler.
+
+        :returns: False if there is no scheduler to queue the call in.
+        """
+        import sgtk
+
+        engine = sgtk.platform.current_engine()
+        scheduler = getattr(engine, "main_thread_scheduler", None)
+        if scheduler is None:
+            return False
+        try:
+            scheduler.submit(fn, key=key)
+        except RuntimeError:
+            # The scheduler was closed while the engine shuts down.
+            return False
+        return True
+
+    def __execute_pending(self, key):
+        with self.__lock:
+            fn = self.__pending.pop(key, None)
+        if fn is not None:
+            fn()
+
     def __execute_in_main_thread(self, fn):
         fn()
 
@@ -295,7 +363,8 @@ def _login_user():
     # but pymxs can't be called anywhere else than the main thead.
     #
     # Note that we can't call engine.async_execute_in_main_thread because
-    # the engine is not started yet.
+    # the engine is not started yet. The invoker switches to the engine's
+    # main thread scheduler once it is.
     invoker = AsyncInvoker()
 
     # set up a simple progress reporter
@@ -10,4 +10,26 @@
 
 from .menu_generation_menuman import MenuGenerator_menuMan
 from .menu_generation_callbacks import MenuGenerator_callbacks
-from .maxscript import MaxScript
+from .maxscript import MaxScript, MaxScriptBatch
+from .callback_registry import CallbackRegistry
+from .command_index import CommandIndex
+from .macro_manifest import MacroManifest
+from .menu_registry import MenuRegistry
+from .listener_log_sink import ListenerLogSink
+from .binary_log import BinaryLog
+from .pymxs_tracer import PymxsTracer
+from .scene_state import SceneState
+from .scene_nodes import SceneNodeCounters
+from .dialog_registry import DialogRegistry
+from .stylesheet_cache import StylesheetCache
+from .startup_commands import StartupCommandScheduler
+from .main_thread_scheduler import (
+    MainThreadScheduler,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    PRIORITY_LOW,
+)
+from .pymxs_facade import PymxsFacade
+from .async_loop import AsyncLoop
+from .notifications import NotificationDispatcher, NotificationEvent, Subscription
+from .startup_profiler import StartupProfiler
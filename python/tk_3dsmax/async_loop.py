@@ -0,0 +1,157 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+asyncio event loop driven by the 3ds Max Qt event loop.
+"""
+
+import asyncio
+import concurrent.futures
+
+from sgtk.platform.qt import QtCore
+
+from .qt_utils import start_timer
+
+
+class AsyncLoop(object):
+    """
+    Hosts an asyncio event loop in the 3ds Max main thread.
+
+    3ds Max owns the main thread's event loop, so the asyncio loop is stepped
+    by a Qt timer: each time the timer fires, the loop runs the callbacks that
+    are ready without waiting for I/O. The timer only runs while coroutines
+    submitted through :meth:`run` are pending, so an idle loop costs nothing.
+
+    Coroutines run in the main thread and can use pymxs and Qt between two
+    awaits. Blocking work, e.g. file system or Shotgun calls, should be
+    awaited through :meth:`run_in_executor`, which runs it in the loop's
+    thread pool::
+
+        async def collect(path):
+            names = await engine.async_loop.run_in_executor(os.listdir, path)
+            ...
+
+        engine.run_async(collect(path))
+
+    The loop must be created from the main thread.
+    """
+
+    def __init__(self, logger, poll_interval=10, max_workers=None):
+        """
+        :param logger: Logger used to report the coroutines that fail.
+        :param int poll_interval: Delay in milliseconds between two steps of
+            the loop while coroutines are pending.
+        :param int max_workers: Maximum number of threads of the default
+            executor. Uses the :class:`concurrent.futures.ThreadPoolExecutor`
+            default if None.
+        """
+        self._logger = logger
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sgtk_3dsmax_async"
+        )
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(self._executor)
+        self._loop.set_exception_handler(self._handle_exception)
+        # Futures returned by run() whose coroutine didn't complete yet.
+        self._pending = set()
+
+        self._timer = QtCore.QTimer()
+        self._timer.setInterval(poll_interval)
+        self._timer.timeout.connect(self._step)
+
+    @property
+    def loop(self):
+        """
+        The :class:`asyncio.AbstractEventLoop`.
+        """
+        return self._loop
+
+    def run(self, coroutine):
+        """
+        Schedule a coroutine on the loop. Can be called from any thread.
+
+        :param coroutine: Coroutine object to run.
+        :returns: :class:`concurrent.futures.Future` holding the result of
+            the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+        start_timer(self._timer)
+        return future
+
+    def run_in_executor(self, func, *args):
+        """
+        Run a blocking function in the loop's thread pool.
+
+        :param func: Function to run.
+        :param args: Positional arguments for the function.
+        :returns: :class:`asyncio.Future` to await from a coroutine running on
+            the loop.
+        """
+        return self._loop.run_in_executor(None, func, *args)
+
+    def close(self):
+        """
+        Cancel the pending coroutines, stop the thread pool and close the loop.
+
+        Must be called from the main thread.
+        """
+        self._timer.stop()
+        if self._loop.is_closed():
+            return
+
+        tasks = asyncio.all_tasks(self._loop)
+        for task in tasks:
+            task.cancel()
+        if tasks and not self._loop.is_running():
+            # Let the coroutines handle their cancellation.
+            self._loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True)
+            )
+
+        self._executor.shutdown(wait=False)
+        if not self._loop.is_running():
+            self._loop.close()
+
+    def _step(self):
+        """
+        Run the callbacks of the loop that are ready.
+        """
+        if self._loop.is_running():
+            # A coroutine is processing the Qt events, e.g. showing a modal
+            # dialog, so the loop is already being stepped.
+            return
+
+        # Stopping the loop from a callback makes it run a single iteration,
+        # which doesn't wait for I/O since a callback is ready.
+        self._loop.call_soon(self._loop.stop)
+        self._loop.run_forever()
+
+        # The result of a coroutine is only passed on to its future on the
+        # iteration after the coroutine completes.
+        if not self._pending and not asyncio.all_tasks(self._loop):
+            self._timer.stop()
+
+    def _handle_exception(self, loop, context):
+        """
+        Log the errors the loop reports, e.g. coroutines that failed and whose
+        result was never retrieved.
+        """
+        exception = context.get("exception")
+        self._logger.error(
+            "asyncio: %s" % context.get("message", "Unhandled error"),
+            exc_info=(
+                (type(exception), exception, exception.__traceback__)
+                if exception
+                else None
+            ),
+        )
@@ -0,0 +1,261 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Binary log sink writing structured log records to memory-mapped files.
+"""
+
+import logging
+import mmap
+import os
+import re
+import threading
+
+from .binary_log_reader import (
+    FILE_HEADER,
+    HEADER_SIZE,
+    MAGIC,
+    RECORD_HEADER,
+    VERSION,
+)
+
+# Smallest size of a log file, so that a record of a reasonable size fits.
+MIN_FILE_SIZE = 64 * 1024
+
+# Formats the tracebacks attached to the records.
+_formatter = logging.Formatter()
+
+
+class BinaryLog(object):
+    """
+    Appends log records to a preallocated, memory-mapped log file.
+
+    Records are copied in the mapped memory under a lock, so they can be
+    written from any thread without going through the main thread. When the
+    file is full, it is renamed with a ``.1`` suffix, the existing backups are
+    shifted, and a new file is started. The file of the previous session is
+    rotated the same way when the log is opened.
+
+    When the file is used by another 3ds Max session, the log is written to a
+    file suffixed with the process id instead. Only the most recent of those
+    files are kept, as many as the rotated backups.
+
+    The files can be queried with :mod:`binary_log_reader`.
+    """
+
+    def __init__(self, path, max_size, backup_count):
+        """
+        Open the log and rotate the previous files.
+
+        :param str path: Path to the log file.
+        :param int max_size: Size, in bytes, of each log file.
+        :param int backup_count: Number of rotated files kept besides the
+            current one.
+        :raises OSError: If the log file can't be created.
+        """
+        self._path = path
+        self._max_size = max(max_size, MIN_FILE_SIZE)
+        self._backup_count = max(backup_count, 0)
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._buffer = None
+        self._offset = HEADER_SIZE
+        self._first_time = 0.0
+        self._last_time = 0.0
+
+        try:
+            self._open()
+        except OSError:
+            # The file is most likely used by another 3ds Max session.
+            root, ext = os.path.splitext(path)
+            self._path = "%s-%d%s" % (root, os.getpid(), ext)
+            self._open()
+        self._remove_old_session_files(path)
+
+    @property
+    def path(self):
+        """
+        Path to the current log file.
+        """
+        return self._path
+
+    def write(self, record):
+        """
+        Append a log record to the file.
+
+        :param record: :class:`logging.LogRecord` to write.
+        """
+        logger = record.name.encode("utf-8")[:0xFFFF]
+        thread = (record.threadName or "").encode("utf-8")[:0xFFFF]
+        message = _format_message(record).encode("utf-8", "replace")
+
+        with self._lock:
+            if self._buffer is None:
+                return
+
+            # Messages longer than a whole file are truncated.
+            capacity = self._max_size - HEADER_SIZE - RECORD_HEADER.size
+            message = message[: max(capacity - len(logger) - len(thread), 0)]
+            size = RECORD_HEADER.size + len(logger) + len(thread) + len(message)
+
+            if self._offset + size > self._max_size:
+                self._close()
+                try:
+                    self._open()
+                except OSError:
+                    # Stop logging rather than failing every log call.
+                    return
+
+            offset = self._offset
+            RECORD_HEADER.pack_into(
+                self._buffer,
+                offset,
+                size,
+                record.created,
+                min(record.levelno, 0xFF),
+                len(logger),
+                len(thread),
+                len(message),
+            )
+            offset += RECORD_HEADER.size
+            for data in (logger, thread, message):
+                self._buffer[offset : offset + len(data)] = data
+                offset += len(data)
+
+            # The header is updated once the record is complete, so readers
+            # never see a partial record.
+            self._offset = offset
+            if not self._first_time:
+                self._first_time = record.created
+            self._last_time = max(self._last_time, record.created)
+            self._write_header()
+
+    def close(self):
+        """
+        Flush the records to the disk and close the file.
+        """
+        with self._lock:
+            self._close()
+
+    def _open(self):
+        """
+        Rotate the existing files and map a new file in memory.
+        """
+        self._rotate()
+
+        fh = open(self._path, "w+b")
+        try:
+            fh.truncate(self._max_size)
+            self._buffer = mmap.mmap(fh.fileno(), self._max_size)
+        except Exception:
+            fh.close()
+            raise
+        self._file = fh
+        self._offset = HEADER_SIZE
+        self._first_time = 0.0
+        self._last_time = 0.0
+        self._write_header()
+
+    def _close(self):
+        """
+        Unmap and close the current file.
+        """
+        if self._buffer is None:
+            return
+        self._buffer.flush()
+        self._buffer.close()
+        self._file.close()
+        self._buffer = None
+        self._file = None
+
+    def _rotate(self):
+        """
+        Shift the backups and rename the current file as the first backup.
+        """
+        if not os.path.exists(self._path):
+            return
+
+        if not self._backup_count:
+            os.remove(self._path)
+            return
+
+        for index in range(self._backup_count - 1, 0, -1):
+            source = "%s.%d" % (self._path, index)
+            if os.path.exists(source):
+                os.replace(source, "%s.%d" % (self._path, index + 1))
+        os.replace(self._path, "%s.1" % self._path)
+
+    def _remove_old_session_files(self, path):
+        """
+        Delete the oldest files written by sessions that couldn't use the main
+        log file, along with their backups.
+
+        :param str path: Path to the main log file.
+        """
+        folder, file_name = os.path.split(path)
+        root, ext = os.path.splitext(file_name)
+        pattern = re.compile(r"^%s-\d+%s(\.\d+)?$" % (re.escape(root), re.escape(ext)))
+        try:
+            file_names = [
+                name for name in os.listdir(folder or ".") if pattern.match(name)
+            ]
+        except OSError:
+            return
+
+        # The current file and its backups are rotated with the current file.
+        current_name = os.path.basename(self._path)
+        paths = [
+            os.path.join(folder, name)
+            for name in file_names
+            if name != current_name and not name.startswith(current_name + ".")
+        ]
+        try:
+            paths.sort(key=os.path.getmtime, reverse=True)
+        except OSError:
+            return
+        for old_path in paths[self._backup_count :]:
+            try:
+                os.remove(old_path)
+            except OSError:
+                # The file is still used by another session.
+                pass
+
+    def _write_header(self):
+        """
+        Write the file header for the records written so far.
+        """
+        FILE_HEADER.pack_into(
+            self._buffer,
+            0,
+            MAGIC,
+            VERSION,
+            self._offset,
+            self._first_time,
+            self._last_time,
+        )
+
+
+def _format_message(record):
+    """
+    Format the message of a record, followed by its traceback and stack if any.
+
+    :param record: :class:`logging.LogRecord` to format.
+    :returns: The formatted message.
+    """
+    message = record.getMessage()
+    if record.exc_info and not record.exc_text:
+        # Cached on the record like logging.Formatter does.
+        record.exc_text = _formatter.formatException(record.exc_info)
+    if record.exc_text:
+        message += "\n" + record.exc_text
+    if record.stack_info:
+        message += "\n" + _formatter.formatStack(record.stack_info)
+    return message
@@ -0,0 +1,254 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Format of the binary log files written by the engine, and tools to query them.
+
+This module only depends on the Python standard library so it can be run
+outside of 3ds Max to extract diagnostics from the log files::
+
+    python binary_log_reader.py tk-3dsmax.sgtklog --level WARNING \\
+        --start "2026-10-17 09:00:00" --logger sgtk.env.project.tk-multi-publish2
+
+A log file is preallocated to its maximum size. It starts with a fixed size
+header followed by the records, each made of a fixed size header and of the
+UTF-8 encoded logger name, thread name and message. Files are mapped in memory
+and the records skipped by the filters are never decoded, so only the matching
+records are read from the disk.
+"""
+
+import argparse
+import collections
+import datetime
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+
+# Magic bytes identifying a binary log file.
+MAGIC = b"SGTKLOG\x00"
+VERSION = 1
+
+# File header: magic, version, offset of the end of the last record, time of
+# the oldest and of the most recent record. The header is padded to HEADER_SIZE.
+FILE_HEADER = struct.Struct("<8sIQdd")
+HEADER_SIZE = 64
+
+# Record header: size of the whole record, time, level, length of the logger
+# name, length of the thread name and length of the message.
+RECORD_HEADER = struct.Struct("<IdBHHI")
+
+# A log record read from a file.
+LogRecord = collections.namedtuple(
+    "LogRecord", ["created", "levelno", "logger", "thread", "message"]
+)
+
+
+def read_file_header(buf):
+    """
+    Read the header of a binary log file.
+
+    :param buf: Buffer holding at least the file header.
+    :returns: Tuple of the end offset of the last record and of the times of
+        the oldest and most recent records.
+    :raises ValueError: If the buffer doesn't hold a supported log file.
+    """
+    if len(buf) < HEADER_SIZE:
+        raise ValueError("Not a binary log file.")
+    magic, version, end_offset, first_time, last_time = FILE_HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError("Not a binary log file.")
+    if version != VERSION:
+        raise ValueError("Unsupported binary log version %d." % version)
+    return end_offset, first_time, last_time
+
+
+def get_log_files(path):
+    """
+    List a log file and its rotated backups, from the oldest to the newest.
+
+    :param str path: Path to the current log file.
+    :returns: List of the paths of the existing files.
+    """
+    backups = []
+    index = 1
+    while os.path.exists("%s.%d" % (path, index)):
+        backups.append("%s.%d" % (path, index))
+        index += 1
+    backups.reverse()
+    if os.path.exists(path):
+        backups.append(path)
+    return backups
+
+
+def iter_records(path, start=None, end=None, min_level=0, logger=None):
+    """
+    Iterate over the records of a log file matching the filters.
+
+    :param str path: Path to the log file.
+    :param float start: Only return records logged at or after this time.
+    :param float end: Only return records logged at or before this time.
+    :param int min_level: Only return records at or above this level.
+    :param str logger: Only return records of this logger and its children.
+    :returns: Generator of :class:`LogRecord` instances.
+    """
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size < HEADER_SIZE:
+            return
+        buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            end_offset, first_time, last_time = read_file_header(buf)
+            if end_offset <= HEADER_SIZE:
+                return
+            # Skip the whole file if none of its records can match.
+            if start is not None and last_time < start:
+                return
+            if end is not None and first_time > end:
+                return
+
+            logger_prefix = None if logger is None else logger + "."
+            end_offset = min(end_offset, len(buf))
+            offset = HEADER_SIZE
+            while offset + RECORD_HEADER.size <= end_offset:
+                (
+                    size,
+                    created,
+                    levelno,
+                    logger_len,
+                    thread_len,
+                    message_len,
+                ) = RECORD_HEADER.unpack_from(buf, offset)
+                if size < RECORD_HEADER.size or offset + size > end_offset:
+                    # Truncated or corrupted record.
+                    break
+
+                if (
+                    levelno >= min_level
+                    and (start is None or created >= start)
+                    and (end is None or created <= end)
+                ):
+                    pos = offset + RECORD_HEADER.size
+                    name = buf[pos : pos + logger_len].decode("utf-8", "replace")
+                    if (
+                        logger is None
+                        or name == logger
+                        or name.startswith(logger_prefix)
+                    ):
+                        pos += logger_len
+                        thread = buf[pos : pos + thread_len].decode("utf-8", "replace")
+                        pos += thread_len
+                        message = buf[pos : pos + message_len].decode(
+                            "utf-8", "replace"
+                        )
+                        yield LogRecord(created, levelno, name, thread, message)
+
+                offset += size
+        finally:
+            buf.close()
+
+
+def format_record(record):
+    """
+    Format a record as a line of text.
+
+    :param record: :class:`LogRecord` to format.
+    :returns: The formatted record.
+    """
+    created = datetime.datetime.fromtimestamp(record.created)
+    return "%s %s [%s] (%s) %s" % (
+        created.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+        logging.getLevelName(record.levelno),
+        record.logger,
+        record.thread,
+        record.message,
+    )
+
+
+def _parse_time(value):
+    """
+    Parse a time given on the command line as a timestamp or an ISO date.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    for time_format in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
+        try:
+            created = datetime.datetime.strptime(value, time_format)
+        except ValueError:
+            continue
+        return time.mktime(created.timetuple())
+    raise argparse.ArgumentTypeError("Invalid time: %s" % value)
+
+
+def _parse_level(value):
+    """
+    Parse a level given on the command line as a number or a level name.
+    """
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    if not isinstance(level, int):
+        raise argparse.ArgumentTypeError("Invalid level: %s" % value)
+    return level
+
+
+def main(args=None):
+    """
+    Print the records of log files matching the filters given on the command line.
+
+    :param list args: Command line arguments. Defaults to ``sys.argv``.
+    :returns: The exit code.
+    """
+    parser = argparse.ArgumentParser(
+        description="Query the binary log files written by the 3ds Max engine."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="Log files. Rotated backups of each file are read as well.",
+    )
+    parser.add_argument(
+        "--start", type=_parse_time, help="Only show records logged after this time."
+    )
+    parser.add_argument(
+        "--end", type=_parse_time, help="Only show records logged before this time."
+    )
+    parser.add_argument(
+        "--level",
+        type=_parse_level,
+        default=0,
+        help="Only show records at or above this level.",
+    )
+    parser.add_argument(
+        "--logger", help="Only show records of this logger and its children."
+    )
+    options = parser.parse_args(args)
+
+    for path in options.paths:
+        for log_file in get_log_files(path):
+            try:
+                for record in iter_records(
+                    log_file,
+                    start=options.start,
+                    end=options.end,
+                    min_level=options.level,
+                    logger=options.logger,
+                ):
+                    sys.stdout.write(format_record(record) + "\n")
+            except (IOError, OSError, ValueError) as e:
+                sys.stderr.write("Unable to read %s: %s\n" % (log_file, e))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
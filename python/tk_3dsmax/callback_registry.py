@@ -0,0 +1,205 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Registry of the Python callbacks referenced from MaxScript menus.
+"""
+
+import contextlib
+import hashlib
+
+import pymxs
+
+
+class CallbackRegistry(object):
+    """
+    Keeps track of the Python objects that MaxScript menu callbacks refer to.
+
+    Every menu build happens inside a generation. Entries registered during a
+    generation replace the ones registered under the same id by the previous
+    generation, and entries that were not registered again are dropped when
+    the generation ends. This keeps the number of strong references bounded
+    no matter how many times the menu is rebuilt.
+
+    The registry also owns the MaxScript globals that are injected into the
+    runtime for the menus, so they can be released along with the callbacks.
+    """
+
+    # MaxScript global through which macroscripts invoke registered callbacks.
+    DISPATCH_FUNCTION = "sgtk_dispatch_command"
+
+    def __init__(self, logger=None):
+        """
+        Initialize an empty registry.
+
+        :param logger: Optional logger used to report commands that can't be
+            dispatched.
+        """
+        self._logger = logger
+        # id -> (generation, callback)
+        self._entries = {}
+        # MaxScript global name -> generation
+        self._globals = {}
+        self._generation = 0
+
+    @property
+    def generation(self):
+        """
+        Current generation number.
+        """
+        return self._generation
+
+    def begin_generation(self):
+        """
+        Start a new generation of entries.
+
+        :returns: The new generation number.
+        """
+        self._generation += 1
+        return self._generation
+
+    def end_generation(self):
+        """
+        Drop every entry and global that was not registered during the current
+        generation.
+        """
+        self._entries = dict(
+            (command_id, entry)
+            for command_id, entry in self._entries.items()
+            if entry[0] == self._generation
+        )
+
+        for name, generation in list(self._globals.items()):
+            if generation != self._generation:
+                self._release_global(name)
+
+    @contextlib.contextmanager
+    def new_generation(self):
+        """
+        Context manager wrapping :meth:`begin_generation` and :meth:`end_generation`.
+        """
+        self.begin_generation()
+        try:
+            yield self
+        finally:
+            self.end_generation()
+
+    def make_command_id(self, name):
+        """
+        Build a stable id for a command from its name.
+
+        The id only contains characters that are safe to embed in MaxScript
+        and Python source. Commands sharing the same name within a generation
+        get a numbered suffix, so the ids are identical from one build to the
+        next as long as the commands are registered in the same order.
+
+        :param str name: Name of the command.
+        :returns: The command id.
+        """
+        base_id = hashlib.md5(name.encode("utf-8")).hexdigest()
+        command_id = base_id
+        index = 1
+        while self._is_current(command_id):
+            index += 1
+            command_id = "%s_%d" % (base_id, index)
+        return command_id
+
+    def register(self, command_id, callback):
+        """
+        Register a callback for the current generation.
+
+        :param command_id: Id of the callback. Any hashable value.
+        :param callable callback: Object to invoke when the command is triggered.
+        """
+        self._entries[command_id] = (self._generation, callback)
+
+    def register_global(self, name, value):
+        """
+        Inject a value in the MaxScript global namespace for the current generation.
+
+        :param str name: Name of the MaxScript global.
+        :param value: Value to assign to the global.
+        """
+        setattr(pymxs.runtime, name, value)
+        self._globals[name] = self._generation
+
+    def register_dispatcher(self):
+        """
+        Expose :meth:`dispatch` to MaxScript for the current generation.
+
+        The function is available as the :attr:`DISPATCH_FUNCTION` global, so
+        MaxScript can call a registered callback directly with its id instead of
+        compiling Python source.
+        """
+        if self._globals.get(self.DISPATCH_FUNCTION) != self._generation:
+            self.register_global(self.DISPATCH_FUNCTION, self.dispatch)
+
+    def dispatch(self, command_id):
+        """
+        Invoke the callback registered under the given id.
+
+        :param str command_id: Id of the callback.
+        :returns: True if the callback was found and invoked, False otherwise.
+        """
+        callback = self.get(command_id)
+        if callback is None:
+            if self._logger is not None:
+                self._logger.error(
+                    "PTR Error: Failed to find Action command %s in MAXScript callback!"
+                    % command_id
+                )
+            return False
+
+        callback()
+        return True
+
+    def get(self, command_id, default=None):
+        """
+        Retrieve a callback.
+
+        :param command_id: Id of the callback.
+        :param default: Value returned when the id is unknown.
+        :returns: The registered callback or ``default``.
+        """
+        entry = self._entries.get(command_id)
+        if entry is None:
+            return default
+        return entry[1]
+
+    def clear(self):
+        """
+        Drop all callbacks and release all MaxScript globals.
+        """
+        self._entries = {}
+        for name in list(self._globals):
+            self._release_global(name)
+
+    def _is_current(self, command_id):
+        """
+        :returns: True if the id was registered during the current generation.
+        """
+        entry = self._entries.get(command_id)
+        return entry is not None and entry[0] == self._generation
+
+    def _release_global(self, name):
+        """
+        Reset a MaxScript global owned by the registry to undefined.
+        """
+        del self._globals[name]
+        setattr(pymxs.runtime, name, None)
+
+    def __contains__(self, command_id):
+        return command_id in self._entries
+
+    def __getitem__(self, command_id):
+        return self._entries[command_id][1]
+
+    def __len__(self):
+        return len(self._entries)
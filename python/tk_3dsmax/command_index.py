@@ -0,0 +1,108 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Lookup tables over the commands registered with the engine.
+"""
+
+
+class CommandIndex(object):
+    """
+    Precomputed index of the engine commands.
+
+    The index is built once from ``engine.commands`` and ``engine.apps`` and
+    answers lookups by app instance, command name and command type in constant
+    time. It is a snapshot: the engine drops it whenever a command is registered
+    and builds a new one on demand.
+    """
+
+    def __init__(self, commands, apps):
+        """
+        Build the index.
+
+        :param dict commands: Commands registered with the engine, as returned by
+            ``engine.commands``.
+        :param dict apps: App instances loaded by the engine, as returned by
+            ``engine.apps``.
+        """
+        self._app_instance_names = {}
+        for app_instance_name, app_instance in apps.items():
+            self._app_instance_names[app_instance] = app_instance_name
+
+        self._commands = {}
+        self._commands_by_app_instance = {}
+        self._command_names_by_type = {}
+
+        for command_name, command_dict in commands.items():
+            self._commands[command_name] = command_dict
+
+            properties = command_dict["properties"]
+
+            app_instance = properties.get("app")
+            if app_instance is not None:
+                app_instance_name = self._app_instance_names.get(app_instance)
+                if app_instance_name is not None:
+                    app_commands = self._commands_by_app_instance.setdefault(
+                        app_instance_name, {}
+                    )
+                    app_commands[command_name] = command_dict
+
+            command_type = properties.get("type", "default")
+            self._command_names_by_type.setdefault(command_type, []).append(
+                command_name
+            )
+
+    def get_app_instance_name(self, app_instance):
+        """
+        Returns the name of an app instance, as defined in the environment.
+
+        :param app_instance: :class:`sgtk.platform.Application` instance.
+        :returns: The app instance name or None if the app is not loaded by the engine.
+        """
+        return self._app_instance_names.get(app_instance)
+
+    def get_command(self, command_name):
+        """
+        Returns a command by its name.
+
+        :param str command_name: Name of the command.
+        :returns: The command dictionary, with ``callback`` and ``properties`` keys,
+            or None if no such command is registered.
+        """
+        return self._commands.get(command_name)
+
+    def get_app_instance_commands(self, app_instance_name):
+        """
+        Returns the commands registered by an app instance.
+
+        :param str app_instance_name: Name of the app instance.
+        :returns: Dictionary of command names to command dictionaries, in
+            registration order, or None if the app instance has no commands.
+        """
+        return self._commands_by_app_instance.get(app_instance_name)
+
+    def has_app_instance_command(self, app_instance_name, command_name):
+        """
+        Checks if a command was registered by the given app instance.
+
+        :param str app_instance_name: Name of the app instance.
+        :param str command_name: Name of the command.
+        :returns: True if the app instance registered the command, False otherwise.
+        """
+        return command_name in self._commands_by_app_instance.get(app_instance_name, {})
+
+    def get_command_names_by_type(self, command_type):
+        """
+        Returns the names of the commands of a given type.
+
+        :param str command_type: Type of the commands, e.g. ``context_menu``.
+        :returns: List of command names, in registration order.
+        """
+        return list(self._command_names_by_type.get(command_type, []))
@@ -0,0 +1,146 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Registry of the Toolkit dialogs to hide while 3ds Max shows its own dialogs.
+"""
+
+import collections
+import contextlib
+import weakref
+
+from sgtk.platform.qt import QtGui
+
+
+class DialogRegistry(object):
+    """
+    Keeps weak references to the Toolkit dialogs shown in 3ds Max.
+
+    Dialogs drop out of the registry when their Python wrapper is garbage
+    collected or when the underlying Qt object is destroyed, so the registry
+    never hands out deleted dialogs.
+
+    :meth:`hidden` hides the visible dialogs for the duration of a block. It is
+    re-entrant: nested blocks, e.g. each action of a batch of loader actions,
+    don't hide and show the dialogs again.
+    """
+
+    def __init__(self, logger):
+        """
+        :param logger: Logger used to report the dialogs hidden and shown.
+        """
+        self._logger = logger
+        # id -> weak reference to the dialog, in registration order.
+        self._dialogs = collections.OrderedDict()
+        self._hide_depth = 0
+        self._hidden_dialogs = []
+
+    def add(self, dialog):
+        """
+        Register a dialog.
+
+        :param dialog: :class:`QtGui.QWidget` to register.
+        """
+        key = id(dialog)
+        if key in self._dialogs:
+            return
+
+        dialog_ref = weakref.ref(dialog, lambda _ref: self._discard(key, _ref))
+        self._dialogs[key] = dialog_ref
+        dialog.destroyed.connect(lambda *args: self._discard(key, dialog_ref))
+
+    def remove(self, dialog):
+        """
+        Unregister a dialog. Does nothing if the dialog isn't registered.
+
+        :param dialog: :class:`QtGui.QWidget` to unregister.
+        """
+        self._discard(id(dialog))
+
+    def __contains__(self, dialog):
+        return self._get(id(dialog)) is dialog
+
+    def __iter__(self):
+        for key in list(self._dialogs):
+            dialog = self._get(key)
+            if dialog is not None:
+                yield dialog
+
+    def __len__(self):
+        return len(self._dialogs)
+
+    @contextlib.contextmanager
+    def hidden(self):
+        """
+        Context manager hiding the visible dialogs until the outermost block exits.
+        """
+        if self._hide_depth == 0:
+            self._hide_dialogs()
+        self._hide_depth += 1
+        try:
+            yield
+        finally:
+            self._hide_depth -= 1
+            if self._hide_depth == 0:
+                self._show_dialogs()
+
+    def _hide_dialogs(self):
+        """
+        Hide all the visible dialogs.
+        """
+        self._hidden_dialogs = []
+        for dialog in self:
+            if dialog.isVisible():
+                self._logger.debug("Toggling dialog off: %r" % dialog)
+                self._hidden_dialogs.append(weakref.ref(dialog))
+                dialog.hide()
+                dialog.lower()
+            else:
+                self._logger.debug("Dialog is already hidden: %r" % dialog)
+
+        # Let Qt hide the windows before 3ds Max shows its own.
+        if self._hidden_dialogs:
+            QtGui.QApplication.processEvents()
+
+    def _show_dialogs(self):
+        """
+        Show the dialogs hidden by :meth:`_hide_dialogs` that still exist.
+        """
+        hidden_dialogs = self._hidden_dialogs
+        self._hidden_dialogs = []
+        for dialog_ref in hidden_dialogs:
+            dialog = dialog_ref()
+            if dialog is None or dialog not in self:
+                continue
+            # Restore the window after the operation is completed
+            self._logger.debug("Toggling dialog on: %r" % dialog)
+            dialog.show()
+            dialog.activateWindow()  # for Windows
+            dialog.raise_()  # for MacOS
+
+    def _get(self, key):
+        """
+        :returns: The registered dialog with the given id or None.
+        """
+        dialog_ref = self._dialogs.get(key)
+        if dialog_ref is None:
+            return None
+        return dialog_ref()
+
+    def _discard(self, key, dialog_ref=None):
+        """
+        Drop a dialog from the registry.
+
+        :param key: Id of the dialog.
+        :param dialog_ref: Only drop the dialog if it is registered with this
+            weak reference, as ids can be reused once a dialog is deleted.
+        """
+        if dialog_ref is None or self._dialogs.get(key) is dialog_ref:
+            self._dialogs.pop(key, None)
@@ -0,0 +1,125 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Buffered output of log messages to the MAXScript listener.
+"""
+
+import collections
+import threading
+
+from sgtk.platform.qt import QtCore
+
+from .qt_utils import start_timer
+
+
+class ListenerLogSink(object):
+    """
+    Collects formatted log messages and prints them to the MAXScript listener
+    in batches.
+
+    Messages can be written from any thread. They are queued in a bounded
+    buffer and a single-shot Qt timer, owned by the main thread, prints all
+    the queued messages at once when it fires. When the buffer is full, the
+    oldest messages are dropped and the number of dropped messages is printed
+    with the next batch.
+
+    The sink must be created from the main thread.
+    """
+
+    def __init__(self, flush_interval, max_messages, output=print):
+        """
+        :param int flush_interval: Delay in milliseconds between the first queued
+            message and the flush of the batch.
+        :param int max_messages: Maximum number of messages kept in the buffer.
+        :param callable output: Function printing a batch of messages to the
+            listener. Called from the main thread with a single string.
+        """
+        self._max_messages = max(1, max_messages)
+        self._output = output
+
+        self._lock = threading.Lock()
+        self._messages = collections.deque()
+        self._dropped = 0
+        self._flush_scheduled = False
+
+        self._flushed_count = 0
+        self._dropped_count = 0
+
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(flush_interval)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def flushed_count(self):
+        """
+        Number of messages printed to the listener so far.
+        """
+        return self._flushed_count
+
+    @property
+    def dropped_count(self):
+        """
+        Number of messages dropped so far because the buffer was full.
+        """
+        return self._dropped_count
+
+    def write(self, message):
+        """
+        Queue a message to be printed with the next batch.
+
+        :param str message: Formatted log message.
+        """
+        with self._lock:
+            if len(self._messages) >= self._max_messages:
+                self._messages.popleft()
+                self._dropped += 1
+                self._dropped_count += 1
+            self._messages.append(message)
+
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        start_timer(self._timer)
+
+    def flush(self):
+        """
+        Print all the queued messages to the listener.
+
+        Must be called from the main thread.
+        """
+        with self._lock:
+            messages = self._messages
+            dropped = self._dropped
+            self._messages = collections.deque()
+            self._dropped = 0
+            self._flush_scheduled = False
+
+        if not messages:
+            return
+
+        self._flushed_count += len(messages)
+        if dropped:
+            messages.appendleft(
+                "PTR Warning: %d log messages were dropped because the listener "
+                "could not keep up." % dropped
+            )
+        self._output("\n".join(messages))
+
+    def close(self):
+        """
+        Stop the timer and print the messages still queued.
+
+        Must be called from the main thread.
+        """
+        self._timer.stop()
+        self.flush()
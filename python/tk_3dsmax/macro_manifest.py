@@ -0,0 +1,127 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Manifest of the macroscripts defined by the engine.
+"""
+
+import hashlib
+import json
+import os
+
+
+class MacroManifest(object):
+    """
+    Keeps track of the macroscripts the engine defined, hashed by their source.
+
+    3ds Max writes every macroscript it evaluates to a ``.mcr`` file in the user
+    macros folder and loads those files back on startup. The manifest is stored
+    next to those files so that a macroscript is only evaluated again when its
+    source changed or its file went missing.
+    """
+
+    FILE_NAME = "sgtk_macroscripts.json"
+
+    def __init__(self, macros_folder, logger):
+        """
+        :param str macros_folder: Path to the 3ds Max user macros folder. If None,
+            every macroscript is considered out of date.
+        :param logger: Logger used to report manifest read and write errors.
+        """
+        self._macros_folder = macros_folder
+        self._logger = logger
+        self._hashes = None
+        self._macro_files = None
+        self._dirty = False
+
+    def is_defined(self, macro_name, source):
+        """
+        Check if 3ds Max already has a definition of a macroscript.
+
+        :param str macro_name: Name of the macroscript.
+        :param str source: MaxScript source defining the macroscript.
+        :returns: True if 3ds Max already has this exact definition, False if
+            the macroscript needs to be defined.
+        """
+        if self._macros_folder is None:
+            return False
+
+        self._load()
+        return (
+            self._hashes.get(macro_name) == _hash(source)
+            and macro_name in self._macro_files
+        )
+
+    def register(self, macro_name, source):
+        """
+        Record the source of a macroscript that was evaluated.
+
+        :param str macro_name: Name of the macroscript.
+        :param str source: MaxScript source defining the macroscript.
+        """
+        if self._macros_folder is None or self.is_defined(macro_name, source):
+            return
+
+        self._hashes[macro_name] = _hash(source)
+        self._macro_files.add(macro_name)
+        self._dirty = True
+
+    def save(self):
+        """
+        Write the manifest to disk if it changed.
+
+        Should only be called once the registered macroscripts were evaluated.
+        """
+        if not self._dirty:
+            return
+
+        path = os.path.join(self._macros_folder, self.FILE_NAME)
+        try:
+            with open(path, "wt") as fh:
+                json.dump(self._hashes, fh, indent=2, sort_keys=True)
+        except (IOError, OSError) as e:
+            self._logger.warning("Unable to write macroscript manifest: %s" % e)
+        self._dirty = False
+
+    def _load(self):
+        """
+        Read the manifest and list the macroscript files the first time it is needed.
+        """
+        if self._hashes is not None:
+            return
+
+        self._hashes = {}
+        path = os.path.join(self._macros_folder, self.FILE_NAME)
+        if os.path.exists(path):
+            try:
+                with open(path, "rt") as fh:
+                    hashes = json.load(fh)
+                if isinstance(hashes, dict):
+                    self._hashes = hashes
+            except (IOError, OSError, ValueError) as e:
+                self._logger.debug("Ignoring macroscript manifest %s: %s" % (path, e))
+
+        # Macroscript files are named "<category>-<macro name>.mcr".
+        self._macro_files = set()
+        try:
+            file_names = os.listdir(self._macros_folder)
+        except OSError:
+            file_names = []
+        for file_name in file_names:
+            base_name, ext = os.path.splitext(file_name)
+            if ext.lower() == ".mcr":
+                self._macro_files.add(base_name.rsplit("-", 1)[-1])
+
+
+def _hash(source):
+    """
+    :returns: Hash of the source of a macroscript.
+    """
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
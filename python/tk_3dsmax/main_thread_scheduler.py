@@ -0,0 +1,327 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Time-sliced scheduler running tasks in the 3ds Max main thread.
+"""
+
+import concurrent.futures
+import heapq
+import itertools
+import threading
+import time
+
+from sgtk.platform.qt import QtCore
+
+from .qt_utils import start_timer
+
+# Task priorities, tasks with a lower value run first.
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 50
+PRIORITY_LOW = 100
+
+
+class _Task(object):
+    """
+    Task queued in the scheduler.
+    """
+
+    __slots__ = (
+        "priority",
+        "order",
+        "key",
+        "func",
+        "args",
+        "kwargs",
+        "future",
+        "submitted_at",
+    )
+
+    def __init__(self, priority, order, key, func, args, kwargs):
+        self.priority = priority
+        self.order = order
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = concurrent.futures.Future()
+        self.submitted_at = time.time()
+
+    def __lt__(self, other):
+        return (self.priority, self.order) < (other.priority, other.order)
+
+
+class MainThreadScheduler(object):
+    """
+    Runs tasks submitted from any thread in the main thread, in time slices.
+
+    Tasks run by increasing priority value, then in submission order. Each
+    time the scheduler's timer fires, tasks run until the tick budget is
+    spent, at least one task per tick, and the remaining tasks wait for the
+    next event loop iteration so 3ds Max can repaint and handle user input
+    in between. Tasks keep running from the nested event loops that a task
+    may spin, e.g. to show a modal dialog.
+
+    A task submitted with a key replaces the pending task with the same key,
+    e.g. successive progress updates only display the last one. Both
+    submissions share the same future.
+
+    The scheduler must be created from the main thread.
+    """
+
+    def __init__(self, logger, tick_budget=0.01):
+        """
+        :param logger: Logger used to report the tasks that fail.
+        :param float tick_budget: Time in seconds spent running tasks per tick.
+        """
+        self._logger = logger
+        self._tick_budget = tick_budget
+
+        self._lock = threading.Lock()
+        self._queue = []
+        # key -> pending task
+        self._keyed_tasks = {}
+        self._counter = itertools.count()
+        self._tick_scheduled = False
+        # Number of ticks running, more than one while a task runs a nested
+        # event loop.
+        self._tick_depth = 0
+        self._nested_tick_ran = False
+        # Time at which the running tick's budget is spent.
+        self._deadline = None
+        self._closed = False
+        self._main_thread = threading.current_thread()
+
+        self._submitted_count = 0
+        self._executed_count = 0
+        self._coalesced_count = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._tick_count = 0
+        self._over_budget_count = 0
+
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run_tick)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queue a task to run in the main thread.
+
+        Accepts the keyword arguments ``priority``, defaulting to
+        :data:`PRIORITY_NORMAL`, and ``key``, used to coalesce tasks, which are
+        not passed on to the function.
+
+        :param func: Function to run.
+        :param args: Positional arguments for the function.
+        :param kwargs: Named arguments for the function.
+        :returns: :class:`concurrent.futures.Future` holding the result of the
+            function.
+        :raises RuntimeError: If the scheduler is closed.
+        """
+        priority = kwargs.pop("priority", PRIORITY_NORMAL)
+        key = kwargs.pop("key", None)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The main thread scheduler is closed.")
+            self._submitted_count += 1
+
+            task = self._keyed_tasks.get(key) if key is not None else None
+            if task is not None:
+                # Run the latest function instead, at the highest priority
+                # requested. The task keeps its position in the queue if its
+                # priority doesn't change.
+                self._coalesced_count += 1
+                task.func = func
+                task.args = args
+                task.kwargs = kwargs
+                if priority < task.priority:
+                    task.priority = priority
+                    heapq.heapify(self._queue)
+                return task.future
+
+            task = _Task(priority, next(self._counter), key, func, args, kwargs)
+            heapq.heappush(self._queue, task)
+            if key is not None:
+                self._keyed_tasks[key] = task
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+
+            if self._tick_scheduled:
+                return task.future
+            self._tick_scheduled = True
+
+        start_timer(self._timer)
+        return task.future
+
+    def is_main_thread(self):
+        """
+        :returns: True if called from the thread running the tasks.
+        """
+        return threading.current_thread() is self._main_thread
+
+    @property
+    def queue_depth(self):
+        """
+        Number of tasks waiting to run.
+        """
+        with self._lock:
+            return len(self._queue)
+
+    def get_stats(self):
+        """
+        :returns: Dictionary with the number of tasks submitted, executed and
+            coalesced, the current and maximum queue depth, the mean and
+            maximum time in seconds tasks waited in the queue, the number of
+            ticks and the number of ticks that went over budget.
+        """
+        with self._lock:
+            executed = self._executed_count
+            return {
+                "submitted": self._submitted_count,
+                "executed": executed,
+                "coalesced": self._coalesced_count,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "mean_wait": self._total_wait / executed if executed else 0.0,
+                "max_wait": self._max_wait,
+                "ticks": self._tick_count,
+                "over_budget_ticks": self._over_budget_count,
+            }
+
+    def format_stats(self):
+        """
+        :returns: One line summary of :meth:`get_stats`.
+        """
+        return (
+            "Main thread scheduler: %(executed)d tasks executed out of "
+            "%(submitted)d submitted, %(coalesced)d coalesced, %(queue_depth)d "
+            "queued (at most %(max_queue_depth)d), waited %(mean_wait).4fs on "
+            "average and %(max_wait).4fs at most, %(over_budget_ticks)d of "
+            "%(ticks)d ticks over budget." % self.get_stats()
+        )
+
+    def is_budget_spent(self):
+        """
+        Check if the tick running the current task spent its budget.
+
+        A task doing many small pieces of work can check this in between and
+        submit the rest of the work again, so it doesn't hold the main thread
+        longer than the tick budget.
+
+        Must be called from the main thread.
+
+        :returns: True if the budget is spent, False if no tick is running,
+            e.g. from :meth:`run_pending`.
+        """
+        return self._deadline is not None and time.time() >= self._deadline
+
+    def run_pending(self):
+        """
+        Run all the queued tasks now, regardless of the tick budget.
+
+        Must be called from the main thread.
+        """
+        while self._run_next() is not None:
+            pass
+
+    def close(self):
+        """
+        Stop the scheduler and cancel the tasks that didn't run.
+
+        Must be called from the main thread.
+        """
+        self._timer.stop()
+        with self._lock:
+            self._closed = True
+            tasks = self._queue
+            self._queue = []
+            self._keyed_tasks = {}
+        for task in tasks:
+            task.future.cancel()
+
+    def _run_tick(self):
+        """
+        Run tasks until the tick budget is spent and schedule the next tick
+        if tasks remain.
+
+        The timer is restarted before each task, so a task spinning a nested
+        event loop, e.g. a modal dialog, doesn't hold the other tasks: they
+        run from nested ticks until the task returns.
+        """
+        nested = self._tick_depth > 0
+        if nested:
+            # The task running in the outer tick waits for a nested event loop,
+            # so its tick going over budget isn't the tasks' doing.
+            self._nested_tick_ran = True
+        self._tick_depth += 1
+
+        start = time.time()
+        deadline = start + self._tick_budget
+        outer_deadline = self._deadline
+        self._deadline = deadline
+        with self._lock:
+            self._tick_count += 1
+
+        try:
+            while True:
+                self._timer.start()
+                finish = self._run_next()
+                if finish is None or finish >= deadline:
+                    break
+        finally:
+            self._tick_depth -= 1
+            self._deadline = outer_deadline
+
+        over_budget = finish is not None and finish - start > self._tick_budget
+        if not nested:
+            over_budget = over_budget and not self._nested_tick_ran
+            self._nested_tick_ran = False
+
+        with self._lock:
+            if over_budget:
+                self._over_budget_count += 1
+            if self._queue and not self._closed:
+                self._timer.start()
+            else:
+                self._timer.stop()
+                self._tick_scheduled = False
+
+    def _run_next(self):
+        """
+        Run the next task.
+
+        :returns: The time the task finished, or None if the queue is empty.
+        """
+        with self._lock:
+            if not self._queue:
+                return None
+            task = heapq.heappop(self._queue)
+            if task.key is not None:
+                del self._keyed_tasks[task.key]
+
+        start = time.time()
+        if task.future.set_running_or_notify_cancel():
+            try:
+                result = task.func(*task.args, **task.kwargs)
+            except Exception as e:
+                self._logger.exception("Main thread task %r failed." % task.func)
+                task.future.set_exception(e)
+            else:
+                task.future.set_result(result)
+
+        wait = start - task.submitted_at
+        with self._lock:
+            self._executed_count += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        return time.time()
@@ -12,7 +12,6 @@
 MaxScript handling for 3ds Max
 """
 
-import hashlib
 import sgtk
 
 import pymxs
@@ -32,14 +31,21 @@ class MaxScript:
         :param from_menu_name: Name of menu item to give to MaxScript
         """
         pymxs.runtime.execute(
-            """
+            MaxScript.add_to_menu_script(from_menu_var, to_menu_var, from_menu_name)
+        )
+
+    @staticmethod
+    def add_to_menu_script(from_menu_var, to_menu_var, from_menu_name):
+        """
+        MaxScript source used by :meth:`add_to_menu`.
+        """
+        return """
             sgtk_menu_sub_item = menuMan.createSubMenuItem "{from_menu_name}" {from_menu_var}
             {to_menu_var}.addItem sgtk_menu_sub_item -1
         """.format(
-                from_menu_var=from_menu_var,
-                to_menu_var=to_menu_var,
-                from_menu_name=from_menu_name,
-            )
+            from_menu_var=from_menu_var,
+            to_menu_var=to_menu_var,
+            from_menu_name=from_menu_name,
         )
 
     @staticmethod
@@ -49,14 +55,36 @@ class MaxScript:
         :param menu_name: String name of menu to create
         :param menu_var: MaxScript variable name in which the menu will be created
         """
-        # Remove old Shotgun menu entry from cache
-        MaxScript.unregister_menu("Shotgun")
+        pymxs.runtime.execute(MaxScript.create_menu_script(menu_name, menu_var))
 
-        MaxScript.unregister_menu(menu_name)
-        pymxs.runtime.execute("""
+    @staticmethod
+    def create_menu_script(menu_name, menu_var):
+        """
+        MaxScript source used by :meth:`create_menu`.
+        """
+        # Remove old Shotgun menu entry from cache
+        return (
+            MaxScript.unregister_menu_script("Shotgun")
+            + MaxScript.unregister_menu_script(menu_name)
+            + """
             -- create the main menu
             {menu_var} = menuMan.createMenu "{menu_name}"
-        """.format(menu_var=menu_var, menu_name=menu_name))
+        """.format(menu_var=menu_var, menu_name=MaxScript.escape_string(menu_name))
+        )
+
+    @staticmethod
+    def reset_menu_script(menu_var, menu_name):
+        """
+        MaxScript source removing all the items of a menu and renaming it.
+
+        :param menu_var: MaxScript variable name of the menu to reset
+        :param menu_name: New name of the menu
+        """
+        return """
+            {menu_var}.setTitle "{menu_name}"
+            for sgtk_menu_index = {menu_var}.numItems() to 1 by -1 do
+                {menu_var}.removeItemByPosition sgtk_menu_index
+        """.format(menu_var=menu_var, menu_name=MaxScript.escape_string(menu_name))
 
     @staticmethod
     def unregister_menu(menu_name):
@@ -65,11 +93,18 @@ class MaxScript:
 
         :param str menu_name: Name of the menu in the menu bar.
         """
-        pymxs.runtime.execute("""
+        pymxs.runtime.execute(MaxScript.unregister_menu_script(menu_name))
+
+    @staticmethod
+    def unregister_menu_script(menu_name):
+        """
+        MaxScript source used by :meth:`unregister_menu`.
+        """
+        return """
             -- clear the menu
             sgtk_oldMenu = menuMan.findMenu "{menu_name}"
             if sgtk_oldMenu != undefined then menuMan.unregisterMenu sgtk_oldMenu
-        """.format(menu_name=menu_name))
+        """.format(menu_name=MaxScript.escape_string(menu_name))
 
     @staticmethod
     def add_separator(menu_var):
@@ -78,10 +113,17 @@ class MaxScript:
         :param menu_var: MaxScript variable name of the menu to add separator into
         """
 
-        pymxs.runtime.execute("""
+        pymxs.runtime.execute(MaxScript.add_separator_script(menu_var))
+
+    @staticmethod
+    def add_separator_script(menu_var):
+        """
+        MaxScript source used by :meth:`add_separator`.
+        """
+        return """
             sgtk_menu_separator = menuMan.createSeparatorItem()
             {menu_var}.addItem sgtk_menu_separator -1
-        """.format(menu_var=menu_var))
+        """.format(menu_var=menu_var)
 
     @staticmethod
     def add_to_main_menu_bar(menu_var, menu_name):
@@ -91,14 +133,33 @@ class MaxScript:
         :param menu_name: String name of the menu to add
         """
 
-        pymxs.runtime.execute("""
+        pymxs.runtime.execute(
+            MaxScript.add_to_main_menu_bar_script(menu_var, menu_name)
+        )
+
+    @staticmethod
+    def add_to_main_menu_bar_script(menu_var, menu_name):
+        """
+        MaxScript source used by :meth:`add_to_main_menu_bar`.
+        """
+        return """
             -- Add main menu to Max, second to last which should be before Help
             sgtk_main_menu_bar = menuMan.getMainMenuBar()
             sgtk_sub_menu_index = sgtk_main_menu_bar.numItems() - 1
             sgtk_sub_menu_item = menuMan.createSubMenuItem "{menu_name}" {menu_var}
             sgtk_main_menu_bar.addItem sgtk_sub_menu_item sgtk_sub_menu_index
             menuMan.updateMenuBar()
-        """.format(menu_var=menu_var, menu_name=menu_name))
+        """.format(menu_var=menu_var, menu_name=menu_name)
+
+    @staticmethod
+    def update_menu_bar_script():
+        """
+        MaxScript source redrawing 3ds max's main menu bar after its menus
+        changed.
+        """
+        return """
+            menuMan.updateMenuBar()
+        """
 
     @staticmethod
     def add_action_to_menu(callback, action_name, menu_var, engine):
@@ -109,11 +170,30 @@ class MaxScript:
         :param menu_var: MaxScript menu variable name to add menu item to.
         :param engine: Current engine where the action can be globally linked back to.
         """
-        obj = callback.__self__
-        method_name = callback.__name__
+        script, macro = MaxScript.add_action_to_menu_script(
+            callback, action_name, menu_var, engine
+        )
+        pymxs.runtime.execute(script)
+        if macro is not None:
+            engine.macro_manifest.register(*macro)
+            engine.macro_manifest.save()
 
-        # Note that we're using the action name because we need these
-        # macros to reference things consistently across sessions. Sadly,
+    @staticmethod
+    def add_action_to_menu_script(callback, action_name, menu_var, engine):
+        """
+        MaxScript source used by :meth:`add_action_to_menu`.
+
+        Registers the callback in the engine's callback registry as a side
+        effect, so the returned MaxScript must be executed for the menu item to
+        be usable.
+
+        :returns: Tuple of the MaxScript source and of the name and source of
+            the macroscript it defines, or None if the engine's macroscript
+            manifest says 3ds Max already has it. The macroscript must be
+            registered in the manifest once the source was executed.
+        """
+        # Note that the id is derived from the action name because we need
+        # these macros to reference things consistently across sessions. Sadly,
         # if a second, concurrent, 3ds Max session is launched, Toolkit
         # will build the Shotgun menu in that session and Max will write
         # that updated menu layout to disk for the user, because it thinks
@@ -123,18 +203,15 @@ class MaxScript:
         # This means that if we have anything referenced from the macro
         # that is not available in the first session, the action will
         # fail.
-        hash_name = action_name
-
-        # This won't be visible to the user, so we'll go the ugly route
-        # to resolve conflicts and just append underscores until we get
-        # a unique key. Ultimately, this is just covering what should be
-        # the very rare edge case of having two menu actions with the
-        # same name. That would be bad practice, in my opinion, but since
-        # it is possible we will handle it.
-        while hash_name in engine.maxscript_objects:
-            hash_name += "_"
-
-        engine.maxscript_objects[hash_name] = obj
+        #
+        # Two actions sharing the same name get distinct ids, numbered in
+        # the order they are added to the menu, so a rebuild maps them to the
+        # same ids again and replaces the previous generation's callbacks.
+        command_id = engine.maxscript_objects.make_command_id(action_name)
+        engine.maxscript_objects.register(command_id, callback)
+        # Macroscripts call back into Python through a single function taking
+        # the command id, so nothing needs to be compiled when they run.
+        engine.maxscript_objects.register_dispatcher()
 
         """
         Macro name must not have any strange characters (spaces, dash, etc..)
@@ -143,25 +220,14 @@ class MaxScript:
         with new macro for the same action every time shotgun is reloaded.
         eg: 'Publish...' action will always re-use the same MacroScript.
         """
-        macro_name = "sg_" + hashlib.md5(action_name.encode("utf-8")).hexdigest()
+        macro_name = "sg_" + command_id
+        action_title = MaxScript.escape_string(action_name)
 
-        # Creating python code separately as it needs to have no indentation in the macroscript
-        python_code = (
-            "import sgtk\n"
-            "engine = sgtk.platform.current_engine()\n"
-            "if '{hash_name}' in engine.maxscript_objects:\n"
-            "    command_object = engine.maxscript_objects['{hash_name}']\n"
-            "    command_object.{command_name}()\n"
-            "else:\n"
-            "    engine.log_error('PTR Error: Failed to find Action command in MAXScript callback for action [{action_name}]!')\n"
-        ).format(hash_name=hash_name, command_name=method_name, action_name=action_name)
-
-        pymxs.runtime.execute(
-            """
+        macro_script = """
             -- Create MacroScript that will callback to our python object
             macroScript {macro_name}
             category: "Flow Production Tracking Menu Actions"
-            tooltip: "{action_name}"
+            tooltip: "{action_title}"
             (
 	            on execute do
 	            (
@@ -169,29 +235,66 @@ class MaxScript:
                         This is a workaround to prevent any menu item from being used while there is a modal window.
                         Calling any python code from maxscript while there is a modal window (even 'a = 1') results in
                         an exception.
-
-                        Note: Keeping the indent is important here
                     */
                     if (sgtk_main_menu_enabled != undefined and sgtk_main_menu_enabled == True) then
-		                python.execute "{python_code}"
+                    (
+                        if {dispatch_function} == undefined or not ({dispatch_function} "{command_id}") then
+                            print "PTR Error: Failed to find Action command in MAXScript callback for action [{action_title}]!"
+                    )
                     else
                         print "PTR Warning: You need to close the current window dialog before using any more commands."
 	            )
             )
+        """.format(
+            macro_name=macro_name,
+            action_title=action_title,
+            command_id=command_id,
+            dispatch_function=engine.maxscript_objects.DISPATCH_FUNCTION,
+        )
 
+        menu_item_script = """
             -- Add menu item using previous MacroScript action
             sgtk_menu_action = menuMan.createActionItem "{macro_name}" "Flow Production Tracking Menu Actions"
             sgtk_menu_action.setUseCustomTitle true
-            sgtk_menu_action.setTitle("{action_name}")
+            sgtk_menu_action.setTitle("{action_title}")
             {menu_var}.addItem sgtk_menu_action -1
         """.format(
-                macro_name=macro_name,
-                menu_var=menu_var,
-                action_name=action_name,
-                python_code=python_code,
-            )
+            macro_name=macro_name,
+            menu_var=menu_var,
+            action_title=action_title,
         )
 
+        # Max writes every macroscript it evaluates to the user macros folder,
+        # so only define it again when its content changed.
+        if engine.macro_manifest.is_defined(macro_name, macro_script):
+            return menu_item_script, None
+
+        return macro_script + menu_item_script, (macro_name, macro_script)
+
+    @staticmethod
+    def escape_string(value):
+        """
+        Escape a value so it can be embedded in a MaxScript string literal.
+
+        :param str value: Value to escape.
+        :returns: The escaped value, without the surrounding quotes.
+        """
+        return value.replace("\\", "\\\\").replace('"', '\\"')
+
+    @staticmethod
+    def get_user_macros_folder():
+        """
+        Returns the path to the 3ds Max user macros folder, where Max saves the
+        macroscripts it evaluates.
+
+        :returns: The folder path or None if it can't be resolved.
+        """
+        try:
+            folder = pymxs.runtime.pathConfig.GetDir(pymxs.runtime.Name("userMacros"))
+        except Exception:
+            return None
+        return folder or None
+
     @staticmethod
     def disable_menu():
         """
@@ -209,3 +312,149 @@ class MaxScript:
         """
 
         pymxs.runtime.execute("sgtk_main_menu_enabled = True")
+
+
+class MaxScriptBatch(object):
+    """
+    Gathers MaxScript menu statements and submits them in a single
+    ``pymxs.runtime.execute`` call.
+
+    The builder exposes the same menu methods as :class:`MaxScript`, but instead
+    of compiling each statement on its own, it accumulates the generated
+    MaxScript until :meth:`execute` is called.
+    """
+
+    def __init__(self, menu_registry=None):
+        """
+        Initialize an empty batch.
+
+        :param menu_registry: Optional :class:`MenuRegistry` tracking the menus
+            created by the batch. Without one, menus are looked up and
+            unregistered by name before being created.
+        """
+        self._menu_registry = menu_registry
+        self._scripts = []
+        # Number of execute calls the queued statements stand for.
+        self._call_count = 0
+        # (manifest, macro name, macro source) of the macroscripts the queued
+        # statements define.
+        self._macros = []
+        self._round_trips_saved = 0
+
+    @property
+    def statement_count(self):
+        """
+        Number of statements currently queued in the batch.
+        """
+        return len(self._scripts)
+
+    @property
+    def round_trips_saved(self):
+        """
+        Number of ``pymxs.runtime.execute`` round-trips saved by the batches
+        executed so far compared to submitting each statement on its own.
+        """
+        return self._round_trips_saved
+
+    def _queue(self, script, calls=1):
+        """
+        Queue a statement.
+
+        :param script: MaxScript source of the statement.
+        :param calls: Number of ``pymxs.runtime.execute`` calls the statement
+            needs when submitted through :class:`MaxScript`.
+        """
+        self._scripts.append(script)
+        self._call_count += calls
+
+    def add_to_menu(self, from_menu_var, to_menu_var, from_menu_name):
+        """
+        Queue a :meth:`MaxScript.add_to_menu` statement.
+        """
+        self._queue(
+            MaxScript.add_to_menu_script(from_menu_var, to_menu_var, from_menu_name)
+        )
+
+    def create_menu(self, menu_name, menu_var):
+        """
+        Queue a :meth:`MaxScript.create_menu` statement.
+        """
+        # MaxScript.create_menu unregisters the old "Shotgun" menu and the
+        # menu itself before creating it, in three execute calls.
+        if self._menu_registry is not None:
+            self._queue(
+                self._menu_registry.create_menu_script(menu_name, menu_var), calls=3
+            )
+        else:
+            self._queue(MaxScript.create_menu_script(menu_name, menu_var), calls=3)
+
+    def unregister_registered_menus(self):
+        """
+        Queue the removal of the menus tracked by the batch's :class:`MenuRegistry`.
+
+        This must be queued before any :meth:`create_menu` statement.
+        """
+        self._queue(self._menu_registry.begin_script())
+
+    def reset_menu(self, menu_var, menu_name):
+        """
+        Queue a :meth:`MaxScript.reset_menu_script` statement.
+        """
+        self._queue(MaxScript.reset_menu_script(menu_var, menu_name))
+
+    def add_separator(self, menu_var):
+        """
+        Queue a :meth:`MaxScript.add_separator` statement.
+        """
+        self._queue(MaxScript.add_separator_script(menu_var))
+
+    def add_to_main_menu_bar(self, menu_var, menu_name):
+        """
+        Queue a :meth:`MaxScript.add_to_main_menu_bar` statement.
+        """
+        self._queue(MaxScript.add_to_main_menu_bar_script(menu_var, menu_name))
+
+    def update_menu_bar(self):
+        """
+        Queue a :meth:`MaxScript.update_menu_bar_script` statement.
+        """
+        self._queue(MaxScript.update_menu_bar_script())
+
+    def add_action_to_menu(self, callback, action_name, menu_var, engine):
+        """
+        Queue a :meth:`MaxScript.add_action_to_menu` statement.
+        """
+        script, macro = MaxScript.add_action_to_menu_script(
+            callback, action_name, menu_var, engine
+        )
+        self._queue(script)
+        if macro is not None:
+            self._macros.append((engine.macro_manifest,) + macro)
+
+    def execute(self):
+        """
+        Compile and run all the queued statements as a single MaxScript block.
+
+        The macroscripts the statements define are registered in their
+        manifest once they ran. The batch is emptied afterwards so it can be
+        reused.
+
+        :returns: Number of round-trips saved by this call.
+        """
+        if not self._scripts:
+            return 0
+
+        scripts = self._scripts
+        calls = self._call_count
+        macros = self._macros
+        self._scripts = []
+        self._call_count = 0
+        self._macros = []
+
+        pymxs.runtime.execute("\n".join(scripts))
+        for manifest, macro_name, source in macros:
+            manifest.register(macro_name, source)
+
+        saved = calls - 1
+        self._round_trips_saved += saved
+        return saved
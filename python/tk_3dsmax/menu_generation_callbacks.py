@@ -12,104 +12,139 @@
 Menu handling for 3ds Max
 """
 
+import collections
+import uuid
+
 from pymxs import runtime as rt
 
 from .menu_generation_menuman import MenuGenerator_menuMan, AppCommand
 
+# Immutable description of the dynamic menus. Each menu is a tuple of entries,
+# an entry being either a MenuItem or a SubMenu holding a tuple of MenuItems.
+MenuItem = collections.namedtuple("MenuItem", ["code", "name"])
+SubMenu = collections.namedtuple("SubMenu", ["name", "items"])
+MenuModel = collections.namedtuple("MenuModel", ["apps", "favourites", "context"])
+
+# Namespace of the GUIDs of the Flow Production Tracking CUI menu entries.
+MENU_GUID_NAMESPACE = uuid.UUID("6a0f6f3e-54d1-4c57-9a5b-2f8e1d3c7b94")
+
+# MaxScript globals flagging what was already done in the current 3ds Max session.
+# They outlive the engine so that restarting it does not redo the work.
+MACROS_DEFINED_FLAG = "sgtk_dynamic_menu_macros_defined"
+CONFIGURATION_LOADED_FLAG = "sgtk_dynamic_menu_configuration_loaded"
+
 
 class MenuGenerator_callbacks(MenuGenerator_menuMan):
     """
     Menu generation functionality for 3dsmax 2025+
     """
 
-    def create_menu(self):
+    def __init__(self, engine):
+        """
+        Initialize Menu Generator.
+        :param engine: Engine to get commands from.
+        """
+        super().__init__(engine)
+
+        # Menu model replayed by the populate callbacks and the key it was built from.
+        self._menu_model = None
+        self._menu_model_key = None
+
+        # When the dynamic menus are persistent, the macros are registered once
+        # per 3ds Max session and the context label is shown by the context
+        # menu itself, so context switches don't need a CUI configuration reload.
+        self._persistent = engine.get_setting("persistent_dynamic_menus", False)
+        self._context_label = None
+
+        # True once the macros and the cuiRegisterMenus callback are installed.
+        self._menu_installed = False
+        # Subscription of the menu to the cuiRegisterMenus notification.
+        self._menu_subscription = None
+
+    def _create_menu(self):
         """
         Create the Shotgun Menu
         """
+        self._register_menu(install=True)
+
+    def _update_menu(self):
+        """
+        Register the callbacks of the current commands and refresh the dynamic
+        menus. The macros and the cuiRegisterMenus callback are only installed
+        again if the menu was destroyed.
+
+        :returns: List of the names of the sections that changed.
+        """
+        previous_model = self._menu_model if self._menu_installed else None
+        previous_label = self._context_label
+
+        self._register_menu(install=not self._menu_installed)
+
+        if previous_model is None:
+            return list(self.MENU_SECTIONS)
+
+        changed_sections = []
+        if (
+            self._context_label != previous_label
+            or self._menu_model.context != previous_model.context
+        ):
+            changed_sections.append("context")
+        if self._menu_model.favourites != previous_model.favourites:
+            changed_sections.append("favourites")
+        if self._menu_model.apps != previous_model.apps:
+            changed_sections.append("apps")
+        return changed_sections
+
+    def _register_menu(self, install):
+        """
+        Register the menu callbacks and build the menu model.
+
+        :param bool install: Install the macros and the cuiRegisterMenus callback
+            even if they are already installed.
+        """
         # Create the main menu
+        callbacks = self._engine.maxscript_objects
+        previous_label = self._context_label
 
-        # callbacks initial dict
-        cmd_fn_list = {
-            2001: self._jump_to_sg,
-            2002: self._jump_to_fs,
-        }
+        # callbacks initial entries
+        callbacks.register(2001, self._jump_to_sg)
+        callbacks.register(2002, self._jump_to_fs)
+        # The context label entry of the persistent context menu.
+        callbacks.register(2000, self._jump_to_sg)
+        self._context_label = str(self._engine.context)
 
         # enumerate all items and create menu objects for them
-        cmd_items = []
+        cmd_items = {}
         for idx, (cmd_name, cmd_details) in enumerate(self._engine.commands.items()):
             code = idx + 1000
             command = AppCommand2025(cmd_name, cmd_details, code)
-            cmd_items.append(command)
-            cmd_fn_list[code] = command.execute
-
-        # start with context menu
-        context_items = []
-        for cmd in cmd_items:
-            if cmd.get_type() == "context_menu":
-                context_items.append(cmd)
-
-        # now favourites
-        favorites = []
-        for fav in self._engine.get_setting("menu_favourites", []):
-            app_instance_name = fav["app_instance"]
-            menu_name = fav["name"]
-            # scan through all menu items
-            for cmd in cmd_items:
-                if (
-                    cmd.get_app_instance_name() == app_instance_name
-                    and cmd.name == menu_name
-                ):
-                    # found our match!
-                    favorites.append(cmd)
-                    # mark as a favourite item
-                    cmd.favourite = True
+            cmd_items[cmd_name] = command
+            callbacks.register(code, command.execute)
 
-        # now go through all of the menu items.
-        # separate them out into various sections
-        commands_by_app = {}
-        for cmd in cmd_items:
-            if cmd.get_type() != "context_menu":
-                # normal menu
-                app_name = cmd.get_app_name()
-                if app_name is None:
-                    # un-parented app
-                    app_name = "Other Items"
-                if not app_name in commands_by_app:
-                    commands_by_app[app_name] = []
-                commands_by_app[app_name].append(cmd)
-
-        # Define 3dsmax 2025 menu callbacks
-        def populate_apps_menu(menuroot):
-            for app_name in sorted(commands_by_app.keys()):
-                if len(commands_by_app[app_name]) > 1:
-                    # make a sub menu and put all items in the sub menu
-                    submenu = menuroot.addsubmenu(app_name)
-                    for cmd in commands_by_app[app_name]:
-                        submenu.additem(cmd.code, cmd.name)
-                else:
-                    cmd_obj = commands_by_app[app_name][0]
-                    if not cmd_obj.favourite:
-                        # skip favourites since they are alreay on the menu
-                        menuroot.additem(cmd_obj.code, cmd_obj.name)
-
-        def populate_favs_menu(menuroot):
-            for cmd in favorites:
-                menuroot.additem(cmd.code, cmd.name)
-
-        def populate_cntx_menu(menuroot):
-            menuroot.additem(2001, "Jump to Flow Production Tracking")
-            menuroot.additem(2002, "Jump to File System")
-            for cmd in context_items:
-                menuroot.additem(cmd.code, cmd.name)
+        # The menu model only depends on the commands and the favourites, so
+        # it is only rebuilt when one of them changed.
+        model_key = self._get_menu_model_key(cmd_items)
+        if self._menu_model is None or model_key != self._menu_model_key:
+            self._menu_model = self._build_menu_model(cmd_items)
+            self._menu_model_key = model_key
+        else:
+            self._engine.log_debug("Reusing the cached PTR menu model.")
 
         def menu_item_selected(itemid):
-            cmd_fn_list[itemid]()
+            callback = callbacks.get(itemid)
+            if callback is None:
+                self._engine.log_error(
+                    "PTR Error: Failed to find Action command for menu item %s!"
+                    % itemid
+                )
+                return
+            callback()
 
         # let this be called from mxs by injecting it in the global maxscript namespace
-        rt.populate_apps_menu = populate_apps_menu
-        rt.populate_favs_menu = populate_favs_menu
-        rt.populate_cntx_menu = populate_cntx_menu
-        rt.menu_item_selected = menu_item_selected
+        callbacks.register_global("populate_apps_menu", self._populate_apps_menu)
+        callbacks.register_global("populate_favs_menu", self._populate_favs_menu)
+        callbacks.register_global("populate_cntx_menu", self._populate_cntx_menu)
+        callbacks.register_global("menu_item_selected", menu_item_selected)
 
         mxswrapper = """
         macroscript Python_Apps_Action_Item category:"Menu Apps Category" buttonText:"Toolkit Apps"
@@ -134,7 +169,7 @@ class MenuGenerator_callbacks(MenuGenerator_menuMan):
                 menu_item_selected id
             )
         )
-        macroscript Python_Cntx_Action_Item category:"Menu Cntx Category" buttonText:"{context_name}"
+        macroscript Python_Cntx_Action_Item category:"Menu Cntx Category" buttonText:"{context_label}"
         (
             on populateDynamicMenu menuRoot do
             (
@@ -145,39 +180,243 @@ class MenuGenerator_callbacks(MenuGenerator_menuMan):
                 menu_item_selected id
             )
         )
-        """.format(context_name=str(self._engine.context))
-        rt.execute(mxswrapper)
+        """
+        if not self._persistent:
+            # The context menu title is baked in its macro.
+            if install or self._context_label != previous_label:
+                rt.execute(mxswrapper.format(context_label=self._context_label))
+        elif not _get_session_flag(MACROS_DEFINED_FLAG):
+            rt.execute(mxswrapper.format(context_label="Current Context"))
+            _set_session_flag(MACROS_DEFINED_FLAG, True)
 
-        def create_menu_callback():
+        def create_menu_callback(event):
+            # The GUIDs are derived from the menu label and the entries, so
+            # every session and context switch reuses the same CUI entries.
             menumgr = rt.callbacks.notificationparam()
             mainmenubar = menumgr.mainmenubar
             newsubmenu = mainmenubar.createsubmenu(
-                rt.genguid(), self._engine.MENU_LABEL, beforeid=self._engine.HELPMENU_ID
+                self._get_menu_guid("submenu"),
+                self._engine.MENU_LABEL,
+                beforeid=self._engine.HELPMENU_ID,
             )
             newsubmenu.createaction(
-                rt.genguid(), 647394, "Python_Cntx_Action_Item`Menu Cntx Category"
+                self._get_menu_guid("Python_Cntx_Action_Item"),
+                647394,
+                "Python_Cntx_Action_Item`Menu Cntx Category",
             )
             newsubmenu.createaction(
-                rt.genguid(), 647394, "Python_Favs_Action_Item`Menu Favs Category"
+                self._get_menu_guid("Python_Favs_Action_Item"),
+                647394,
+                "Python_Favs_Action_Item`Menu Favs Category",
             )
-            newsubmenu.createseparator(rt.genguid())
+            newsubmenu.createseparator(self._get_menu_guid("separator"))
             newsubmenu.createaction(
-                rt.genguid(), 647394, "Python_Apps_Action_Item`Menu Apps Category"
+                self._get_menu_guid("Python_Apps_Action_Item"),
+                647394,
+                "Python_Apps_Action_Item`Menu Apps Category",
             )
 
-        MENU_DEMO_SCRIPT = rt.name(self._menu_var)
-        rt.callbacks.removescripts(id=MENU_DEMO_SCRIPT)
-        rt.callbacks.addscript(
-            rt.name("cuiRegisterMenus"), create_menu_callback, id=MENU_DEMO_SCRIPT
-        )
+        if not install:
+            return
 
-    def destroy_menu(self):
+        # Callbacks registered by previous versions of the engine.
         rt.callbacks.removescripts(id=rt.name(self._menu_var))
+        if self._menu_subscription is not None:
+            self._menu_subscription.unsubscribe()
+        self._menu_subscription = self._engine.notifications.subscribe(
+            "cuiRegisterMenus", create_menu_callback
+        )
+        self._menu_installed = True
+
+    def _get_menu_guid(self, *identity):
+        """
+        Build a deterministic GUID for a CUI menu entry.
+
+        :param identity: Strings identifying the entry within the menu.
+        :returns: The GUID string.
+        """
+        name = "/".join((self._engine.MENU_LABEL,) + identity)
+        return str(uuid.uuid5(MENU_GUID_NAMESPACE, name))
+
+    def _get_menu_model_key(self, cmd_items):
+        """
+        Compute the key identifying the menu model for a set of commands.
+
+        :param dict cmd_items: Command names to :class:`AppCommand2025` instances.
+        :returns: A hashable key.
+        """
+        return (
+            tuple(
+                (
+                    cmd.name,
+                    cmd.code,
+                    cmd.get_type(),
+                    cmd.get_app_name(),
+                    cmd.get_app_instance_name(),
+                )
+                for cmd in cmd_items.values()
+            ),
+            tuple(
+                (fav["app_instance"], fav["name"])
+                for fav in self._engine.get_setting("menu_favourites", [])
+            ),
+        )
+
+    def _build_menu_model(self, cmd_items):
+        """
+        Build the menu model for a set of commands.
+
+        :param dict cmd_items: Command names to :class:`AppCommand2025` instances.
+        :returns: A :class:`MenuModel` instance.
+        """
+        command_index = self._engine.command_index
+
+        # start with context menu
+        context_items = [
+            MenuItem(2001, "Jump to Flow Production Tracking"),
+            MenuItem(2002, "Jump to File System"),
+        ]
+        for cmd_name in command_index.get_command_names_by_type("context_menu"):
+            cmd = cmd_items[cmd_name]
+            context_items.append(MenuItem(cmd.code, cmd.name))
+
+        # now favourites
+        favorites = []
+        for fav in self._engine.get_setting("menu_favourites", []):
+            app_instance_name = fav["app_instance"]
+            menu_name = fav["name"]
+            if command_index.has_app_instance_command(app_instance_name, menu_name):
+                # found our match!
+                cmd = cmd_items[menu_name]
+                favorites.append(MenuItem(cmd.code, cmd.name))
+                # mark as a favourite item
+                cmd.favourite = True
+
+        # now go through all of the menu items.
+        # separate them out into various sections
+        commands_by_app = {}
+        for cmd in cmd_items.values():
+            if cmd.get_type() != "context_menu":
+                # normal menu
+                app_name = cmd.get_app_name()
+                if app_name is None:
+                    # un-parented app
+                    app_name = "Other Items"
+                if not app_name in commands_by_app:
+                    commands_by_app[app_name] = []
+                commands_by_app[app_name].append(cmd)
+
+        app_items = []
+        for app_name in sorted(commands_by_app.keys()):
+            if len(commands_by_app[app_name]) > 1:
+                # make a sub menu and put all items in the sub menu
+                app_items.append(
+                    SubMenu(
+                        app_name,
+                        tuple(
+                            MenuItem(cmd.code, cmd.name)
+                            for cmd in commands_by_app[app_name]
+                        ),
+                    )
+                )
+            else:
+                cmd_obj = commands_by_app[app_name][0]
+                if not cmd_obj.favourite:
+                    # skip favourites since they are alreay on the menu
+                    app_items.append(MenuItem(cmd_obj.code, cmd_obj.name))
+
+        return MenuModel(tuple(app_items), tuple(favorites), tuple(context_items))
+
+    def _populate_apps_menu(self, menuroot):
+        """
+        Populate the dynamic apps menu from the cached menu model.
+        """
+        _populate_menu(menuroot, self._menu_model.apps)
+
+    def _populate_favs_menu(self, menuroot):
+        """
+        Populate the dynamic favourites menu from the cached menu model.
+        """
+        _populate_menu(menuroot, self._menu_model.favourites)
+
+    def _populate_cntx_menu(self, menuroot):
+        """
+        Populate the dynamic context menu from the cached menu model.
+        """
+        if self._persistent:
+            # The macro title is static, so show the current context first.
+            menuroot.additem(2000, self._context_label)
+        _populate_menu(menuroot, self._menu_model.context)
+
+    def can_update_in_place(self):
+        """
+        :returns: True if the menu can be rebuilt without being destroyed first.
+        """
+        return self._persistent
+
+    def needs_configuration_reload(self):
+        """
+        :returns: True if the CUI menu configuration must be reloaded for the
+            menu to show up.
+        """
+        return not self._persistent or not _get_session_flag(CONFIGURATION_LOADED_FLAG)
+
+    def reload_configuration(self):
+        """
+        Reload the current CUI menu configuration.
+
+        This causes the menu file chain to be loaded and the cuiRegisterMenus
+        callback to be triggered.
+        """
         iCuiMenuMgr = rt.MaxOps.GetICuiMenuMgr()
         iCuiMenuMgr.LoadConfiguration(iCuiMenuMgr.GetCurrentConfiguration())
+        if self._persistent:
+            _set_session_flag(CONFIGURATION_LOADED_FLAG, True)
+
+    def destroy_menu(self):
+        if self._menu_subscription is not None:
+            self._menu_subscription.unsubscribe()
+            self._menu_subscription = None
+        self._menu_installed = False
+        self._engine.maxscript_objects.clear()
+        self.reload_configuration()
+        # The menu is gone, so the next engine needs to reload the configuration.
+        _set_session_flag(CONFIGURATION_LOADED_FLAG, False)
 
 
 class AppCommand2025(AppCommand):
     def __init__(self, name, command_dict, code):
         self.code = code
         super().__init__(name, command_dict)
+
+
+def _populate_menu(menuroot, entries):
+    """
+    Replay menu model entries into a dynamic menu.
+
+    :param menuroot: MaxScript dynamic menu to populate.
+    :param tuple entries: :class:`MenuItem` and :class:`SubMenu` entries.
+    """
+    for entry in entries:
+        if isinstance(entry, SubMenu):
+            submenu = menuroot.addsubmenu(entry.name)
+            for item in entry.items:
+                submenu.additem(item.code, item.name)
+        else:
+            menuroot.additem(entry.code, entry.name)
+
+
+def _get_session_flag(name):
+    """
+    :param str name: Name of the MaxScript global holding the flag.
+    :returns: True if the flag was set in the current 3ds Max session.
+    """
+    return bool(getattr(rt, name, None))
+
+
+def _set_session_flag(name, value):
+    """
+    :param str name: Name of the MaxScript global holding the flag.
+    :param bool value: Value of the flag.
+    """
+    setattr(rt, name, value)
@@ -18,7 +18,10 @@ import traceback
 import unicodedata
 
 from sgtk.platform.qt import QtCore, QtGui
-from .maxscript import MaxScript
+from .callback_registry import CallbackRegistry
+from .macro_manifest import MacroManifest
+from .maxscript import MaxScript, MaxScriptBatch
+from .menu_registry import MenuRegistry
 
 
 class MenuGenerator_menuMan(object):
@@ -30,6 +33,9 @@ class MenuGenerator_menuMan(object):
     that directly call python code
     """
 
+    # Sections of the menu that can change from one build to the next.
+    MENU_SECTIONS = ("context", "favourites", "apps")
+
     def __init__(self, engine):
         """
         Initialize Menu Generator.
@@ -37,55 +43,115 @@ class MenuGenerator_menuMan(object):
         """
         self._engine = engine
 
+        # Entries of the menu currently installed, by section.
+        self._menu_layout = None
+
         # Maxscript variable name for context menu
         self._ctx_var = "sgtk_menu_ctx"
         # Mascript variable name for Shotgun main menu
         self._menu_var = "sgtk_menu_main"
 
         # Need a globally available object for maxscript action callbacks to be able to refer to python objects
-        self._engine.maxscript_objects = {}
+        self._engine.maxscript_objects = CallbackRegistry(self._engine.logger)
+
+        # Macroscripts defined by the engine, so they are only written again when they change.
+        self._engine.macro_manifest = MacroManifest(
+            MaxScript.get_user_macros_folder(), self._engine.logger
+        )
+
+        # Menus created by the engine, so they can be removed without looking them up.
+        self._menu_registry = MenuRegistry(["Shotgun", self._engine.MENU_LABEL])
 
     def create_menu(self):
         """
         Create the Shotgun Menu
         """
+        # Each build registers its callbacks in a new generation, which releases
+        # the callbacks registered by the previous build.
+        with self._engine.maxscript_objects.new_generation():
+            self._create_menu()
+
+    def update_menu(self):
+        """
+        Update the Shotgun Menu after the commands or the context changed.
 
-        # Create the main menu
-        MaxScript.create_menu(self._engine.MENU_LABEL, self._menu_var)
+        Only the sections of the menu whose entries changed are rebuilt.
+
+        :returns: List of the names of the sections that were rebuilt.
+        """
+        with self._engine.maxscript_objects.new_generation():
+            return self._update_menu()
+
+    def _create_menu(self):
+        """
+        Build the menu entries and register their callbacks.
+        """
+        cmd_items, layout = self._get_menu_layout()
+        self._build_menu(cmd_items, layout, rebuild_all=True)
+
+    def _update_menu(self):
+        """
+        Rebuild the menu sections that changed and register the callbacks of
+        the whole menu.
+
+        :returns: List of the names of the sections that were rebuilt.
+        """
+        cmd_items, layout = self._get_menu_layout()
+
+        if self._menu_layout is None:
+            changed_sections = list(self.MENU_SECTIONS)
+        else:
+            changed_sections = [
+                section
+                for section in self.MENU_SECTIONS
+                if layout[section] != self._menu_layout[section]
+            ]
+
+        # The context submenu can be refilled in place, the other sections are
+        # entries of the main menu so they need the whole menu to be rebuilt.
+        self._build_menu(
+            cmd_items,
+            layout,
+            rebuild_all=bool(set(changed_sections) - set(["context"])),
+            rebuild_context="context" in changed_sections,
+        )
+        return changed_sections
+
+    def _get_menu_layout(self):
+        """
+        Sort the engine commands into the menu sections.
+
+        :returns: Tuple of a dictionary of command names to :class:`AppCommand`
+            instances and a dictionary of section names to hashable keys
+            describing the entries of each section.
+        """
+        command_index = self._engine.command_index
 
         # enumerate all items and create menu objects for them
-        cmd_items = []
+        cmd_items = {}
         for cmd_name, cmd_details in self._engine.commands.items():
-            cmd_items.append(AppCommand(cmd_name, cmd_details))
+            cmd_items[cmd_name] = AppCommand(cmd_name, cmd_details)
 
         # start with context menu
-        self._create_context_builder()
-        for cmd in cmd_items:
-            if cmd.get_type() == "context_menu":
-                cmd.add_to_menu(self._ctx_var, self._engine)
+        ctx = self._engine.context
+        context_names = command_index.get_command_names_by_type("context_menu")
 
         # now favourites
+        favourite_names = []
         for fav in self._engine.get_setting("menu_favourites", []):
             app_instance_name = fav["app_instance"]
             menu_name = fav["name"]
-            # scan through all menu items
-            for cmd in cmd_items:
-                if (
-                    cmd.get_app_instance_name() == app_instance_name
-                    and cmd.name == menu_name
-                ):
-                    # found our match!
-                    cmd.add_to_menu(self._menu_var, self._engine)
-                    # mark as a favourite item
-                    cmd.favourite = True
-
-        MaxScript.add_separator(self._menu_var)
+            if command_index.has_app_instance_command(app_instance_name, menu_name):
+                # found our match!
+                favourite_names.append(menu_name)
+                # mark as a favourite item
+                cmd_items[menu_name].favourite = True
 
         # now go through all of the menu items.
         # separate them out into various sections
         commands_by_app = {}
 
-        for cmd in cmd_items:
+        for cmd in cmd_items.values():
             if cmd.get_type() != "context_menu":
                 # normal menu
                 app_name = cmd.get_app_name()
@@ -94,26 +160,123 @@ class MenuGenerator_menuMan(object):
                     app_name = "Other Items"
                 if not app_name in commands_by_app:
                     commands_by_app[app_name] = []
-                commands_by_app[app_name].append(cmd)
+                commands_by_app[app_name].append(cmd.name)
+
+        layout = {
+            "context": (
+                str(ctx),
+                bool(ctx.filesystem_locations),
+                tuple(context_names),
+            ),
+            "favourites": tuple(favourite_names),
+            "apps": tuple(
+                (app_name, tuple(commands_by_app[app_name]))
+                for app_name in sorted(commands_by_app.keys())
+            ),
+        }
+        return cmd_items, layout
+
+    def _build_menu(self, cmd_items, layout, rebuild_all, rebuild_context=False):
+        """
+        Build the menu sections and register the callbacks of all the entries.
+
+        :param dict cmd_items: Command names to :class:`AppCommand` instances.
+        :param dict layout: Section names to the keys describing their entries,
+            as returned by :meth:`_get_menu_layout`.
+        :param bool rebuild_all: Rebuild the whole menu.
+        :param bool rebuild_context: Refill the context submenu of the current
+            menu. Ignored if ``rebuild_all`` is True.
+        """
+        # The whole menu is gathered in a single MaxScript block so it is
+        # compiled once instead of once per menu entry.
+        batch = MaxScriptBatch(self._menu_registry)
+        # The entries of the sections that are kept are still generated, so their
+        # callbacks are registered in the same order, but never executed.
+        skipped = MaxScriptBatch(self._menu_registry)
+
+        menu_batch = batch if rebuild_all else skipped
+        ctx_batch = batch if rebuild_all or rebuild_context else skipped
+
+        if rebuild_all:
+            # Remove the menus of the previous build before creating the new ones.
+            batch.unregister_registered_menus()
+
+            # Create the main menu
+            batch.create_menu(self._engine.MENU_LABEL, self._menu_var)
+        elif rebuild_context:
+            batch.reset_menu(self._ctx_var, layout["context"][0])
+
+        # start with context menu
+        self._create_context_builder(ctx_batch, menu_batch, rebuild_all)
+        for cmd_name in layout["context"][2]:
+            cmd_items[cmd_name].add_to_menu(self._ctx_var, self._engine, ctx_batch)
+
+        # now favourites
+        for menu_name in layout["favourites"]:
+            cmd_items[menu_name].add_to_menu(self._menu_var, self._engine, menu_batch)
+
+        menu_batch.add_separator(self._menu_var)
 
         # now add all apps to main menu
-        self._add_app_menu(commands_by_app)
+        commands_by_app = dict(
+            (app_name, [cmd_items[cmd_name] for cmd_name in cmd_names])
+            for app_name, cmd_names in layout["apps"]
+        )
+        self._add_app_menu(commands_by_app, menu_batch)
+
+        if rebuild_all:
+            batch.add_to_main_menu_bar(self._menu_var, self._engine.MENU_LABEL)
+        elif rebuild_context:
+            batch.update_menu_bar()
+
+        statement_count = batch.statement_count
+        batch.execute()
+        self._engine.macro_manifest.save()
+        self._menu_layout = layout
+        if statement_count:
+            self._engine.log_debug(
+                "Built the PTR menu from %d MaxScript statements in a single call, "
+                "saving %d round-trips." % (statement_count, batch.round_trips_saved)
+            )
+
+    def can_update_in_place(self):
+        """
+        :returns: True if the menu can be rebuilt without being destroyed first.
+        """
+        return False
 
-        MaxScript.add_to_main_menu_bar(self._menu_var, self._engine.MENU_LABEL)
+    def needs_configuration_reload(self):
+        """
+        :returns: True if the menu configuration must be reloaded for the menu
+            to show up.
+        """
+        return False
+
+    def forget_menus(self):
+        """
+        Forget the menus of the previous builds after 3ds Max reloaded its menu
+        file, so the next build removes them by name.
+        """
+        self._menu_registry.forget_menus()
 
     def destroy_menu(self):
-        MaxScript.unregister_menu(self._engine.MENU_LABEL)
+        self._menu_registry.unregister_menus()
+        self._menu_layout = None
+        self._engine.maxscript_objects.clear()
 
-    def _create_context_builder(self):
+    def _create_context_builder(self, ctx_batch, menu_batch, create=True):
         """
         Adds a context menu wich displays the current context
-        :returns: Menu builder
+        :param ctx_batch: :class:`MaxScriptBatch` the context menu statements are added to.
+        :param menu_batch: :class:`MaxScriptBatch` the main menu statements are added to.
+        :param bool create: Create the context menu, False if it is refilled in place.
         """
         ctx = self._engine.context
         ctx_name = str(ctx)
 
-        MaxScript.create_menu(ctx_name, self._ctx_var)
-        MaxScript.add_action_to_menu(
+        if create:
+            ctx_batch.create_menu(ctx_name, self._ctx_var)
+        ctx_batch.add_action_to_menu(
             self._jump_to_sg,
             "Jump to Flow Production Tracking",
             self._ctx_var,
@@ -122,12 +285,12 @@ class MenuGenerator_menuMan(object):
 
         # Add the menu item only when there are some file system locations.
         if ctx.filesystem_locations:
-            MaxScript.add_action_to_menu(
+            ctx_batch.add_action_to_menu(
                 self._jump_to_fs, "Jump to File System", self._ctx_var, self._engine
             )
 
-        MaxScript.add_separator(self._menu_var)
-        MaxScript.add_to_menu(self._ctx_var, self._menu_var, "ctx_builder")
+        menu_batch.add_separator(self._menu_var)
+        menu_batch.add_to_menu(self._ctx_var, self._menu_var, "ctx_builder")
 
     def _jump_to_sg(self):
         """
@@ -148,30 +311,31 @@ class MenuGenerator_menuMan(object):
             if exit_code != 0:
                 self._engine.log_error("Failed to launch '%s'!" % cmd)
 
-    def _add_app_menu(self, commands_by_app):
+    def _add_app_menu(self, commands_by_app, batch):
         """
         Add all apps to the main menu, process them one by one.
         :param commands_by_app: Dictionary of app name and commands related to the app, which
                                 will be added to the menu builder
+        :param batch: :class:`MaxScriptBatch` the menu statements are added to.
         """
         for app_name in sorted(commands_by_app.keys()):
             if len(commands_by_app[app_name]) > 1:
                 # more than one menu entry fort his app
                 # make a sub menu and put all items in the sub menu
                 menu_var = "sgtk_menu_builder"
-                MaxScript.create_menu(app_name, menu_var)
+                batch.create_menu(app_name, menu_var)
 
                 for cmd in commands_by_app[app_name]:
-                    cmd.add_to_menu(menu_var, self._engine)
+                    cmd.add_to_menu(menu_var, self._engine, batch)
 
-                MaxScript.add_to_menu(menu_var, self._menu_var, "ShotGridMenu")
+                batch.add_to_menu(menu_var, self._menu_var, "ShotGridMenu")
             else:
                 # this app only has a single entry.
                 # display that on the menu
                 cmd_obj = commands_by_app[app_name][0]
                 if not cmd_obj.favourite:
                     # skip favourites since they are alreay on the menu
-                    cmd_obj.add_to_menu(self._menu_var, self._engine)
+                    cmd_obj.add_to_menu(self._menu_var, self._engine, batch)
 
 
 class AppCommand(object):
@@ -207,17 +371,7 @@ class AppCommand(object):
         if engine is None:
             return None
 
-        if "app" not in self.properties:
-            return None
-
-        app_instance = self.properties["app"]
-
-        for app_instance_name, app_instance_obj in engine.apps.items():
-            if app_instance_obj == app_instance:
-                # found our app!
-                return app_instance_name
-
-        return None
+        return engine.command_index.get_app_instance_name(self.properties["app"])
 
     def get_documentation_url_str(self):
         """
@@ -261,10 +415,12 @@ class AppCommand(object):
             if engine is not None:
                 engine.log_error("Failed to call command '%s'. '%s'!" % (self.name, tb))
 
-    def add_to_menu(self, menu_var, engine):
+    def add_to_menu(self, menu_var, engine, builder=MaxScript):
         """
         Add command to menu
         :param menu_var: MaxScript menu variable name to add menu item to.
         :param engine: Current engine where the action can be globally linked back to. (Not the App engine)
+        :param builder: :class:`MaxScript` or a :class:`MaxScriptBatch` instance used to
+                        generate the menu item. Defaults to executing it immediately.
         """
-        MaxScript.add_action_to_menu(self.execute, self.name, menu_var, engine)
+        builder.add_action_to_menu(self.execute, self.name, menu_var, engine)
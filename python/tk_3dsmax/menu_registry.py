@@ -0,0 +1,116 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Registry of the menuMan menus created by the engine.
+"""
+
+import pymxs
+
+from .maxscript import MaxScript
+
+
+class MenuRegistry(object):
+    """
+    Tracks the menus created by the engine in the current 3ds Max session.
+
+    The menu handles are kept in a MaxScript global array, so they survive
+    engine restarts within the session. Tearing the menus down unregisters
+    exactly those handles instead of looking menus up by name.
+
+    Menus left over by previous sessions, which 3ds Max persists in its menu
+    file, are looked up by name only once per session, on the first build.
+    """
+
+    # MaxScript global holding the handles of the menus created in this session.
+    HANDLES_VAR = "sgtk_registered_menus"
+
+    def __init__(self, legacy_menu_names):
+        """
+        :param list legacy_menu_names: Names of menus from previous sessions
+            that must be removed before the first build of the session.
+        """
+        self._legacy_menu_names = list(legacy_menu_names)
+        self._session_cleanup = False
+
+    def begin_script(self):
+        """
+        MaxScript source to run before creating the menus of a new build.
+
+        It unregisters the menus created by the previous build or, if this is
+        the first build of the session, the legacy menus.
+        """
+        # Reading the global from Python tells us if menus were already built in
+        # this session. Menus created during the first build are also looked up
+        # by name in case a previous session left them behind.
+        self._session_cleanup = getattr(pymxs.runtime, self.HANDLES_VAR, None) is None
+
+        if not self._session_cleanup:
+            return self.unregister_script()
+
+        return """
+            global {handles_var}
+            {handles_var} = #()
+        """.format(handles_var=self.HANDLES_VAR) + "".join(
+            MaxScript.unregister_menu_script(menu_name)
+            for menu_name in self._legacy_menu_names
+        )
+
+    def create_menu_script(self, menu_name, menu_var):
+        """
+        MaxScript source creating a menu and registering its handle.
+
+        :param menu_name: String name of menu to create
+        :param menu_var: MaxScript variable name in which the menu will be created
+        """
+        menu_title = MaxScript.escape_string(menu_name)
+        script = ""
+        if self._session_cleanup and menu_name not in self._legacy_menu_names:
+            script += MaxScript.unregister_menu_script(menu_name)
+
+        return (
+            script
+            + """
+            global {handles_var}
+            {menu_var} = menuMan.createMenu "{menu_name}"
+            append {handles_var} {menu_var}
+        """.format(
+                handles_var=self.HANDLES_VAR, menu_var=menu_var, menu_name=menu_title
+            )
+        )
+
+    def unregister_script(self):
+        """
+        MaxScript source unregistering all the menus created in this session.
+        """
+        return """
+            global {handles_var}
+            if {handles_var} != undefined then
+            (
+                for sgtk_menu in {handles_var} do menuMan.unregisterMenu sgtk_menu
+                {handles_var} = #()
+            )
+        """.format(handles_var=self.HANDLES_VAR)
+
+    def forget_menus(self):
+        """
+        Forget the menus created in this session without unregistering them.
+
+        To be called when 3ds Max reloaded its menu file, which replaces the
+        menus and makes their handles stale. The next build then looks the
+        menus up by name, as on the first build of the session.
+        """
+        setattr(pymxs.runtime, self.HANDLES_VAR, None)
+
+    def unregister_menus(self):
+        """
+        Unregister all the menus created in this session.
+        """
+        pymxs.runtime.execute(self.unregister_script())
@@ -0,0 +1,209 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Dispatcher of the 3ds Max notifications to Python subscribers.
+"""
+
+import collections
+
+import pymxs
+
+from sgtk.platform.qt import QtCore
+
+# Name of the notification and number of notifications it stands for.
+NotificationEvent = collections.namedtuple("NotificationEvent", ["name", "count"])
+
+
+class Subscription(object):
+    """
+    Subscription of a callback to a notification, returned by
+    :meth:`NotificationDispatcher.subscribe`.
+    """
+
+    def __init__(self, dispatcher, notification, callback, debounce):
+        self._dispatcher = dispatcher
+        self.notification = notification
+        self.callback = callback
+        self.debounce = debounce
+        self._count = 0
+        self._timer = None
+        self._active = True
+
+    def unsubscribe(self):
+        """
+        Stop receiving the notification. Pending debounced events are dropped.
+        """
+        self._dispatcher.unsubscribe(self)
+
+    def _notify(self, logger):
+        """
+        Called when the notification is sent.
+        """
+        if not self._active:
+            return
+        if not self.debounce:
+            self._call(logger, 1)
+            return
+
+        self._count += 1
+        if self._timer is None:
+            self._timer = QtCore.QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.setInterval(self.debounce)
+            self._timer.timeout.connect(lambda: self._flush(logger))
+        # Each notification pushes the event back until the notifications stop.
+        self._timer.start()
+
+    def _flush(self, logger):
+        """
+        Send the debounced event.
+        """
+        count = self._count
+        self._count = 0
+        if count:
+            self._call(logger, count)
+
+    def _call(self, logger, count):
+        try:
+            self.callback(NotificationEvent(self.notification, count))
+        except Exception:
+            logger.exception(
+                "Subscriber %r of the %s notification failed."
+                % (self.callback, self.notification)
+            )
+
+    def _cancel(self):
+        """
+        Drop the pending debounced event.
+        """
+        self._active = False
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self._count = 0
+
+
+class NotificationDispatcher(object):
+    """
+    Registers 3ds Max notifications and forwards them to Python subscribers.
+
+    Each notification is registered with ``callbacks.addScript`` once, when
+    its first callback subscribes, and removed when its last callback
+    unsubscribes. All the registrations share the same MaxScript callback
+    id, so :meth:`close` removes them at once.
+
+    Callbacks receive a :data:`NotificationEvent`. A callback subscribed
+    without a debounce window is called while 3ds Max sends the
+    notification, so it can use ``callbacks.notificationParam()``. A callback
+    subscribed with a debounce window is called once the notification
+    stopped being sent for that long, with the number of notifications the
+    event stands for, e.g. once after a merge instead of once per node
+    created. Since Qt events aren't processed while 3ds Max opens or merges
+    a file, the event is sent after the operation completes.
+
+    The dispatcher must be used from the main thread.
+    """
+
+    # MaxScript global called by the notification callbacks.
+    DISPATCH_FUNCTION = "sgtk_notification_dispatch"
+    # Id of the notification callbacks.
+    CALLBACK_ID = "sgtk_notifications"
+
+    def __init__(self, logger):
+        """
+        :param logger: Logger used to report the subscribers that fail.
+        """
+        self._logger = logger
+        # notification -> list of subscriptions, in subscription order.
+        self._subscriptions = {}
+        self._installed = False
+
+    def subscribe(self, notification, callback, debounce=None):
+        """
+        Subscribe a callback to a notification.
+
+        :param str notification: Name of the notification, e.g. ``"filePostOpen"``.
+        :param callback: Callable taking a :data:`NotificationEvent`.
+        :param int debounce: Debounce window in milliseconds. The callback is
+            called for each notification if None or 0.
+        :returns: :class:`Subscription` to unsubscribe with.
+        :raises RuntimeError: If 3ds Max doesn't accept the notification.
+        """
+        if not self._installed:
+            # Drop the callbacks left behind by an engine that wasn't shut down.
+            pymxs.runtime.callbacks.removeScripts(
+                id=pymxs.runtime.Name(self.CALLBACK_ID)
+            )
+            setattr(pymxs.runtime, self.DISPATCH_FUNCTION, self._dispatch)
+            self._installed = True
+
+        subscriptions = self._subscriptions.get(notification)
+        if subscriptions is None:
+            try:
+                pymxs.runtime.callbacks.addScript(
+                    pymxs.runtime.Name(notification),
+                    '%s "%s"' % (self.DISPATCH_FUNCTION, notification),
+                    id=pymxs.runtime.Name(self.CALLBACK_ID),
+                )
+            except Exception as e:
+                raise RuntimeError(
+                    "Unable to register the %s notification: %s" % (notification, e)
+                )
+            subscriptions = self._subscriptions[notification] = []
+
+        subscription = Subscription(self, notification, callback, debounce)
+        subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Unsubscribe a callback. Does nothing if it is already unsubscribed.
+
+        :param subscription: :class:`Subscription` returned by :meth:`subscribe`.
+        """
+        subscription._cancel()
+        subscriptions = self._subscriptions.get(subscription.notification)
+        if not subscriptions or subscription not in subscriptions:
+            return
+
+        subscriptions.remove(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.notification]
+            pymxs.runtime.callbacks.removeScripts(
+                pymxs.runtime.Name(subscription.notification),
+                id=pymxs.runtime.Name(self.CALLBACK_ID),
+            )
+
+    def close(self):
+        """
+        Unsubscribe all the callbacks and remove the notification callbacks.
+        """
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription._cancel()
+        self._subscriptions = {}
+
+        if self._installed:
+            pymxs.runtime.callbacks.removeScripts(
+                id=pymxs.runtime.Name(self.CALLBACK_ID)
+            )
+            setattr(pymxs.runtime, self.DISPATCH_FUNCTION, None)
+            self._installed = False
+
+    def _dispatch(self, notification):
+        """
+        Called from MaxScript when a registered notification is sent.
+
+        :param str notification: Name of the notification.
+        """
+        # Subscribers may unsubscribe while the notification is dispatched.
+        for subscription in list(self._subscriptions.get(notification, ())):
+            subscription._notify(self._logger)
@@ -0,0 +1,206 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Thread-safe access to pymxs from background threads.
+"""
+
+import collections
+import concurrent.futures
+import threading
+
+import pymxs
+
+
+class PymxsFacade(object):
+    """
+    Runs pymxs calls made from any thread in the main thread.
+
+    pymxs is not thread-safe, so each call is queued and returns a
+    :class:`concurrent.futures.Future`. The calls queued before the main
+    thread gets to them run from a single task of the
+    :class:`MainThreadScheduler`, in the order they were made, until the
+    scheduler's tick budget is spent, so a worker thread issuing many queries
+    only waits for one main thread round-trip in most cases::
+
+        facade = engine.pymxs_facade
+        path = facade.get("maxFilePath")
+        name = facade.get("maxFileName")
+        count = facade.execute("objects.count")
+        print(path.result() + name.result(), count.result())
+
+    Calls made from the main thread run right away, so waiting on their
+    result never deadlocks. Calls that can't run because the scheduler is
+    closed are cancelled. A background thread must not wait on a result
+    while the main thread waits on that background thread.
+
+    The facade must be created from the main thread.
+    """
+
+    def __init__(self, scheduler):
+        """
+        :param scheduler: :class:`MainThreadScheduler` running the batches, or
+            None to run the calls right away, e.g. without a UI. Calls can then
+            only be made from the main thread.
+        """
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        # (future, callable) in call order
+        self._pending = collections.deque()
+        self._batch_scheduled = False
+        self._main_thread = threading.current_thread()
+
+    def get(self, name):
+        """
+        Read a MaxScript global.
+
+        :param str name: Name of the global, e.g. ``"maxFilePath"``.
+        :returns: Future holding the value.
+        """
+        return self.run(lambda: getattr(pymxs.runtime, name))
+
+    def set(self, name, value):
+        """
+        Set a MaxScript global.
+
+        :param str name: Name of the global.
+        :param value: Value to assign.
+        :returns: Future holding None once the value is set.
+        """
+        return self.run(lambda: setattr(pymxs.runtime, name, value))
+
+    def call(self, name, *args, **kwargs):
+        """
+        Call a MaxScript function.
+
+        :param str name: Name of the function, e.g. ``"loadMaxFile"``.
+        :param args: Positional arguments for the function.
+        :param kwargs: Named arguments for the function.
+        :returns: Future holding the value returned by the function.
+        """
+        return self.run(lambda: getattr(pymxs.runtime, name)(*args, **kwargs))
+
+    def execute(self, script):
+        """
+        Evaluate MaxScript source.
+
+        :param str script: MaxScript source to evaluate.
+        :returns: Future holding the value of the script.
+        """
+        return self.run(lambda: pymxs.runtime.execute(script))
+
+    def run(self, func, *args, **kwargs):
+        """
+        Run a function using pymxs in the main thread.
+
+        The function should return plain Python values, as pymxs values
+        shouldn't be used from other threads either.
+
+        :param func: Function to run.
+        :param args: Positional arguments for the function.
+        :param kwargs: Named arguments for the function.
+        :returns: Future holding the value returned by the function.
+        :raises RuntimeError: If called from a background thread without a
+            scheduler.
+        """
+        future = concurrent.futures.Future()
+        if threading.current_thread() is self._main_thread:
+            self._run_call(future, lambda: func(*args, **kwargs))
+            return future
+        if self._scheduler is None:
+            raise RuntimeError(
+                "pymxs can't be used from the %s thread without a main thread "
+                "scheduler." % threading.current_thread().name
+            )
+
+        with self._lock:
+            self._pending.append((future, lambda: func(*args, **kwargs)))
+            if self._batch_scheduled:
+                return future
+            self._batch_scheduled = True
+
+        self._schedule_batch()
+        return future
+
+    @property
+    def pending_count(self):
+        """
+        Number of calls waiting for the main thread.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def cancel_pending(self):
+        """
+        Cancel the calls that didn't run yet.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = collections.deque()
+            # Calls made from now on schedule a new batch.
+            self._batch_scheduled = False
+        for future, _ in pending:
+            future.cancel()
+
+    def _schedule_batch(self):
+        """
+        Submit a task running the queued calls to the scheduler.
+        """
+        try:
+            task = self._scheduler.submit(self._run_batch)
+        except RuntimeError:
+            # The scheduler is closed, so the calls would never run.
+            self.cancel_pending()
+            return
+        task.add_done_callback(self._on_batch_done)
+
+    def _on_batch_done(self, task):
+        """
+        Cancel the queued calls if the scheduler dropped the batch, e.g. when
+        it was closed.
+        """
+        if task.cancelled():
+            self.cancel_pending()
+
+    def _run_batch(self):
+        """
+        Run the queued calls until the scheduler's tick budget is spent, and
+        schedule the remaining calls.
+        """
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._batch_scheduled = False
+                    return
+                future, func = self._pending.popleft()
+
+            self._run_call(future, func)
+
+            if self._scheduler.is_budget_spent():
+                break
+
+        with self._lock:
+            if not self._pending:
+                self._batch_scheduled = False
+                return
+        self._schedule_batch()
+
+    def _run_call(self, future, func):
+        """
+        Run a call and store its outcome in its future.
+        """
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func()
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
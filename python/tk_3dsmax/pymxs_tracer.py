@@ -0,0 +1,329 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Opt-in tracing of the calls made to 3ds Max through ``pymxs.runtime``.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pymxs
+
+# MaxScript classes of the runtime values that are functions.
+FUNCTION_CLASSES = frozenset(
+    ["Primitive", "MappedPrimitive", "Generic", "MappedGeneric", "MAXScriptFunction"]
+)
+
+
+class PymxsTracer(object):
+    """
+    Measures the attribute accesses and function calls made on ``pymxs.runtime``.
+
+    Once installed, the modules of this package, and the extra modules given to
+    :meth:`install`, see a proxy of ``pymxs.runtime`` timing every attribute
+    read and write and every call to a MaxScript or Python function read from
+    the runtime. ``pymxs.runtime`` itself is left alone, so the scripts of
+    other tools never get the traced wrappers. Attributes of the values
+    returned by the runtime, like the methods of ``pymxs.runtime.callbacks``,
+    are not traced.
+
+    Timings are aggregated per operation, e.g. ``call execute``, and per
+    operation and calling file and line, as counts, total and maximum times and
+    histograms with power of two microsecond buckets.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty tracer.
+        """
+        self._lock = threading.Lock()
+        self._runtime = None
+        self._proxy = None
+        self._module_proxy = None
+        self._modules = []
+        self._function_names = {}
+        # operation -> _Stats
+        self._operations = {}
+        # (operation, file name, line) -> _Stats
+        self._call_sites = {}
+
+    @property
+    def installed(self):
+        """
+        True if the tracer is installed.
+        """
+        return self._proxy is not None
+
+    def install(self, modules=None):
+        """
+        Make the modules of this package use the tracing proxy.
+
+        The module level references to ``pymxs`` and to ``pymxs.runtime`` are
+        replaced by proxies. Modules imported later, like the hooks, are not
+        traced.
+
+        :param list modules: Extra modules to trace, e.g. the engine module.
+        """
+        if self._proxy is not None:
+            return
+
+        self._runtime = pymxs.runtime
+        self._proxy = _TracedRuntime(self._runtime, self)
+        self._module_proxy = _TracedModule(pymxs, self._proxy)
+
+        package = __name__.rsplit(".", 1)[0] + "."
+        self._modules = [
+            module
+            for name, module in list(sys.modules.items())
+            if module is not None and name.startswith(package) and name != __name__
+        ]
+        self._modules.extend(modules or [])
+        self._rebind([(pymxs, self._module_proxy), (self._runtime, self._proxy)])
+
+    def uninstall(self):
+        """
+        Restore the original references to ``pymxs`` and ``pymxs.runtime``.
+        """
+        if self._proxy is None:
+            return
+
+        self._rebind([(self._module_proxy, pymxs), (self._proxy, self._runtime)])
+        self._proxy = None
+        self._module_proxy = None
+        self._modules = []
+
+    def reset(self):
+        """
+        Drop all the measures collected so far.
+        """
+        with self._lock:
+            self._operations = {}
+            self._call_sites = {}
+
+    def format_report(self, limit=20):
+        """
+        Format the aggregated measures.
+
+        :param int limit: Maximum number of operations and call sites listed,
+            sorted by total time.
+        :returns: The report as a string.
+        """
+        with self._lock:
+            operations = list(self._operations.items())
+            call_sites = list(self._call_sites.items())
+
+        lines = ["pymxs trace, by operation:"]
+        lines.extend(_format_stats(operations, limit, lambda key: key))
+        lines.append("pymxs trace, by call site:")
+        lines.extend(
+            _format_stats(
+                call_sites, limit, lambda key: "%s (%s:%d)" % (key[0], key[1], key[2])
+            )
+        )
+        return "\n".join(lines)
+
+    def is_function(self, name, value):
+        """
+        Check if a value read from the runtime is a function worth timing.
+
+        The result is cached per attribute name.
+
+        :param str name: Name of the attribute.
+        :param value: Value of the attribute.
+        """
+        is_function = self._function_names.get(name)
+        if is_function is None:
+            if isinstance(value, pymxs.MXSWrapperBase):
+                try:
+                    is_function = str(self._runtime.classOf(value)) in FUNCTION_CLASSES
+                except Exception:
+                    is_function = False
+            else:
+                is_function = callable(value)
+            self._function_names[name] = is_function
+        return is_function
+
+    def record(self, operation, elapsed, frame):
+        """
+        Record the time taken by an operation.
+
+        :param str operation: Name of the operation.
+        :param float elapsed: Time taken, in seconds.
+        :param frame: Frame of the caller.
+        """
+        call_site = (
+            operation,
+            os.path.basename(frame.f_code.co_filename),
+            frame.f_lineno,
+        )
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = _Stats()
+            stats.add(elapsed)
+
+            stats = self._call_sites.get(call_site)
+            if stats is None:
+                stats = self._call_sites[call_site] = _Stats()
+            stats.add(elapsed)
+
+    def _rebind(self, replacements):
+        """
+        Replace the module level references to some values in the traced
+        modules.
+
+        :param list replacements: List of (old value, new value) tuples.
+        """
+        replacements = dict(
+            (id(old_value), new_value) for old_value, new_value in replacements
+        )
+        for module in self._modules:
+            for attr_name, value in list(vars(module).items()):
+                if id(value) in replacements:
+                    setattr(module, attr_name, replacements[id(value)])
+
+
+class _Stats(object):
+    """
+    Aggregated timings of an operation.
+    """
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Bucket n counts the timings below 2^n microseconds.
+        self.buckets = {}
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        bucket = int(elapsed * 1000000).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+
+class _TracedModule(object):
+    """
+    Proxy of the ``pymxs`` module whose ``runtime`` is the tracing proxy.
+    """
+
+    def __init__(self, module, runtime):
+        self.__dict__.update(vars(module))
+        self.runtime = runtime
+
+
+class _TracedRuntime(object):
+    """
+    Proxy of ``pymxs.runtime`` timing attribute accesses.
+    """
+
+    __slots__ = ("_runtime", "_tracer")
+
+    def __init__(self, runtime, tracer):
+        object.__setattr__(self, "_runtime", runtime)
+        object.__setattr__(self, "_tracer", tracer)
+
+    def __getattr__(self, name):
+        runtime = object.__getattribute__(self, "_runtime")
+        tracer = object.__getattribute__(self, "_tracer")
+
+        start = time.perf_counter()
+        value = getattr(runtime, name)
+        tracer.record("get " + name, time.perf_counter() - start, sys._getframe(1))
+
+        if tracer.is_function(name, value):
+            return _TracedFunction(value, name, tracer)
+        return value
+
+    def __setattr__(self, name, value):
+        runtime = object.__getattribute__(self, "_runtime")
+        tracer = object.__getattribute__(self, "_tracer")
+
+        start = time.perf_counter()
+        setattr(runtime, name, _unwrap(value))
+        tracer.record("set " + name, time.perf_counter() - start, sys._getframe(1))
+
+    def __dir__(self):
+        return dir(object.__getattribute__(self, "_runtime"))
+
+
+class _TracedFunction(object):
+    """
+    Wrapper of a function read from ``pymxs.runtime`` timing its calls.
+    """
+
+    __slots__ = ("_function", "_name", "_tracer")
+
+    def __init__(self, function, name, tracer):
+        self._function = function
+        self._name = name
+        self._tracer = tracer
+
+    def __call__(self, *args, **kwargs):
+        args = [_unwrap(arg) for arg in args]
+        kwargs = dict((key, _unwrap(value)) for key, value in kwargs.items())
+
+        start = time.perf_counter()
+        try:
+            return self._function(*args, **kwargs)
+        finally:
+            self._tracer.record(
+                "call " + self._name, time.perf_counter() - start, sys._getframe(1)
+            )
+
+    def __getattr__(self, name):
+        return getattr(self._function, name)
+
+
+def _unwrap(value):
+    """
+    Return the function wrapped by a :class:`_TracedFunction`, so pymxs never
+    receives the wrapper.
+    """
+    if isinstance(value, _TracedFunction):
+        return value._function
+    return value
+
+
+def _format_stats(items, limit, format_key):
+    """
+    Format aggregated timings, sorted by total time.
+
+    :param list items: List of (key, :class:`_Stats`) tuples.
+    :param int limit: Maximum number of lines.
+    :param callable format_key: Function formatting a key.
+    :returns: List of lines.
+    """
+    items.sort(key=lambda item: item[1].total, reverse=True)
+    lines = []
+    for key, stats in items[:limit]:
+        histogram = " ".join(
+            "<%dus:%d" % (1 << bucket, stats.buckets[bucket])
+            for bucket in sorted(stats.buckets)
+        )
+        lines.append(
+            "  %s: %d calls, %.3f ms total, %.3f ms max [%s]"
+            % (
+                format_key(key),
+                stats.count,
+                stats.total * 1000,
+                stats.max * 1000,
+                histogram,
+            )
+        )
+    if len(items) > limit:
+        lines.append("  ... %d more" % (len(items) - limit))
+    return lines
@@ -0,0 +1,27 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Qt helpers shared by the engine modules.
+"""
+
+from sgtk.platform.qt import QtCore
+
+
+def start_timer(timer):
+    """
+    Start a timer from any thread.
+
+    The timer can only be started from the thread it lives in, so this is
+    queued when called from a background thread.
+
+    :param timer: :class:`QtCore.QTimer` to start.
+    """
+    QtCore.QMetaObject.invokeMethod(timer, "start", QtCore.Qt.AutoConnection)
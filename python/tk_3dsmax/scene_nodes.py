@@ -0,0 +1,183 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Counters of the nodes in the current 3ds Max scene.
+"""
+
+import collections
+
+import pymxs
+
+# Number of nodes in the scene, of geometry nodes and of nodes without a parent.
+NodeCounts = collections.namedtuple("NodeCounts", ["nodes", "geometry", "top_level"])
+
+
+class SceneNodeCounters(object):
+    """
+    Keeps count of the nodes in the current scene.
+
+    The counters live in a MaxScript struct updated by the ``#nodeCreated`` and
+    ``#nodePreDelete`` notifications, so keeping them current never calls into
+    Python. While a file is opened, merged or imported, or the scene is reset,
+    the notifications are ignored and the counters are recounted the next time
+    they are read.
+
+    The number of top level nodes follows ``#nodeLinked`` and ``#nodeUnlinked``
+    as well. Undoing or redoing an operation flags all the counters so they are
+    recounted on the next read, since 3ds Max doesn't send the node
+    notifications for the nodes it restores.
+    Nodes whose object changes between geometry and another class, e.g. when a
+    shape is converted to a mesh, are only accounted for by the next recount.
+    """
+
+    # MaxScript global holding the counters.
+    COUNTERS_VAR = "sgtk_scene_nodes"
+    # Id of the notification callbacks.
+    CALLBACK_ID = "sgtk_scene_nodes"
+
+    # Notifications pausing the counters until the matching post notification.
+    SUSPENDING_NOTIFICATIONS = (
+        ("filePreOpen", "filePostOpen"),
+        ("filePreMerge", "filePostMerge"),
+        ("preImport", "postImport"),
+        ("systemPreReset", "systemPostReset"),
+        ("systemPreNew", "systemPostNew"),
+    )
+
+    def install(self):
+        """
+        Define the counters and register the notification callbacks updating them.
+        """
+        pymxs.runtime.execute(self._install_script())
+
+    def uninstall(self):
+        """
+        Remove the notification callbacks and release the counters.
+        """
+        pymxs.runtime.callbacks.removeScripts(id=pymxs.runtime.Name(self.CALLBACK_ID))
+        setattr(pymxs.runtime, self.COUNTERS_VAR, None)
+
+    def get_counts(self):
+        """
+        :returns: :class:`NodeCounts` for the current scene.
+        """
+        counts = getattr(pymxs.runtime, self.COUNTERS_VAR).counts()
+        return NodeCounts(int(counts[0]), int(counts[1]), int(counts[2]))
+
+    def is_empty(self):
+        """
+        :returns: True if the scene has no nodes.
+        """
+        return int(getattr(pymxs.runtime, self.COUNTERS_VAR).nodeCount()) == 0
+
+    def _install_script(self):
+        """
+        MaxScript source defining the counters and registering the callbacks.
+        """
+        callbacks = [
+            ("nodeCreated", "created"),
+            ("nodePreDelete", "deleting"),
+            ("nodeLinked", "linked"),
+            ("nodeUnlinked", "unlinked"),
+            # Undoing or redoing doesn't send #nodeCreated for the nodes it
+            # restores.
+            ("sceneUndo", "invalidate"),
+            ("sceneRedo", "invalidate"),
+        ]
+        for pre_notification, post_notification in self.SUSPENDING_NOTIFICATIONS:
+            callbacks.append((pre_notification, "suspend"))
+            callbacks.append((post_notification, "resume"))
+
+        script = """
+            struct sgtk_SceneNodeCounters
+            (
+                node_count = 0,
+                geometry_count = 0,
+                top_level_count = 0,
+                dirty = true,
+                suspended = 0,
+
+                fn recount =
+                (
+                    node_count = objects.count
+                    geometry_count = geometry.count
+                    top_level_count = rootNode.children.count
+                    dirty = false
+                ),
+                fn created =
+                (
+                    local node = callbacks.notificationParam()
+                    if suspended == 0 and not dirty do
+                    (
+                        node_count += 1
+                        if isKindOf node GeometryClass do geometry_count += 1
+                        if node.parent == undefined do top_level_count += 1
+                    )
+                ),
+                fn deleting =
+                (
+                    local node = callbacks.notificationParam()
+                    if suspended == 0 and not dirty do
+                    (
+                        node_count -= 1
+                        if isKindOf node GeometryClass do geometry_count -= 1
+                        -- The children of the node are moved to its parent.
+                        if node.parent == undefined do
+                            top_level_count += node.children.count - 1
+                    )
+                ),
+                fn linked =
+                (
+                    if suspended == 0 and not dirty do top_level_count -= 1
+                ),
+                fn unlinked =
+                (
+                    if suspended == 0 and not dirty do top_level_count += 1
+                ),
+                fn invalidate =
+                (
+                    dirty = true
+                ),
+                fn suspend =
+                (
+                    suspended += 1
+                ),
+                fn resume =
+                (
+                    if suspended > 0 do suspended -= 1
+                    dirty = true
+                ),
+                fn nodeCount =
+                (
+                    if dirty or suspended > 0 do recount()
+                    node_count
+                ),
+                fn counts =
+                (
+                    if dirty or suspended > 0 do recount()
+                    #(node_count, geometry_count, top_level_count)
+                )
+            )
+            global {counters_var} = sgtk_SceneNodeCounters()
+            callbacks.removeScripts id:#{callback_id}
+        """.format(counters_var=self.COUNTERS_VAR, callback_id=self.CALLBACK_ID)
+        # The functions are registered as values, so 3ds Max doesn't compile a
+        # script each time it sends a notification.
+        for notification, function in callbacks:
+            script += """
+            callbacks.addScript #{notification} {counters_var}.{function} id:#{callback_id}
+            """.format(
+                notification=notification,
+                counters_var=self.COUNTERS_VAR,
+                function=function,
+                callback_id=self.CALLBACK_ID,
+            )
+        return script
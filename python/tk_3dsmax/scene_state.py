@@ -0,0 +1,169 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Cache of the state of the current 3ds Max scene.
+"""
+
+import os
+
+import pymxs
+
+SESSION_PATH = "session_path"
+PROJECT_FOLDER = "project_folder"
+FRAME_RANGE = "frame_range"
+
+ALL_VALUES = (SESSION_PATH, PROJECT_FOLDER, FRAME_RANGE)
+
+# Values to read again after each notification.
+INVALIDATING_NOTIFICATIONS = {
+    "filePostOpen": ALL_VALUES,
+    "filePostSave": (SESSION_PATH,),
+    "systemPostReset": ALL_VALUES,
+    "systemPostNew": ALL_VALUES,
+    "animationRangeChange": (FRAME_RANGE,),
+    "postProjectFolderChange": (PROJECT_FOLDER,),
+}
+
+
+class SceneState(object):
+    """
+    Caches values describing the current scene that the hooks read repeatedly.
+
+    Values are read from 3ds Max the first time they are requested and kept
+    until a 3ds Max notification, see :data:`INVALIDATING_NOTIFICATIONS`,
+    reports that they may have changed. A value is never cached if one of the
+    notifications it depends on couldn't be registered.
+    """
+
+    def __init__(self, logger, notifications):
+        """
+        :param logger: Logger used to report notifications that can't be registered.
+        :param notifications: :class:`NotificationDispatcher` sending the
+            notifications invalidating the cache.
+        """
+        self._logger = logger
+        self._notifications = notifications
+        self._subscriptions = []
+        self._values = {}
+        # Values kept current by notifications.
+        self._cacheable = set()
+
+    def install(self):
+        """
+        Subscribe to the notifications invalidating the cache.
+        """
+        self._cacheable = set(ALL_VALUES)
+        for notification, names in INVALIDATING_NOTIFICATIONS.items():
+            try:
+                self._subscriptions.append(
+                    self._notifications.subscribe(notification, self._on_notification)
+                )
+            except RuntimeError as e:
+                self._logger.debug(
+                    "Scene values %s won't be cached: %s" % (", ".join(names), e)
+                )
+                self._cacheable.difference_update(names)
+
+    def uninstall(self):
+        """
+        Unsubscribe from the notifications and clear the cache.
+        """
+        for subscription in self._subscriptions:
+            subscription.unsubscribe()
+        self._subscriptions = []
+        self._cacheable = set()
+        self._values = {}
+
+    def invalidate(self, *names):
+        """
+        Drop cached values so they are read from 3ds Max the next time.
+
+        :param names: Names of the values to drop. Drops all values if none are given.
+        """
+        for name in names or ALL_VALUES:
+            self._values.pop(name, None)
+
+    def get_session_path(self):
+        """
+        :returns: Path to the current scene file or None if it was never saved.
+        """
+        return self._get(SESSION_PATH, _read_session_path)
+
+    def get_project_folder(self):
+        """
+        :returns: Path to the current project folder.
+        """
+        return self._get(
+            PROJECT_FOLDER, lambda: pymxs.runtime.pathConfig.getCurrentProjectFolder()
+        )
+
+    def set_project_folder(self, path):
+        """
+        Set the current project folder.
+
+        :param str path: Path to the project folder.
+        """
+        pymxs.runtime.pathConfig.setCurrentProjectFolder(path)
+        self.invalidate(PROJECT_FOLDER)
+
+    def get_frame_range(self):
+        """
+        :returns: Tuple of the first and last frames of the animation range.
+        """
+        return self._get(FRAME_RANGE, _read_frame_range)
+
+    def set_frame_range(self, in_frame, out_frame):
+        """
+        Set the animation range.
+
+        :param int in_frame: First frame.
+        :param int out_frame: Last frame.
+        """
+        pymxs.runtime.animationRange = pymxs.runtime.interval(in_frame, out_frame)
+        self.invalidate(FRAME_RANGE)
+
+    def _get(self, name, reader):
+        """
+        Return a cached value, reading it from 3ds Max if needed.
+        """
+        if name in self._values:
+            return self._values[name]
+
+        value = reader()
+        if name in self._cacheable:
+            self._values[name] = value
+        return value
+
+    def _on_notification(self, event):
+        """
+        Called when a notification invalidating the cache is sent.
+
+        :param event: :data:`NotificationEvent` of the notification.
+        """
+        self.invalidate(*INVALIDATING_NOTIFICATIONS.get(event.name, ALL_VALUES))
+
+
+def _read_session_path():
+    """
+    Read the path to the current scene file from 3ds Max.
+    """
+    if pymxs.runtime.maxFilePath and pymxs.runtime.maxFileName:
+        return os.path.join(pymxs.runtime.maxFilePath, pymxs.runtime.maxFileName)
+    else:
+        return None
+
+
+def _read_frame_range():
+    """
+    Read the animation range from 3ds Max.
+    """
+    animation_range = pymxs.runtime.animationRange
+    return (int(animation_range.start.frame), int(animation_range.end.frame))
@@ -0,0 +1,151 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Scheduler running the commands listed in the 'run_at_startup' setting.
+"""
+
+import heapq
+import itertools
+import time
+
+from sgtk.platform.qt import QtCore
+
+from .main_thread_scheduler import PRIORITY_LOW
+
+
+class StartupCommandScheduler(object):
+    """
+    Runs startup commands one at a time, when 3ds Max is idle.
+
+    Commands run by decreasing priority, and in the order they were added for
+    the same priority. Without a :class:`MainThreadScheduler`, each command is
+    run from its own event loop iteration. Through the scheduler, commands may
+    run back to back within the time budget of one of its ticks, and 3ds Max
+    repaints and handles user input once the budget is spent.
+
+    When ``deferred`` is False, e.g. when 3ds Max runs without a UI, the
+    commands run as soon as :meth:`start` is called instead.
+    """
+
+    def __init__(self, logger, deferred=True, scheduler=None):
+        """
+        :param logger: Logger used to report the commands run.
+        :param deferred: Run the commands from the event loop.
+        :param scheduler: :class:`MainThreadScheduler` running the commands at
+            low priority. A Qt timer runs them if None.
+        """
+        self._logger = logger
+        self._deferred = deferred
+        self._scheduler = scheduler
+        # (-priority, insertion order, label, callback)
+        self._queue = []
+        self._counter = itertools.count()
+        self._started = False
+        self._start_time = None
+        self._on_finished = None
+
+    def add(self, label, callback, priority=0):
+        """
+        Queue a command.
+
+        :param label: Name of the command in the log.
+        :param callback: Callable running the command.
+        :param priority: Commands with a higher priority run first.
+        """
+        heapq.heappush(self._queue, (-priority, next(self._counter), label, callback))
+
+    def start(self, on_finished=None):
+        """
+        Start running the queued commands.
+
+        :param on_finished: Called without arguments once all the commands ran.
+        """
+        if self._started:
+            return
+        self._started = True
+        self._start_time = time.time()
+        self._on_finished = on_finished
+        if not self._queue:
+            self._finish()
+            return
+        if self._deferred:
+            self._schedule_next()
+        else:
+            while self._queue:
+                self._run_next()
+
+    def cancel(self):
+        """
+        Drop the commands that didn't run yet.
+        """
+        if self._queue:
+            self._logger.debug(
+                "Cancelling %d pending startup commands." % len(self._queue)
+            )
+        self._queue = []
+        self._on_finished = None
+
+    @property
+    def pending_count(self):
+        """
+        Number of commands that didn't run yet.
+        """
+        return len(self._queue)
+
+    def _schedule_next(self):
+        """
+        Run the next command from the scheduler, or from the next event loop
+        iteration without a scheduler.
+        """
+        if self._scheduler is not None:
+            self._scheduler.submit(self._run_next, priority=PRIORITY_LOW)
+        else:
+            QtCore.QTimer.singleShot(0, self._run_next)
+
+    def _run_next(self):
+        """
+        Run the command with the highest priority and schedule the next one.
+        """
+        if not self._queue:
+            return
+
+        _, _, label, callback = heapq.heappop(self._queue)
+        start = time.time()
+        self._logger.debug(
+            "Startup command %s started %.3fs after the engine startup."
+            % (label, start - self._start_time)
+        )
+        try:
+            callback()
+        except Exception:
+            self._logger.exception("Startup command %s failed." % label)
+        finish = time.time()
+        self._logger.debug(
+            "Startup command %s finished in %.3fs." % (label, finish - start)
+        )
+
+        if not self._queue:
+            self._logger.debug(
+                "Startup commands finished %.3fs after the engine startup."
+                % (finish - self._start_time)
+            )
+            self._finish()
+        elif self._deferred:
+            self._schedule_next()
+
+    def _finish(self):
+        """
+        Notify that all the commands ran.
+        """
+        on_finished = self._on_finished
+        self._on_finished = None
+        if on_finished is not None:
+            on_finished()
@@ -0,0 +1,257 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Profiler of the engine startup phases and of the initialization of the apps.
+"""
+
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import time
+
+
+class _Phase(object):
+    """
+    Timed phase of the startup.
+    """
+
+    def __init__(self, name, parent, start):
+        self.name = name
+        self.parent = parent
+        self.start = start
+        self.end = None
+        self.profile = None
+
+    @property
+    def duration(self):
+        return (self.end or time.time()) - self.start
+
+
+class StartupProfiler(object):
+    """
+    Records the timeline of the engine startup.
+
+    Phases are opened with :meth:`begin` and closed with :meth:`end`, or
+    wrapped with :meth:`phase`. A phase opened while another one is open is
+    recorded as its child. :meth:`install_app_hooks` times the creation and
+    the ``init_app`` call of each app loaded by the core.
+
+    When ``cprofile`` is enabled, each top-level phase is profiled with
+    :mod:`cProfile` and the profile of the slowest one is kept.
+
+    :meth:`finish` writes the timeline as JSON, with the offsets and
+    durations of the phases in seconds.
+    """
+
+    def __init__(self, start_time, logger, cprofile=False):
+        """
+        :param float start_time: Time the engine started, used as the origin of
+            the timeline.
+        :param logger: Logger used to report the timeline.
+        :param bool cprofile: Profile the top-level phases.
+        """
+        self._start_time = start_time
+        self._logger = logger
+        self._cprofile = cprofile
+        self._phases = []
+        self._open_phases = []
+        self._original_get_application = None
+        self._finished = False
+
+    def begin(self, name, start=None):
+        """
+        Open a phase.
+
+        :param str name: Name of the phase.
+        :param float start: Time the phase started, now if None.
+        """
+        parent = self._open_phases[-1].name if self._open_phases else None
+        phase = _Phase(name, parent, start or time.time())
+        if self._cprofile and parent is None:
+            phase.profile = cProfile.Profile()
+            try:
+                phase.profile.enable()
+            except ValueError as e:
+                # Another profiler is active.
+                self._logger.debug("Unable to profile phase %s: %s" % (name, e))
+                phase.profile = None
+        self._phases.append(phase)
+        self._open_phases.append(phase)
+
+    def end(self, name):
+        """
+        Close a phase, along with the phases opened after it.
+
+        :param str name: Name of the phase.
+        """
+        if name not in [phase.name for phase in self._open_phases]:
+            return
+        while self._open_phases:
+            phase = self._open_phases.pop()
+            phase.end = time.time()
+            if phase.profile is not None:
+                phase.profile.disable()
+            if phase.name == name:
+                return
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Context manager timing a phase.
+
+        :param str name: Name of the phase.
+        """
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def record(self, name, start, end):
+        """
+        Record a phase that was timed elsewhere.
+
+        :param str name: Name of the phase.
+        :param float start: Time the phase started.
+        :param float end: Time the phase ended.
+        """
+        parent = self._open_phases[-1].name if self._open_phases else None
+        phase = _Phase(name, parent, start)
+        phase.end = end
+        self._phases.append(phase)
+
+    def wrap(self, name, func):
+        """
+        Wrap a function so each call is timed as a phase.
+
+        :param str name: Name of the phase.
+        :param func: Function to wrap.
+        :returns: The wrapped function.
+        """
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def install_app_hooks(self):
+        """
+        Time the creation and the initialization of the apps.
+
+        The core creates the apps with
+        ``sgtk.platform.application.get_application``, which is wrapped until
+        :meth:`uninstall_app_hooks` is called.
+        """
+        from sgtk.platform import application
+
+        original = getattr(application, "get_application", None)
+        if original is None or self._original_get_application is not None:
+            return
+
+        @functools.wraps(original)
+        def get_application(*args, **kwargs):
+            # get_application(engine, app_folder, descriptor, settings,
+            #                 instance_name, env)
+            instance_name = kwargs.get("instance_name")
+            if instance_name is None:
+                instance_name = args[4] if len(args) > 4 else "app"
+            with self.phase("load %s" % instance_name):
+                app = original(*args, **kwargs)
+            app.init_app = self.wrap("init %s" % instance_name, app.init_app)
+            return app
+
+        self._original_get_application = original
+        application.get_application = get_application
+
+    def uninstall_app_hooks(self):
+        """
+        Stop timing the creation of the apps.
+        """
+        from sgtk.platform import application
+
+        if self._original_get_application is not None:
+            application.get_application = self._original_get_application
+            self._original_get_application = None
+
+    def finish(self, path):
+        """
+        Close the open phases and write the timeline.
+
+        :param str path: Path to the JSON file to write. The profile of the
+            slowest phase is written next to it, with a ``.prof`` extension.
+        :returns: Path to the written timeline, or None if it was already
+            written or couldn't be written.
+        """
+        if self._finished:
+            return None
+        self._finished = True
+        self.uninstall_app_hooks()
+        if self._open_phases:
+            self.end(self._open_phases[0].name)
+
+        top_level = [phase for phase in self._phases if phase.parent is None]
+        slowest = max(top_level, key=lambda phase: phase.duration, default=None)
+
+        profile_path = None
+        profiled = [phase for phase in top_level if phase.profile is not None]
+        if profiled:
+            slowest_profiled = max(profiled, key=lambda phase: phase.duration)
+            profile_path = os.path.splitext(path)[0] + ".prof"
+            try:
+                slowest_profiled.profile.dump_stats(profile_path)
+            except (IOError, OSError) as e:
+                self._logger.warning(
+                    "Unable to write the startup profile %s: %s" % (profile_path, e)
+                )
+                profile_path = None
+            else:
+                self._logger.info(
+                    "Profile of the %s startup phase written to %s"
+                    % (slowest_profiled.name, profile_path)
+                )
+            for phase in profiled:
+                phase.profile = None
+
+        timeline = {
+            "start_time": self._start_time,
+            "duration": time.time() - self._start_time,
+            "slowest_phase": slowest.name if slowest else None,
+            "profile": profile_path,
+            "phases": [
+                {
+                    "name": phase.name,
+                    "parent": phase.parent,
+                    "start": phase.start - self._start_time,
+                    "duration": phase.duration,
+                }
+                for phase in self._phases
+            ],
+        }
+        for phase in top_level:
+            self._logger.debug(
+                "Startup phase %s took %.3fs." % (phase.name, phase.duration)
+            )
+
+        try:
+            with open(path, "w") as f:
+                json.dump(timeline, f, indent=2)
+        except (IOError, OSError) as e:
+            self._logger.warning(
+                "Unable to write the startup timeline %s: %s" % (path, e)
+            )
+            return None
+
+        self._logger.info("Startup timeline written to %s" % path)
+        return path
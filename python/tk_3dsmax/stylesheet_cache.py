@@ -0,0 +1,79 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Cache of the processed stylesheets applied to the Toolkit dialogs and panels.
+"""
+
+import os
+import threading
+
+
+class StylesheetCache(object):
+    """
+    Keeps the processed content of the qss files of the bundles.
+
+    A file is read and its tokens are resolved the first time it is requested.
+    The processed stylesheet is then reused until the modification time or the
+    size of the file changes, or until the file is invalidated.
+    """
+
+    def __init__(self, resolve_tokens, logger):
+        """
+        :param resolve_tokens: Callable taking the content of a qss file and
+            returning it with its tokens resolved.
+        :param logger: Logger used to report the files read.
+        """
+        self._resolve_tokens = resolve_tokens
+        self._logger = logger
+        # path -> (modification time, size, processed stylesheet)
+        self._stylesheets = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """
+        Get the processed stylesheet of a qss file.
+
+        :param path: Path to the qss file.
+        :returns: The processed stylesheet or None if the file doesn't exist.
+        :raises IOError: If the file exists but can't be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # The file doesn't exist, so there is nothing to apply.
+            with self._lock:
+                self._stylesheets.pop(path, None)
+            return None
+
+        with self._lock:
+            entry = self._stylesheets.get(path)
+        if entry and entry[0] == stat.st_mtime and entry[1] == stat.st_size:
+            return entry[2]
+
+        self._logger.debug("Reading style sheet file '%s'" % path)
+        with open(path, "rt") as f:
+            stylesheet = self._resolve_tokens(f.read())
+
+        with self._lock:
+            self._stylesheets[path] = (stat.st_mtime, stat.st_size, stylesheet)
+        return stylesheet
+
+    def invalidate(self, path=None):
+        """
+        Drop a cached stylesheet so the file is read again on the next request.
+
+        :param path: Path to the qss file, or None to drop all the stylesheets.
+        """
+        with self._lock:
+            if path is None:
+                self._stylesheets.clear()
+            else:
+                self._stylesheets.pop(path, None)
@@ -0,0 +1,101 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Setup of the unit tests of the tk_3dsmax modules that don't need 3ds Max.
+
+The modules are imported without running the package's ``__init__``, which
+imports the menu generators. Outside of 3ds Max, ``pymxs`` and the Qt binding
+of ``sgtk`` are replaced by the fakes below. The fake Qt timers never fire on
+their own: the tests fire them with ``timer.timeout.emit()``.
+"""
+
+import os
+import sys
+import types
+
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeSignal(object):
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class FakeTimer(object):
+    def __init__(self):
+        self.timeout = FakeSignal()
+        self.interval = 0
+        self.single_shot = False
+        self.active = False
+
+    def setSingleShot(self, single_shot):
+        self.single_shot = single_shot
+
+    def setInterval(self, interval):
+        self.interval = interval
+
+    def start(self, *args):
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def isActive(self):
+        return self.active
+
+
+class FakeMetaObject(object):
+    @staticmethod
+    def invokeMethod(obj, name, connection_type):
+        getattr(obj, name)()
+
+
+def _install_fakes():
+    try:
+        import pymxs  # noqa: F401
+    except ImportError:
+        pymxs = types.ModuleType("pymxs")
+        pymxs.runtime = types.SimpleNamespace()
+        sys.modules["pymxs"] = pymxs
+
+    try:
+        import sgtk  # noqa: F401
+    except ImportError:
+        qt_core = types.SimpleNamespace(
+            QTimer=FakeTimer,
+            QMetaObject=FakeMetaObject,
+            Qt=types.SimpleNamespace(AutoConnection=0),
+        )
+        sgtk = types.ModuleType("sgtk")
+        sgtk.platform = types.ModuleType("sgtk.platform")
+        sgtk.platform.qt = types.ModuleType("sgtk.platform.qt")
+        sgtk.platform.qt.QtCore = qt_core
+        sgtk.platform.qt.QtGui = types.SimpleNamespace()
+        sgtk.platform.application = types.ModuleType("sgtk.platform.application")
+        sys.modules["sgtk"] = sgtk
+        sys.modules["sgtk.platform"] = sgtk.platform
+        sys.modules["sgtk.platform.qt"] = sgtk.platform.qt
+        sys.modules["sgtk.platform.application"] = sgtk.platform.application
+
+    # Package whose modules are imported one by one.
+    package = types.ModuleType("tk_3dsmax")
+    package.__path__ = [os.path.join(repo_root, "python", "tk_3dsmax")]
+    sys.modules["tk_3dsmax"] = package
+
+
+_install_fakes()
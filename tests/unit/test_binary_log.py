@@ -0,0 +1,122 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import logging
+import os
+import sys
+import time
+
+import pytest
+
+from tk_3dsmax import binary_log_reader
+from tk_3dsmax.binary_log import MIN_FILE_SIZE, BinaryLog
+
+
+def _record(message, name="sgtk.env.tk-3dsmax", level=logging.INFO, created=None):
+    record = logging.LogRecord(name, level, __file__, 1, message, None, None)
+    if created is not None:
+        record.created = created
+    return record
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return os.path.join(str(tmp_path), "tk-3dsmax.sgtklog")
+
+
+def _read(path, **kwargs):
+    return list(binary_log_reader.iter_records(path, **kwargs))
+
+
+def test_round_trip(log_path):
+    log = BinaryLog(log_path, MIN_FILE_SIZE, 2)
+    log.write(_record("first", created=100.0))
+    log.write(_record("second", "sgtk.env.tk-multi-publish2", logging.ERROR, 200.0))
+    log.write(_record("third", "sgtk.env.tk-multi-publish2.hook", created=300.0))
+    log.close()
+
+    records = _read(log_path)
+    assert [record.message for record in records] == ["first", "second", "third"]
+    assert records[1].levelno == logging.ERROR
+    assert records[1].created == 200.0
+    assert records[1].thread == "MainThread"
+
+    assert [r.message for r in _read(log_path, min_level=logging.ERROR)] == ["second"]
+    assert [r.message for r in _read(log_path, start=150.0, end=250.0)] == ["second"]
+    assert [r.message for r in _read(log_path, start=400.0)] == []
+    assert [
+        r.message for r in _read(log_path, logger="sgtk.env.tk-multi-publish2")
+    ] == ["second", "third"]
+    assert _read(log_path, logger="sgtk.env.tk-multi") == []
+
+
+def test_records_keep_their_traceback(log_path):
+    log = BinaryLog(log_path, MIN_FILE_SIZE, 0)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record("failed", level=logging.ERROR)
+        record.exc_info = sys.exc_info()
+    log.write(record)
+    record = _record("stack")
+    record.stack_info = "Stack (most recent call last):\n  in test"
+    log.write(record)
+    log.close()
+
+    failed, stack = _read(log_path)
+    assert failed.message.startswith("failed\nTraceback")
+    assert "ValueError: boom" in failed.message
+    assert stack.message.endswith("in test")
+
+
+def test_rotation(log_path):
+    # Each record fills more than a third of the file.
+    message = "x" * (MIN_FILE_SIZE // 3)
+    log = BinaryLog(log_path, MIN_FILE_SIZE, 2)
+    for index in range(7):
+        log.write(_record("%d %s" % (index, message)))
+    log.close()
+
+    files = binary_log_reader.get_log_files(log_path)
+    assert files == [log_path + ".2", log_path + ".1", log_path]
+    messages = [r.message.split()[0] for path in files for r in _read(path)]
+    assert messages == ["2", "3", "4", "5", "6"]
+
+    # The file of the previous session is rotated when the log is opened.
+    BinaryLog(log_path, MIN_FILE_SIZE, 2).close()
+    assert [r.message.split()[0] for r in _read(log_path + ".1")] == ["6"]
+    assert _read(log_path) == []
+
+
+def test_old_session_files_are_removed(log_path):
+    root, ext = os.path.splitext(log_path)
+    now = time.time()
+    old_files = ["%s-%d%s" % (root, pid, ext) for pid in (11, 12, 13)]
+    old_files.append(old_files[0] + ".1")
+    for index, path in enumerate(old_files):
+        with open(path, "wb"):
+            pass
+        os.utime(path, (now - 100 * (index + 1), now - 100 * (index + 1)))
+
+    BinaryLog(log_path, MIN_FILE_SIZE, 2).close()
+    # The two most recent files are kept.
+    assert [os.path.exists(path) for path in old_files] == [True, True, False, False]
+
+
+def test_reader_command_line(log_path, capsys):
+    log = BinaryLog(log_path, MIN_FILE_SIZE, 1)
+    log.write(_record("kept", level=logging.WARNING))
+    log.write(_record("filtered"))
+    log.close()
+
+    assert binary_log_reader.main([log_path, "--level", "warning"]) == 0
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 1
+    assert output[0].endswith("WARNING [sgtk.env.tk-3dsmax] (MainThread) kept")
@@ -0,0 +1,81 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import unittest.mock as mock
+
+import pymxs
+
+from tk_3dsmax.callback_registry import CallbackRegistry
+
+
+def test_ids_are_stable_across_generations():
+    registry = CallbackRegistry()
+    ids = []
+    for _ in range(2):
+        with registry.new_generation():
+            generation_ids = []
+            for name in ("Publish...", "Publish...", "Load..."):
+                command_id = registry.make_command_id(name)
+                registry.register(command_id, name)
+                generation_ids.append(command_id)
+            ids.append(generation_ids)
+
+    assert ids[0] == ids[1]
+    assert ids[0][1] == ids[0][0] + "_2"
+    assert len(set(ids[0])) == 3
+    assert all(command_id.replace("_", "").isalnum() for command_id in ids[0])
+
+
+def test_end_generation_drops_entries_not_registered_again():
+    registry = CallbackRegistry()
+    with registry.new_generation():
+        registry.register("a", "first a")
+        registry.register("b", "first b")
+    with registry.new_generation():
+        registry.register("a", "second a")
+
+    assert len(registry) == 1
+    assert registry["a"] == "second a"
+    assert "b" not in registry
+    assert registry.get("b", "missing") == "missing"
+
+
+def test_dispatch():
+    logger = mock.Mock()
+    registry = CallbackRegistry(logger)
+    callback = mock.Mock()
+    with registry.new_generation():
+        registry.register("a", callback)
+
+    assert registry.dispatch("a") is True
+    callback.assert_called_once_with()
+    assert registry.dispatch("unknown") is False
+    logger.error.assert_called_once()
+
+
+def test_globals_are_released_with_their_generation():
+    registry = CallbackRegistry()
+    with registry.new_generation():
+        registry.register_dispatcher()
+        registry.register_global("sgtk_test_global", 1)
+    assert (
+        getattr(pymxs.runtime, CallbackRegistry.DISPATCH_FUNCTION) == registry.dispatch
+    )
+
+    with registry.new_generation():
+        registry.register_dispatcher()
+    assert getattr(pymxs.runtime, "sgtk_test_global") is None
+    assert (
+        getattr(pymxs.runtime, CallbackRegistry.DISPATCH_FUNCTION) == registry.dispatch
+    )
+
+    registry.clear()
+    assert len(registry) == 0
+    assert getattr(pymxs.runtime, CallbackRegistry.DISPATCH_FUNCTION) is None
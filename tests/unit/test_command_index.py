@@ -0,0 +1,73 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from tk_3dsmax.command_index import CommandIndex
+
+
+def _command(app=None, type=None):
+    properties = {}
+    if app is not None:
+        properties["app"] = app
+    if type is not None:
+        properties["type"] = type
+    return {"callback": lambda: None, "properties": properties}
+
+
+def _make_index():
+    publisher = object()
+    loader = object()
+    unloaded_app = object()
+    commands = {
+        "Publish...": _command(publisher),
+        "Publish Settings": _command(publisher, "context_menu"),
+        "Load...": _command(loader),
+        "Jump to Shotgun": _command(type="context_menu"),
+        "Orphan": _command(unloaded_app),
+    }
+    apps = {"tk-multi-publish2": publisher, "tk-multi-loader2": loader}
+    return CommandIndex(commands, apps), publisher, commands
+
+
+def test_app_instance_lookups():
+    index, publisher, commands = _make_index()
+
+    assert index.get_app_instance_name(publisher) == "tk-multi-publish2"
+    assert index.get_app_instance_name(object()) is None
+    assert list(index.get_app_instance_commands("tk-multi-publish2")) == [
+        "Publish...",
+        "Publish Settings",
+    ]
+    assert index.get_app_instance_commands("tk-multi-unknown") is None
+    assert index.has_app_instance_command("tk-multi-loader2", "Load...")
+    assert not index.has_app_instance_command("tk-multi-loader2", "Publish...")
+    assert not index.has_app_instance_command("tk-multi-unknown", "Load...")
+
+
+def test_command_lookups():
+    index, _, commands = _make_index()
+
+    assert index.get_command("Load...") is commands["Load..."]
+    assert index.get_command("Unknown") is None
+    assert index.get_command_names_by_type("context_menu") == [
+        "Publish Settings",
+        "Jump to Shotgun",
+    ]
+    assert index.get_command_names_by_type("default") == [
+        "Publish...",
+        "Load...",
+        "Orphan",
+    ]
+    assert index.get_command_names_by_type("panel") == []
+
+
+def test_command_names_by_type_returns_a_copy():
+    index, _, _ = _make_index()
+    index.get_command_names_by_type("context_menu").append("Other")
+    assert "Other" not in index.get_command_names_by_type("context_menu")
@@ -0,0 +1,124 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import json
+import os
+import unittest.mock as mock
+
+from tk_3dsmax.macro_manifest import MacroManifest
+
+MACRO_SOURCE = "macroScript sg_publish ( on execute do () )"
+
+
+def _touch_macro_file(folder, macro_name):
+    path = os.path.join(
+        str(folder), "Flow Production Tracking Menu Actions-%s.mcr" % macro_name
+    )
+    with open(path, "w") as fh:
+        fh.write(MACRO_SOURCE)
+
+
+def test_register_and_save(tmp_path):
+    manifest = MacroManifest(str(tmp_path), mock.Mock())
+    assert not manifest.is_defined("sg_publish", MACRO_SOURCE)
+
+    manifest.register("sg_publish", MACRO_SOURCE)
+    assert manifest.is_defined("sg_publish", MACRO_SOURCE)
+    assert not manifest.is_defined("sg_publish", MACRO_SOURCE + " ")
+
+    manifest.save()
+    with open(os.path.join(str(tmp_path), MacroManifest.FILE_NAME)) as fh:
+        assert list(json.load(fh)) == ["sg_publish"]
+
+
+def test_load_requires_the_macro_file(tmp_path):
+    manifest = MacroManifest(str(tmp_path), mock.Mock())
+    manifest.register("sg_publish", MACRO_SOURCE)
+    manifest.save()
+
+    # 3ds Max didn't write the macroscript file, so it must be defined again.
+    assert not MacroManifest(str(tmp_path), mock.Mock()).is_defined(
+        "sg_publish", MACRO_SOURCE
+    )
+
+    _touch_macro_file(tmp_path, "sg_publish")
+    assert MacroManifest(str(tmp_path), mock.Mock()).is_defined(
+        "sg_publish", MACRO_SOURCE
+    )
+
+
+def test_save_only_writes_changes(tmp_path):
+    manifest = MacroManifest(str(tmp_path), mock.Mock())
+    manifest.save()
+    assert not os.listdir(str(tmp_path))
+
+    manifest.register("sg_publish", MACRO_SOURCE)
+    manifest.save()
+    path = os.path.join(str(tmp_path), MacroManifest.FILE_NAME)
+    os.remove(path)
+    manifest.register("sg_publish", MACRO_SOURCE)
+    manifest.save()
+    assert not os.path.exists(path)
+
+
+def test_invalid_manifest_is_ignored(tmp_path):
+    with open(os.path.join(str(tmp_path), MacroManifest.FILE_NAME), "w") as fh:
+        fh.write("not json")
+    _touch_macro_file(tmp_path, "sg_publish")
+
+    manifest = MacroManifest(str(tmp_path), mock.Mock())
+    assert not manifest.is_defined("sg_publish", MACRO_SOURCE)
+
+
+def test_without_macros_folder():
+    manifest = MacroManifest(None, mock.Mock())
+    manifest.register("sg_publish", MACRO_SOURCE)
+    assert not manifest.is_defined("sg_publish", MACRO_SOURCE)
+    manifest.save()
+
+
+def _make_engine(folder):
+    from tk_3dsmax.callback_registry import CallbackRegistry
+
+    engine = mock.Mock()
+    engine.maxscript_objects = CallbackRegistry()
+    engine.macro_manifest = MacroManifest(str(folder), mock.Mock())
+    return engine
+
+
+def test_batch_registers_macros_once_executed(tmp_path):
+    import pymxs
+    from tk_3dsmax.maxscript import MaxScriptBatch
+
+    engine = _make_engine(tmp_path)
+    skipped = MaxScriptBatch()
+    skipped.add_action_to_menu(lambda: None, "Load...", "sgtk_menu", engine)
+
+    batch = MaxScriptBatch()
+    batch.add_action_to_menu(lambda: None, "Publish...", "sgtk_menu", engine)
+    with mock.patch.object(
+        pymxs, "runtime", mock.Mock(**{"execute.side_effect": RuntimeError})
+    ):
+        try:
+            batch.execute()
+        except RuntimeError:
+            pass
+    # Neither the skipped batch nor the failed one defined their macroscripts.
+    engine.macro_manifest.save()
+    manifest_path = os.path.join(str(tmp_path), MacroManifest.FILE_NAME)
+    assert not os.path.exists(manifest_path)
+
+    batch.add_action_to_menu(lambda: None, "Publish...", "sgtk_menu", engine)
+    with mock.patch.object(pymxs, "runtime", mock.Mock()) as runtime:
+        batch.execute()
+    assert "macroScript" in runtime.execute.call_args[0][0]
+    engine.macro_manifest.save()
+    with open(manifest_path) as fh:
+        assert len(json.load(fh)) == 1
@@ -0,0 +1,139 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import unittest.mock as mock
+
+import pytest
+
+from tk_3dsmax.main_thread_scheduler import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    MainThreadScheduler,
+)
+
+
+def _tick(scheduler):
+    scheduler._timer.timeout.emit()
+
+
+def test_tasks_run_by_priority_then_submission_order():
+    scheduler = MainThreadScheduler(mock.Mock(), tick_budget=60)
+    calls = []
+    scheduler.submit(calls.append, "low", priority=PRIORITY_LOW)
+    scheduler.submit(calls.append, "first")
+    scheduler.submit(calls.append, "high", priority=PRIORITY_HIGH)
+    future = scheduler.submit(calls.append, "second")
+
+    assert scheduler._timer.isActive()
+    _tick(scheduler)
+
+    assert calls == ["high", "first", "second", "low"]
+    assert future.done()
+    assert not scheduler._timer.isActive()
+    assert scheduler.get_stats()["ticks"] == 1
+
+
+def test_keyed_tasks_are_coalesced():
+    scheduler = MainThreadScheduler(mock.Mock(), tick_budget=60)
+    calls = []
+    scheduler.submit(calls.append, "other")
+    first = scheduler.submit(calls.append, 1, key="progress", priority=PRIORITY_LOW)
+    second = scheduler.submit(calls.append, 2, key="progress", priority=PRIORITY_HIGH)
+
+    assert first is second
+    assert scheduler.queue_depth == 2
+    _tick(scheduler)
+
+    # The latest function runs, at the highest priority requested.
+    assert calls == [2, "other"]
+    assert second.done()
+    assert scheduler.get_stats()["coalesced"] == 1
+
+    # Once run, the key can be used again.
+    third = scheduler.submit(calls.append, 3, key="progress")
+    assert third is not second
+
+
+def test_tick_budget_splits_the_queue():
+    scheduler = MainThreadScheduler(mock.Mock(), tick_budget=0)
+    calls = []
+    for index in range(3):
+        scheduler.submit(calls.append, index)
+
+    # At least one task runs per tick.
+    _tick(scheduler)
+    assert calls == [0]
+    assert scheduler._timer.isActive()
+    _tick(scheduler)
+    _tick(scheduler)
+    assert calls == [0, 1, 2]
+    assert not scheduler._timer.isActive()
+    assert scheduler.get_stats()["ticks"] == 3
+
+
+def test_nested_event_loops_keep_running_tasks():
+    scheduler = MainThreadScheduler(mock.Mock(), tick_budget=60)
+    calls = []
+
+    def modal_dialog():
+        calls.append("dialog opened")
+        # The nested event loop fires the scheduler's timer.
+        assert scheduler._timer.isActive()
+        scheduler.submit(calls.append, "submitted from the dialog")
+        _tick(scheduler)
+        calls.append("dialog closed")
+
+    scheduler.submit(modal_dialog)
+    scheduler.submit(calls.append, "queued")
+    _tick(scheduler)
+
+    assert calls == [
+        "dialog opened",
+        "queued",
+        "submitted from the dialog",
+        "dialog closed",
+    ]
+    assert not scheduler._timer.isActive()
+    assert scheduler.get_stats()["over_budget_ticks"] == 0
+
+    # The scheduler still runs the tasks submitted afterwards.
+    scheduler.submit(calls.append, "after")
+    assert scheduler._timer.isActive()
+    _tick(scheduler)
+    assert calls[-1] == "after"
+
+
+def test_failing_task_sets_the_future_exception():
+    logger = mock.Mock()
+    scheduler = MainThreadScheduler(logger, tick_budget=60)
+    future = scheduler.submit(lambda: 1 / 0)
+    other = scheduler.submit(lambda: 42)
+    _tick(scheduler)
+
+    assert isinstance(future.exception(), ZeroDivisionError)
+    assert other.result() == 42
+    logger.exception.assert_called_once()
+
+
+def test_close_cancels_pending_tasks():
+    scheduler = MainThreadScheduler(mock.Mock())
+    future = scheduler.submit(lambda: None)
+    keyed = scheduler.submit(lambda: None, key="progress")
+
+    scheduler.close()
+
+    assert future.cancelled()
+    assert keyed.cancelled()
+    assert scheduler.queue_depth == 0
+    assert not scheduler._timer.isActive()
+    with pytest.raises(RuntimeError):
+        scheduler.submit(lambda: None)
+    # A tick left over from before the close does nothing.
+    _tick(scheduler)
@@ -0,0 +1,110 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import threading
+import unittest.mock as mock
+
+from tk_3dsmax.main_thread_scheduler import MainThreadScheduler
+from tk_3dsmax.pymxs_facade import PymxsFacade
+
+
+def _run_in_thread(func, *args):
+    """
+    Call a function from a background thread and return its result.
+    """
+    results = []
+    thread = threading.Thread(target=lambda: results.append(func(*args)))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def _tick(scheduler):
+    scheduler._timer.timeout.emit()
+
+
+def test_main_thread_calls_run_right_away():
+    facade = PymxsFacade(None)
+    assert facade.run(lambda: 42).result(timeout=0) == 42
+
+    def run_from_thread():
+        try:
+            facade.run(lambda: None)
+        except RuntimeError as e:
+            return e
+
+    assert isinstance(_run_in_thread(run_from_thread), RuntimeError)
+
+
+def test_background_calls_run_in_order_from_one_task():
+    scheduler = MainThreadScheduler(mock.Mock(), tick_budget=60)
+    facade = PymxsFacade(scheduler)
+    calls = []
+    futures = [_run_in_thread(facade.run, calls.append, index) for index in range(3)]
+
+    assert scheduler.queue_depth == 1
+    assert facade.pending_count == 3
+    _tick(scheduler)
+
+    assert calls == [0, 1, 2]
+    assert all(future.done() for future in futures)
+    assert facade.pending_count == 0
+    assert scheduler.get_stats()["executed"] == 1
+
+
+def test_batches_are_split_on_the_tick_budget():
+    scheduler = MainThreadScheduler(mock.Mock(), tick_budget=0)
+    facade = PymxsFacade(scheduler)
+    calls = []
+    for index in range(3):
+        _run_in_thread(facade.run, calls.append, index)
+
+    _tick(scheduler)
+    assert calls == [0]
+    assert facade.pending_count == 2
+    _tick(scheduler)
+    _tick(scheduler)
+    assert calls == [0, 1, 2]
+    assert scheduler.queue_depth == 0
+
+    # The facade schedules a new batch for the next calls.
+    future = _run_in_thread(facade.run, calls.append, 3)
+    _tick(scheduler)
+    assert future.done()
+    assert calls[-1] == 3
+
+
+def test_calls_made_after_cancel_pending_still_run():
+    scheduler = MainThreadScheduler(mock.Mock(), tick_budget=60)
+    facade = PymxsFacade(scheduler)
+    cancelled = _run_in_thread(facade.run, lambda: 1)
+    facade.cancel_pending()
+    assert cancelled.cancelled()
+
+    # The batch task submitted before may have been dropped too.
+    scheduler.run_pending()
+    future = _run_in_thread(facade.run, lambda: 2)
+    _tick(scheduler)
+    assert future.result(timeout=0) == 2
+
+
+def test_calls_dont_hang_once_the_scheduler_is_closed():
+    scheduler = MainThreadScheduler(mock.Mock())
+    facade = PymxsFacade(scheduler)
+    pending = _run_in_thread(facade.run, lambda: 1)
+
+    # Closing the scheduler drops the batch and the calls it would have run.
+    scheduler.close()
+    assert pending.cancelled()
+
+    facade.cancel_pending()
+    future = _run_in_thread(facade.run, lambda: 2)
+    assert future.cancelled()
+    assert facade.pending_count == 0
@@ -0,0 +1,154 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import json
+import os
+import time
+import types
+import unittest.mock as mock
+
+from sgtk.platform import application
+
+from tk_3dsmax.startup_profiler import StartupProfiler
+
+
+def _read_timeline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_nested_phases_and_recorded_phases(tmpdir):
+    start_time = time.time()
+    profiler = StartupProfiler(start_time, mock.Mock())
+    profiler.begin("engine init")
+    with profiler.phase("menus"):
+        profiler.record("menu build", start_time + 1, start_time + 3)
+    profiler.begin("apps")
+    profiler.begin("app 1")
+    # Closing a phase closes the phases opened after it.
+    profiler.end("engine init")
+    profiler.end("unknown")
+    profiler.record("idle", start_time + 4, start_time + 5)
+
+    path = profiler.finish(os.path.join(str(tmpdir), "startup.json"))
+    timeline = _read_timeline(path)
+
+    phases = dict((phase["name"], phase) for phase in timeline["phases"])
+    assert [phase["name"] for phase in timeline["phases"]] == [
+        "engine init",
+        "menus",
+        "menu build",
+        "apps",
+        "app 1",
+        "idle",
+    ]
+    assert phases["engine init"]["parent"] is None
+    assert phases["menus"]["parent"] == "engine init"
+    assert phases["menu build"]["parent"] == "menus"
+    assert phases["apps"]["parent"] == "engine init"
+    assert phases["app 1"]["parent"] == "apps"
+    assert phases["idle"]["parent"] is None
+    assert phases["menu build"]["start"] == 1
+    assert phases["menu build"]["duration"] == 2
+    assert timeline["slowest_phase"] == "idle"
+    assert timeline["profile"] is None
+
+    # The timeline is only written once.
+    assert profiler.finish(path) is None
+
+
+def test_finish_closes_open_phases(tmpdir):
+    profiler = StartupProfiler(time.time(), mock.Mock())
+    profiler.begin("engine init")
+    profiler.begin("menus")
+
+    timeline = _read_timeline(
+        profiler.finish(os.path.join(str(tmpdir), "startup.json"))
+    )
+
+    assert [phase["name"] for phase in timeline["phases"]] == ["engine init", "menus"]
+    assert timeline["slowest_phase"] == "engine init"
+    assert all(phase["duration"] >= 0 for phase in timeline["phases"])
+
+
+def test_finish_reports_write_errors(tmpdir):
+    logger = mock.Mock()
+    profiler = StartupProfiler(time.time(), logger)
+    path = os.path.join(str(tmpdir), "missing", "startup.json")
+
+    assert profiler.finish(path) is None
+    logger.warning.assert_called_once()
+
+
+def test_wrap_times_each_call(tmpdir):
+    profiler = StartupProfiler(time.time(), mock.Mock())
+
+    def add(a, b):
+        return a + b
+
+    wrapped = profiler.wrap("add", add)
+    assert wrapped.__name__ == "add"
+    assert wrapped(1, b=2) == 3
+    assert wrapped(2, b=3) == 5
+
+    timeline = _read_timeline(
+        profiler.finish(os.path.join(str(tmpdir), "startup.json"))
+    )
+    assert [phase["name"] for phase in timeline["phases"]] == ["add", "add"]
+
+
+def test_cprofile_writes_the_slowest_phase_profile(tmpdir):
+    logger = mock.Mock()
+    profiler = StartupProfiler(time.time(), logger, cprofile=True)
+    with profiler.phase("engine init"):
+        sum(range(1000))
+
+    path = profiler.finish(os.path.join(str(tmpdir), "startup.json"))
+    timeline = _read_timeline(path)
+
+    # Profiling is skipped when another profiler, e.g. a coverage tool, is
+    # active.
+    if timeline["profile"] is not None:
+        assert timeline["profile"] == os.path.join(str(tmpdir), "startup.prof")
+        assert os.path.exists(timeline["profile"])
+
+
+def test_app_hooks_time_the_apps(tmpdir):
+    def get_application(engine, app_folder, descriptor, settings, instance_name, env):
+        return types.SimpleNamespace(init_app=mock.Mock())
+
+    with mock.patch.object(
+        application, "get_application", get_application, create=True
+    ):
+        profiler = StartupProfiler(time.time(), mock.Mock())
+        profiler.install_app_hooks()
+        assert application.get_application is not get_application
+
+        app = application.get_application(
+            None, None, None, None, "tk-multi-publish2", None
+        )
+        other_app = application.get_application(
+            None, None, None, None, instance_name="tk-multi-loader2", env=None
+        )
+        app.init_app()
+        other_app.init_app()
+
+        profiler.uninstall_app_hooks()
+        assert application.get_application is get_application
+
+    timeline = _read_timeline(
+        profiler.finish(os.path.join(str(tmpdir), "startup.json"))
+    )
+    assert [phase["name"] for phase in timeline["phases"]] == [
+        "load tk-multi-publish2",
+        "load tk-multi-loader2",
+        "init tk-multi-publish2",
+        "init tk-multi-loader2",
+    ]